@@ -1,11 +1,17 @@
-import pygame.display
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep stdout clean for raw frame export.
+
+import pygame.display  # noqa: E402
 
 from pyretro.langtons_ant.ant import Ant, Coordinates
 from pyretro.langtons_ant.controller import Controller
 from pyretro.langtons_ant.grid import Grid, GridSpec
 
 
-def main():
+def view():
     grid_spec = GridSpec(10, 100)
     ant = Ant(8, Coordinates(50, 50))
     grid = Grid(ant, grid_spec)
@@ -13,5 +19,88 @@ def main():
     controller = Controller(grid, surface)
     controller.run()
 
+
+def sweep(args):
+    from pyretro.langtons_ant.sweep import configurations, run_sweep, write_results
+
+    starts = [tuple(int(v) for v in start.split(",")) for start in args.start] or None
+    configs = configurations(args.rule, args.size, args.steps, starts)
+    count = write_results(run_sweep(configs, args.workers), args.output)
+    print("Wrote %s runs to %s" % (count, args.output))
+
+
+def export(args):
+    import sys
+
+    from pyretro.langtons_ant.export import FrameExporter, export as export_frames
+    from pyretro.langtons_ant.rules import Rule
+
+    grid = Grid(Ant(1, Coordinates(args.size // 2, args.size // 2)), GridSpec(1, args.size), rule=Rule.from_string(args.rule))
+    output = sys.stdout.buffer if args.output == "-" else args.output
+    with FrameExporter(output, args.square_n, args.workers, args.max_pending) as exporter:
+        count = export_frames(grid, exporter, args.every, args.frames)
+    print("Exported %s frames" % count, file=sys.stderr)
+
+
+def shared(args):
+    import multiprocessing
+
+    from pyretro.langtons_ant.rules import Rule
+    from pyretro.langtons_ant.shared import SharedGrid, simulate, view as view_shared
+
+    rule = Rule.from_string(args.rule)
+    shared_grid = SharedGrid.create((args.size, args.size), packed=rule.colors == 2)
+    try:
+        grid = Grid(Ant(1, Coordinates(args.size // 2, args.size // 2)), GridSpec(1, args.size), shared_grid.cells, rule)
+        viewer = multiprocessing.Process(target=view_shared, args=(shared_grid.name, args.square_n))
+        viewer.start()
+        while viewer.is_alive() and grid.on_grid:
+            simulate(shared_grid, grid, steps=args.chunk)
+            time.sleep(args.pause)
+        viewer.join()
+    finally:
+        shared_grid.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pyretro.langtons_ant")
+    commands = parser.add_subparsers(dest="command")
+    sweep_parser = commands.add_parser("sweep", help="run many configurations headless across a process pool")
+    sweep_parser.add_argument("--rule", action="append", default=None, help="turn string such as RL; repeatable")
+    sweep_parser.add_argument("--size", action="append", type=int, default=None, help="grid width; repeatable")
+    sweep_parser.add_argument("--steps", action="append", type=int, default=None, help="step budget; repeatable")
+    sweep_parser.add_argument("--start", action="append", default=[], help="start square as x,y; defaults to the centre")
+    sweep_parser.add_argument("--workers", type=int, default=None)
+    sweep_parser.add_argument("--output", default="sweep.jsonl", help="results file, CSV if it ends in .csv")
+    export_parser = commands.add_parser("export", help="render frames headless across a process pool")
+    export_parser.add_argument("--rule", default="RL")
+    export_parser.add_argument("--size", type=int, default=200, help="grid width")
+    export_parser.add_argument("--every", type=int, default=1000, help="steps between frames")
+    export_parser.add_argument("--frames", type=int, default=100)
+    export_parser.add_argument("--square-n", type=int, default=1, help="pixels per square")
+    export_parser.add_argument("--workers", type=int, default=None)
+    export_parser.add_argument("--max-pending", type=int, default=8, help="frames in flight before the simulation waits")
+    export_parser.add_argument("--output", default="frames", help="directory for PNGs, or - for raw RGB24 on stdout")
+    shared_parser = commands.add_parser("shared", help="simulate here and view in a second process over shared memory")
+    shared_parser.add_argument("--rule", default="RL")
+    shared_parser.add_argument("--size", type=int, default=400, help="grid width")
+    shared_parser.add_argument("--square-n", type=int, default=2, help="pixels per square")
+    shared_parser.add_argument("--chunk", type=int, default=10_000, help="steps between publishing the ant state")
+    shared_parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between chunks")
+    args = parser.parse_args(argv)
+
+    if args.command == "sweep":
+        args.rule = args.rule or ["RL"]
+        args.size = args.size or [1000]
+        args.steps = args.steps or [1_000_000]
+        sweep(args)
+    elif args.command == "export":
+        export(args)
+    elif args.command == "shared":
+        shared(args)
+    else:
+        view()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
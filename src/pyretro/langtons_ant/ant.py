@@ -3,7 +3,7 @@ from typing import cast
 
 import pygame
 
-from pyretro.langtons_ant.enums import Direction
+from pyretro.langtons_ant.enums import Direction, DIRECTION_DELTAS
 
 
 @dataclasses.dataclass
@@ -30,6 +30,7 @@ class Ant:
         self._coordinates = coordinates
         self._direction = cast(int, direction.value)
         self.color = color
+        self.state = 0  # Internal turmite state, always 0 for single state rules.
 
     @property
     def radius(self):
@@ -56,22 +57,18 @@ class Ant:
     def direction(self):
         return Direction(self._direction)
 
+    @direction.setter
+    def direction(self, direction: Direction):
+        self._direction = cast(int, direction.value)
+
     @property
     def coordinates(self):
         return self._coordinates
 
     def move(self, amount: int = 1):
-        direction = self.direction
-        if direction is Direction.UP:
-            self._coordinates.y -= amount
-        elif direction is Direction.RIGHT:
-            self._coordinates.x += amount
-        elif direction is Direction.DOWN:
-            self._coordinates.y += amount
-        elif direction is Direction.LEFT:
-            self._coordinates.x -= amount
-        else:
-            raise TypeError("Private attribute found to be of type %s", type(self._direction))
+        dx, dy = DIRECTION_DELTAS[self._direction]
+        self._coordinates.x += dx * amount
+        self._coordinates.y += dy * amount
 
     def draw_onto(self, surface):
         pygame.draw.circle(surface, self.color, tuple(self.center), self.radius)
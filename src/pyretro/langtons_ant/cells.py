@@ -0,0 +1,552 @@
+import abc
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from pyretro.langtons_ant.kernels import run_bits, run_bytes, StepResult
+from pyretro.langtons_ant.rules import Rule
+
+WHITE = 0
+BLACK = 1
+
+
+def _periods_inside(lo: int, hi: int, d: int, size: int) -> int:
+    """Return how many shifts by ``d`` keep ``[lo, hi]`` inside ``[0, size)``."""
+    if d > 0:
+        return (size - 1 - hi) // d
+    if d < 0:
+        return lo // -d
+    return np.iinfo(np.int64).max
+
+
+class Stripe(NamedTuple):
+    """Squares ``(xs, ys)`` painted with ``values``, copied ``periods`` times.
+
+    Copy ``j`` (counting from 1) is shifted by ``j * (dx, dy)``; later copies win
+    where copies overlap.
+    """
+
+    xs: np.ndarray
+    ys: np.ndarray
+    values: np.ndarray
+    dx: int
+    dy: int
+    periods: int
+
+    def period_range(self, x0: int, y0: int, x1: int, y1: int) -> tuple[int, int]:
+        """Return the copies ``j0 <= j < j1`` whose bounding box overlaps ``[x0, x1) x [y0, y1)``."""
+        j0, j1 = 1, self.periods + 1
+        for lo, hi, d, box_lo, box_hi in (
+            (int(self.xs.min()), int(self.xs.max()), self.dx, x0, x1 - 1),
+            (int(self.ys.min()), int(self.ys.max()), self.dy, y0, y1 - 1),
+        ):
+            if d > 0:
+                j0, j1 = max(j0, -((hi - box_lo) // d)), min(j1, (box_hi - lo) // d + 1)
+            elif d < 0:
+                j0, j1 = max(j0, -((lo - box_hi) // d)), min(j1, (box_lo - hi) // d + 1)
+            elif hi < box_lo or lo > box_hi:
+                return 0, 0
+        return j0, max(j0, j1)
+
+    def points(self, j0: int, j1: int, unique: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the coordinates and values painted by copies ``j0 <= j < j1``."""
+        j = np.arange(j0, j1, dtype=np.int64)[:, None]
+        xs = (self.xs[None, :] + j * self.dx).ravel()
+        ys = (self.ys[None, :] + j * self.dy).ravel()
+        values = np.tile(self.values, len(j))
+        if unique and len(j) > 1:
+            _, last = np.unique(np.stack([xs, ys], axis=1)[::-1], axis=0, return_index=True)
+            keep = len(xs) - 1 - last
+            xs, ys, values = xs[keep], ys[keep], values[keep]
+        return xs, ys, values
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        xs, ys = self.xs, self.ys
+        ends = [(int(xs.min()) + j * self.dx, int(ys.min()) + j * self.dy) for j in (1, self.periods)]
+        x0, y0 = min(x for x, _ in ends), min(y for _, y in ends)
+        x1 = max(x for x, _ in ends) + int(xs.max() - xs.min()) + 1
+        y1 = max(y for _, y in ends) + int(ys.max() - ys.min()) + 1
+        return x0, y0, x1 - x0, y1 - y0
+
+    def paint(self, region: np.ndarray, x: int, y: int) -> None:
+        """Paint the part of the stripe that falls inside ``region``, whose corner is at ``(x, y)``."""
+        width, height = region.shape
+        j0, j1 = self.period_range(x, y, x + width, y + height)
+        if j0 < j1:
+            xs, ys, values = self.points(j0, j1)
+            inside = (xs >= x) & (xs < x + width) & (ys >= y) & (ys < y + height)
+            region[xs[inside] - x, ys[inside] - y] = values[inside]
+
+
+class Cells(abc.ABC):
+    """Integer colour index for every square of the grid.
+
+    ``shape`` is ``None`` for unbounded backends.
+    """
+
+    def __init__(self, shape: Optional[tuple[int, int]]) -> None:
+        self.shape = shape
+
+    @abc.abstractmethod
+    def __getitem__(self, coordinates: tuple[int, int]) -> int:
+        ...
+
+    @abc.abstractmethod
+    def __setitem__(self, coordinates: tuple[int, int], value: int) -> None:
+        ...
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        """Return ``(x, y, width, height)`` of a region containing every painted square."""
+        return (0, 0, *self.shape)  # type: ignore[misc]
+
+    def to_array(self) -> np.ndarray:
+        return self.read(*self.bounds())
+
+    def read(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Copy a region into a new ``(width, height)`` array; squares off the grid read as white."""
+        region = np.zeros((width, height), dtype=np.uint8)
+        grid_width, grid_height = self.shape  # type: ignore[misc]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, grid_width), min(y + height, grid_height)
+        if x0 < x1 and y0 < y1:
+            region[x0 - x:x1 - x, y0 - y:y1 - y] = self._read_inside(x0, y0, x1, y1)
+        return region
+
+    @abc.abstractmethod
+    def _read_inside(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        ...
+
+    def write(self, x: int, y: int, region: np.ndarray) -> None:
+        """Copy a ``(width, height)`` array onto the grid with its corner at ``(x, y)``."""
+        xs, ys = np.indices(region.shape)
+        self._scatter((xs + x).ravel(), (ys + y).ravel(), region.ravel())
+
+    @property
+    @abc.abstractmethod
+    def nbytes(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def run(
+        self,
+        x: int,
+        y: int,
+        direction: int,
+        state: int,
+        n: int,
+        rule: Rule,
+        visited: Optional[list] = None,
+        reads: Optional[list] = None,
+        window: Optional[tuple[int, int, int, int]] = None,
+    ) -> StepResult:
+        """Step an ant ``n`` times under ``rule``, appending the coordinates of each updated square to ``visited``.
+
+        With ``visited`` given, the rule table index used on each step is appended to ``reads`` if given too.
+        If ``window`` is given as ``(x0, y0, x1, y1)``, stops as soon as the ant steps out of it.
+        """
+
+    def flush(self) -> None:
+        """Write any buffered state to backing storage."""
+
+    def gather(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Return the values at many in-bounds coordinates at once."""
+        return np.array([self[x, y] for x, y in zip(xs.tolist(), ys.tolist())], dtype=np.uint8)
+
+    @abc.abstractmethod
+    def _scatter(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray) -> None:
+        ...
+
+    def stripe_capacity(self, stripe: Stripe) -> int:
+        """Return how many copies of ``stripe`` fit on the grid, capped at ``stripe.periods``."""
+        width, height = self.shape  # type: ignore[misc]
+        return max(0, min(
+            stripe.periods,
+            _periods_inside(int(stripe.xs.min()), int(stripe.xs.max()), stripe.dx, width),
+            _periods_inside(int(stripe.ys.min()), int(stripe.ys.max()), stripe.dy, height),
+        ))
+
+    def stripe_is_blank(self, stripe: Stripe, exclude: tuple[int, int, int, int]) -> bool:
+        """Check every square ``stripe`` would paint is white, ignoring those in the ``(x, y, width, height)`` box."""
+        xs, ys, _ = stripe.points(1, stripe.periods + 1, unique=False)
+        x, y, width, height = exclude
+        outside = (xs < x) | (xs >= x + width) | (ys < y) | (ys >= y + height)
+        return not self.gather(xs[outside], ys[outside]).any()
+
+    def write_stripe(self, stripe: Stripe) -> None:
+        self._scatter(*stripe.points(1, stripe.periods + 1))
+
+    def _check_bounds(self, x: int, y: int) -> None:
+        width, height = self.shape  # type: ignore[misc]
+        if not (0 <= x < width and 0 <= y < height):
+            raise IndexError("Coordinates %s out of bounds for grid of shape %s" % ((x, y), self.shape))
+
+
+class DenseCells(Cells):
+    """One uint8 per square, indexed ``[x, y]``."""
+
+    shape: tuple[int, int]
+
+    def __init__(self, shape: tuple[int, int], arr: Optional[np.ndarray] = None) -> None:
+        super().__init__(shape)
+        if arr is None:
+            arr = np.zeros(shape, dtype=np.uint8)
+        if arr.shape != shape or arr.dtype != np.uint8 or not arr.flags.c_contiguous:
+            raise ValueError("Expected a contiguous uint8 array of shape %s, got %s %s" % (shape, arr.dtype, arr.shape))
+        self._arr = arr
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> int:
+        self._check_bounds(*coordinates)
+        return int(self._arr[coordinates])
+
+    def __setitem__(self, coordinates: tuple[int, int], value: int) -> None:
+        self._check_bounds(*coordinates)
+        self._arr[coordinates] = value
+
+    def to_array(self) -> np.ndarray:
+        return self._arr
+
+    def _read_inside(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        return self._arr[x0:x1, y0:y1]
+
+    def flush(self) -> None:
+        if isinstance(self._arr, np.memmap):
+            self._arr.flush()
+
+    def gather(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        return self._arr[xs, ys]
+
+    def _scatter(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray) -> None:
+        self._arr[xs, ys] = values
+
+    def write(self, x: int, y: int, region: np.ndarray) -> None:
+        width, height = region.shape
+        self._check_bounds(x, y)
+        self._check_bounds(x + width - 1, y + height - 1)
+        self._arr[x:x + width, y:y + height] = region
+
+    @property
+    def nbytes(self) -> int:
+        return self._arr.nbytes
+
+    def run(
+        self,
+        x: int,
+        y: int,
+        direction: int,
+        state: int,
+        n: int,
+        rule: Rule,
+        visited: Optional[list] = None,
+        reads: Optional[list] = None,
+        window: Optional[tuple[int, int, int, int]] = None,
+    ) -> StepResult:
+        self._check_bounds(x, y)
+        width, height = self.shape
+        trace: Optional[list[int]] = None if visited is None else []
+        result = run_bytes(
+            self._arr.data.cast("B"), width, height, x, y, direction, state, n, rule, trace, reads, window
+        )
+        if visited is not None and trace:
+            visited.extend(divmod(i, height) for i in trace)
+        return result
+
+
+class PackedCells(Cells):
+    """One bit per square for two colour rules.
+
+    Each column of the grid is padded to a whole number of bytes, so bit ``y`` of
+    column ``x`` is bit ``y % 8`` of ``bits[x, y // 8]``.
+    """
+
+    shape: tuple[int, int]
+
+    def __init__(self, shape: tuple[int, int], bits: Optional[np.ndarray] = None) -> None:
+        super().__init__(shape)
+        width, height = shape
+        packed_shape = (width, -(-height // 8))
+        if bits is None:
+            bits = np.zeros(packed_shape, dtype=np.uint8)
+        if bits.shape != packed_shape or bits.dtype != np.uint8 or not bits.flags.c_contiguous:
+            raise ValueError("Expected a contiguous uint8 array of shape %s, got %s %s" % (packed_shape, bits.dtype, bits.shape))
+        self._bits = bits
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "PackedCells":
+        if arr.max(initial=0) > BLACK:
+            raise ValueError("PackedCells can only hold two colours")
+        return cls(arr.shape, np.packbits(arr, axis=1, bitorder="little"))
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self._bits
+
+    def _locate(self, coordinates: tuple[int, int]) -> tuple[int, int, int]:
+        x, y = coordinates
+        self._check_bounds(x, y)
+        return x, y >> 3, y & 7
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> int:
+        x, byte, bit = self._locate(coordinates)
+        return (int(self._bits[x, byte]) >> bit) & 1
+
+    def __setitem__(self, coordinates: tuple[int, int], value: int) -> None:
+        if value not in (WHITE, BLACK):
+            raise ValueError("PackedCells can only hold two colours, got %s" % value)
+        x, byte, bit = self._locate(coordinates)
+        self._bits[x, byte] = (int(self._bits[x, byte]) & ~(1 << bit)) | (value << bit)
+
+    def to_array(self) -> np.ndarray:
+        return np.unpackbits(self._bits, axis=1, count=self.shape[1], bitorder="little")
+
+    def _read_inside(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        bits = self._bits[x0:x1, y0 >> 3:-(-y1 // 8)]
+        return np.unpackbits(bits, axis=1, bitorder="little")[:, y0 & 7:(y0 & 7) + y1 - y0]
+
+    def flush(self) -> None:
+        if isinstance(self._bits, np.memmap):
+            self._bits.flush()
+
+    def gather(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        return (self._bits[xs, ys >> 3] >> (ys & 7).astype(np.uint8)) & 1
+
+    def write(self, x: int, y: int, region: np.ndarray) -> None:
+        width, height = region.shape
+        if region.max(initial=0) > BLACK:
+            raise ValueError("PackedCells can only hold two colours")
+        self._check_bounds(x, y)
+        self._check_bounds(x + width - 1, y + height - 1)
+        byte0, byte1 = y >> 3, -(-(y + height) // 8)
+        bits = np.unpackbits(self._bits[x:x + width, byte0:byte1], axis=1, bitorder="little")
+        bits[:, y & 7:(y & 7) + height] = region
+        self._bits[x:x + width, byte0:byte1] = np.packbits(bits, axis=1, bitorder="little")
+
+    def _scatter(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray) -> None:
+        bits = (ys & 7).astype(np.uint8)
+        np.bitwise_and.at(self._bits, (xs, ys >> 3), ~(np.uint8(1) << bits))
+        np.bitwise_or.at(self._bits, (xs, ys >> 3), values.astype(np.uint8) << bits)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def run(
+        self,
+        x: int,
+        y: int,
+        direction: int,
+        state: int,
+        n: int,
+        rule: Rule,
+        visited: Optional[list] = None,
+        reads: Optional[list] = None,
+        window: Optional[tuple[int, int, int, int]] = None,
+    ) -> StepResult:
+        self._check_bounds(x, y)
+        if rule.colors > 2:
+            raise ValueError("PackedCells can only hold two colours, %r has %s" % (rule, rule.colors))
+        width, height = self.shape
+        trace: Optional[list[int]] = None if visited is None else []
+        result = run_bits(
+            self._bits.data.cast("B"), width, height, x, y, direction, state, n, rule, trace, reads, window
+        )
+        if visited is not None and trace:
+            stride = self._bits.shape[1] * 8
+            visited.extend(divmod(i, stride) for i in trace)
+        return result
+
+
+class ChunkedCells(Cells):
+    """Unbounded plane of square uint8 tiles, allocated as the ant first writes to them.
+
+    Stripes are kept as they are and only painted into tiles that get allocated or
+    read, so a stripe billions of periods long costs no more than a short one.
+    """
+
+    def __init__(self, tile_size: int = 64) -> None:
+        super().__init__(None)
+        self.tile_size = tile_size
+        self._tiles: dict[tuple[int, int], np.ndarray] = {}
+        self._stripes: list[Stripe] = []
+
+    @classmethod
+    def from_parts(
+        cls, tile_size: int, tiles: dict[tuple[int, int], np.ndarray], stripes: list[Stripe]
+    ) -> "ChunkedCells":
+        """Rebuild cells from their ``tiles`` and ``stripes``, as saved from another instance."""
+        cells = cls(tile_size)
+        cells._tiles = dict(tiles)
+        cells._stripes = list(stripes)
+        return cells
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles)
+
+    @property
+    def tiles(self) -> dict[tuple[int, int], np.ndarray]:
+        """Allocated tiles keyed by tile coordinates, with any stripes over them already painted."""
+        return self._tiles
+
+    @property
+    def stripes(self) -> list[Stripe]:
+        return self._stripes
+
+    def _tile_for_read(self, key: tuple[int, int]) -> Optional[np.ndarray]:
+        tile = self._tiles.get(key)
+        if tile is None and self._stripes:
+            tile = np.zeros((self.tile_size, self.tile_size), dtype=np.uint8)
+            for stripe in self._stripes:
+                stripe.paint(tile, key[0] * self.tile_size, key[1] * self.tile_size)
+        return tile
+
+    def _tile_for_write(self, key: tuple[int, int]) -> np.ndarray:
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._tile_for_read(key)
+            if tile is None:
+                tile = np.zeros((self.tile_size, self.tile_size), dtype=np.uint8)
+            self._tiles[key] = tile
+        return tile
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> int:
+        x, y = coordinates
+        size = self.tile_size
+        tile = self._tile_for_read((x // size, y // size))
+        return WHITE if tile is None else int(tile[x % size, y % size])
+
+    def __setitem__(self, coordinates: tuple[int, int], value: int) -> None:
+        x, y = coordinates
+        size = self.tile_size
+        self._tile_for_write((x // size, y // size))[x % size, y % size] = value
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        size = self.tile_size
+        boxes = [(tx * size, ty * size, size, size) for tx, ty in self._tiles]
+        boxes.extend(stripe.bounds() for stripe in self._stripes)
+        if not boxes:
+            return 0, 0, 0, 0
+        x0, y0 = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        x1, y1 = max(box[0] + box[2] for box in boxes), max(box[1] + box[3] for box in boxes)
+        return x0, y0, x1 - x0, y1 - y0
+
+    def read(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        size = self.tile_size
+        tx, ty = x // size, y // size
+        if (x + width - 1) // size == tx and (y + height - 1) // size == ty:
+            tile = self._tile_for_read((tx, ty))
+            if tile is not None:
+                return tile[x - tx * size:x - tx * size + width, y - ty * size:y - ty * size + height].copy()
+        region = np.zeros((width, height), dtype=np.uint8)
+        if width <= 0 or height <= 0:
+            return region
+        for stripe in self._stripes:
+            stripe.paint(region, x, y)  # Allocated tiles below already hold their stripes.
+        size = self.tile_size
+        tx0, ty0 = x // size, y // size
+        tx1, ty1 = (x + width - 1) // size, (y + height - 1) // size
+        if (tx1 - tx0 + 1) * (ty1 - ty0 + 1) <= len(self._tiles):
+            keys = ((tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1))
+            tiles = ((key, self._tiles.get(key)) for key in keys)
+        else:
+            tiles = ((key, tile) for key, tile in self._tiles.items() if tx0 <= key[0] <= tx1 and ty0 <= key[1] <= ty1)
+        for (tx, ty), tile in tiles:
+            if tile is None:
+                continue
+            ox, oy = tx * size, ty * size
+            x0, y0 = max(x, ox), max(y, oy)
+            x1, y1 = min(x + width, ox + size), min(y + height, oy + size)
+            region[x0 - x:x1 - x, y0 - y:y1 - y] = tile[x0 - ox:x1 - ox, y0 - oy:y1 - oy]
+        return region
+
+    def _read_inside(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        return self.read(x0, y0, x1 - x0, y1 - y0)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tile.nbytes for tile in self._tiles.values())
+
+    def _group_by_tile(self, xs: np.ndarray, ys: np.ndarray):
+        size = self.tile_size
+        txs, tys = xs // size, ys // size
+        for tx, ty in set(zip(txs.tolist(), tys.tolist())):
+            mask = (txs == tx) & (tys == ty)
+            yield (tx, ty), mask, xs[mask] - tx * size, ys[mask] - ty * size
+
+    def gather(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        values = np.zeros(len(xs), dtype=np.uint8)
+        for key, mask, local_xs, local_ys in self._group_by_tile(xs, ys):
+            tile = self._tile_for_read(key)
+            if tile is not None:
+                values[mask] = tile[local_xs, local_ys]
+        return values
+
+    def _scatter(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray) -> None:
+        for key, mask, local_xs, local_ys in self._group_by_tile(xs, ys):
+            self._tile_for_write(key)[local_xs, local_ys] = values[mask]
+
+    def write(self, x: int, y: int, region: np.ndarray) -> None:
+        size = self.tile_size
+        width, height = region.shape
+        tx, ty = x // size, y // size
+        if (x + width - 1) // size == tx and (y + height - 1) // size == ty:
+            ox, oy = x - tx * size, y - ty * size
+            self._tile_for_write((tx, ty))[ox:ox + width, oy:oy + height] = region
+        else:
+            super().write(x, y, region)
+
+    def stripe_capacity(self, stripe: Stripe) -> int:
+        return stripe.periods
+
+    def stripe_is_blank(self, stripe: Stripe, exclude: tuple[int, int, int, int]) -> bool:
+        # Only allocated tiles can hold paint ahead of the ant; earlier stripes lie behind it.
+        size = self.tile_size
+        x, y, width, height = exclude
+        for (tx, ty), tile in self._tiles.items():
+            ox, oy = tx * size, ty * size
+            j0, j1 = stripe.period_range(ox, oy, ox + size, oy + size)
+            if j0 >= j1:
+                continue
+            xs, ys, _ = stripe.points(j0, j1, unique=False)
+            keep = (xs >= ox) & (xs < ox + size) & (ys >= oy) & (ys < oy + size)
+            keep &= (xs < x) | (xs >= x + width) | (ys < y) | (ys >= y + height)
+            if tile[xs[keep] - ox, ys[keep] - oy].any():
+                return False
+        return True
+
+    def write_stripe(self, stripe: Stripe) -> None:
+        size = self.tile_size
+        for (tx, ty), tile in self._tiles.items():
+            stripe.paint(tile, tx * size, ty * size)
+        self._stripes.append(stripe)
+
+    def run(
+        self,
+        x: int,
+        y: int,
+        direction: int,
+        state: int,
+        n: int,
+        rule: Rule,
+        visited: Optional[list] = None,
+        reads: Optional[list] = None,
+        window: Optional[tuple[int, int, int, int]] = None,
+    ) -> StepResult:
+        size = self.tile_size
+        steps = 0
+        while steps < n:
+            tx, ty = x // size, y // size
+            ox, oy = tx * size, ty * size
+            tile = self._tile_for_write((tx, ty)).data.cast("B")
+            trace: Optional[list[int]] = None if visited is None else []
+            local = None
+            if window is not None:
+                x0, y0, x1, y1 = window
+                local = (max(x0 - ox, 0), max(y0 - oy, 0), min(x1 - ox, size), min(y1 - oy, size))
+            result = run_bytes(tile, size, size, x - ox, y - oy, direction, state, n - steps, rule, trace, reads, local)
+            x, y, direction, state = result.x + ox, result.y + oy, result.direction, result.state
+            steps += result.steps
+            if visited is not None and trace:
+                visited.extend((ox + i // size, oy + i % size) for i in trace)
+            if window is not None and not (window[0] <= x < window[2] and window[1] <= y < window[3]):
+                break
+        return StepResult(x, y, direction, state, steps)
@@ -0,0 +1,173 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import Cells, ChunkedCells, DenseCells, PackedCells, Stripe
+from pyretro.langtons_ant.enums import Direction
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import Rule
+
+
+def _chunked_arrays(cells: ChunkedCells) -> dict[str, np.ndarray]:
+    """Return the allocated tiles and the stripes as flat arrays; stripes are not rasterized."""
+    size, stripes = cells.tile_size, cells.stripes
+    tiles = list(cells.tiles.values())
+    return {
+        "cells": np.stack(tiles) if tiles else np.zeros((0, size, size), dtype=np.uint8),
+        "tile_keys": np.array(list(cells.tiles), dtype=np.int64).reshape(-1, 2),
+        "stripes": np.array([(len(s.xs), s.dx, s.dy, s.periods) for s in stripes], dtype=np.int64).reshape(-1, 4),
+        "stripe_xs": np.concatenate([s.xs for s in stripes] or [np.zeros(0, dtype=np.int64)]),
+        "stripe_ys": np.concatenate([s.ys for s in stripes] or [np.zeros(0, dtype=np.int64)]),
+        "stripe_values": np.concatenate([s.values for s in stripes] or [np.zeros(0, dtype=np.uint8)]),
+    }
+
+
+def _chunked_cells(tile_size: int, tiles: np.ndarray, snapshot) -> ChunkedCells:
+    keys = map(tuple, snapshot["tile_keys"].tolist())
+    xs, ys, values = snapshot["stripe_xs"], snapshot["stripe_ys"], snapshot["stripe_values"]
+    stripes = []
+    start = 0
+    for count, dx, dy, periods in snapshot["stripes"].tolist():
+        end = start + count
+        stripes.append(Stripe(xs[start:end], ys[start:end], values[start:end], dx, dy, periods))
+        start = end
+    return ChunkedCells.from_parts(tile_size, {key: np.ascontiguousarray(tile) for key, tile in zip(keys, tiles)}, stripes)
+
+
+def save_snapshot(grid: Grid, path: Union[str, os.PathLike]) -> None:
+    """Write the grid's cells, ant state and rule to a compressed ``.npz`` file.
+
+    Two colour grids are stored one bit per square. Unbounded grids are stored as
+    their allocated tiles plus any highway stripes, however far those reach. The
+    file is written next to ``path``, fsynced and renamed over it, so an interrupted
+    save or a power loss leaves the previous snapshot intact.
+    """
+    cells, rule = grid.cells, grid.rule
+    packed = rule.colors == 2
+    header = {
+        "storage": "dense",
+        "shape": list(grid.grid_spec.grid_size),
+        "packed": packed,
+        "state": grid.get_state(),
+        "rule": {"name": rule.name, "table": rule.to_table()},
+        "square_n": grid.grid_spec.square_n,
+    }
+    arrays: dict[str, Any]  # Any, so mypy can't take ``**arrays`` for ``allow_pickle``.
+    if isinstance(cells, ChunkedCells):
+        header.update(storage="chunked", tile_size=cells.tile_size)
+        arrays = _chunked_arrays(cells)
+        if packed:
+            arrays["cells"] = np.packbits(arrays["cells"], axis=2, bitorder="little")
+    elif isinstance(cells, PackedCells):
+        header["storage"] = "packed"
+        arrays = {"cells": cells.bits}
+    else:
+        arr = cells.to_array()
+        arrays = {"cells": np.packbits(arr, axis=1, bitorder="little") if packed else arr}
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        arrays["header"] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    durable_replace(tmp_path, path)
+
+
+def durable_replace(tmp_path: Path, path: Path) -> None:
+    """Rename ``tmp_path`` over ``path`` and fsync the directory so the rename survives a power loss.
+
+    ``tmp_path`` must already be fsynced, or the rename can outlive its contents.
+    """
+    os.replace(tmp_path, path)
+    if os.name == "nt":
+        return  # Directories can't be opened for fsync on Windows.
+    fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def load_snapshot(path: Union[str, os.PathLike]) -> Grid:
+    """Rebuild the grid saved by ``save_snapshot``, using the same kind of cell storage."""
+    with np.load(path) as snapshot:
+        header = json.loads(snapshot["header"].tobytes())
+        shape, state = tuple(header["shape"]), header["state"]
+        data = snapshot["cells"]
+        cells: Cells
+        if header["storage"] == "packed":
+            cells = PackedCells(shape, data)
+        elif header["storage"] == "chunked":
+            size = header["tile_size"]
+            tiles = np.unpackbits(data, axis=2, count=size, bitorder="little") if header["packed"] else data
+            cells = _chunked_cells(size, tiles, snapshot)
+        else:
+            arr = np.unpackbits(data, axis=1, count=shape[1], bitorder="little") if header["packed"] else data
+            cells = DenseCells(shape, np.ascontiguousarray(arr))
+
+    rule = Rule.from_table(header["rule"]["table"], header["rule"]["name"])
+    ant = Ant(1, Coordinates(state["x"], state["y"]), Direction(state["direction"]))
+    grid = Grid(ant, GridSpec(header["square_n"], shape[0]), cells, rule)
+    grid.set_state(state)
+    return grid
+
+
+class Checkpointer:
+    """Steps a grid and saves a snapshot every ``every_steps`` steps and/or ``every_seconds`` seconds.
+
+    ``stepper`` is anything with ``step(n) -> steps taken`` over the same grid, such as
+    a ``FastForward``; the grid itself is used by default.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        path: Union[str, os.PathLike],
+        every_steps: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+        stepper=None,
+        chunk: int = 1 << 16,
+    ) -> None:
+        if every_steps is None and every_seconds is None:
+            raise ValueError("Give every_steps, every_seconds or both")
+        self._grid = grid
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self._stepper = stepper if stepper is not None else grid
+        self._chunk = chunk
+        self._saved_steps = grid.steps
+        self._saved_time = time.monotonic()
+        self.saves = 0
+
+    def save(self) -> None:
+        save_snapshot(self._grid, self.path)
+        self._saved_steps = self._grid.steps
+        self._saved_time = time.monotonic()
+        self.saves += 1
+
+    def _due(self) -> bool:
+        return (self.every_steps is not None and self._grid.steps - self._saved_steps >= self.every_steps) or (
+            self.every_seconds is not None and time.monotonic() - self._saved_time >= self.every_seconds
+        )
+
+    def step(self, n: int) -> int:
+        """Advance ``n`` steps, saving whenever a checkpoint is due, and return the steps taken."""
+        taken = 0
+        while taken < n:
+            chunk = min(n - taken, self._chunk)
+            if self.every_steps is not None:
+                chunk = max(1, min(chunk, self._saved_steps + self.every_steps - self._grid.steps))
+            taken += self._stepper.step(chunk)
+            if self._due():
+                self.save()
+            if not self._grid.on_grid:
+                break
+        return taken
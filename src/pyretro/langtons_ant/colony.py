@@ -0,0 +1,84 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from pyretro.langtons_ant.ant import Ant
+from pyretro.langtons_ant.enums import DIRECTION_DELTAS
+from pyretro.langtons_ant.rules import LANGTON, Rule, stack_rules
+
+_DX = np.array([dx for dx, _ in DIRECTION_DELTAS], dtype=np.int64)
+_DY = np.array([dy for _, dy in DIRECTION_DELTAS], dtype=np.int64)
+
+
+class Colony:
+    """Many ants sharing one bounded grid, stored as arrays and stepped together.
+
+    Every tick, each active ant reads the square under it, turns, writes and moves.
+    Ants on the same square all read its colour from before the tick, and the
+    lowest numbered of them decides what is written. Ants that walk off the grid
+    stop.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        xs: Sequence[int],
+        ys: Sequence[int],
+        directions: Sequence[int],
+        rules: Sequence[Rule] = (LANGTON,),
+        rule_ids: Optional[Sequence[int]] = None,
+    ) -> None:
+        self.shape = shape
+        self.cells = np.zeros(shape, dtype=np.uint8)
+        self.xs = np.array(xs, dtype=np.int64)
+        self.ys = np.array(ys, dtype=np.int64)
+        self.directions = np.array(directions, dtype=np.int64) & 3
+        self.states = np.zeros(len(self.xs), dtype=np.intp)
+        self.rule_ids = np.zeros(len(self.xs), dtype=np.intp) if rule_ids is None else np.array(rule_ids, dtype=np.intp)
+        if not len(self.xs) == len(self.ys) == len(self.directions) == len(self.rule_ids):
+            raise ValueError("Every ant needs an x, y, direction and rule")
+        self.rules = tuple(rules)
+        self._tables = stack_rules(self.rules)
+        self.active = self._on_grid()
+        self.ticks = 0
+
+    @classmethod
+    def from_ants(cls, shape: tuple[int, int], ants: Sequence[Ant], rules: Sequence[Rule] = (LANGTON,), rule_ids=None) -> "Colony":
+        return cls(
+            shape,
+            [ant.coordinates.x for ant in ants],
+            [ant.coordinates.y for ant in ants],
+            [ant.direction.value for ant in ants],
+            rules,
+            rule_ids,
+        )
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def _on_grid(self) -> np.ndarray:
+        width, height = self.shape
+        return (self.xs >= 0) & (self.xs < width) & (self.ys >= 0) & (self.ys < height)
+
+    def step(self, n: int = 1) -> None:
+        writes, turns, next_states = self._tables
+        height = self.shape[1]
+        for _ in range(n):
+            ants = np.flatnonzero(self.active)
+            if not len(ants):
+                break
+            xs, ys = self.xs[ants], self.ys[ants]
+            rule_ids, states = self.rule_ids[ants], self.states[ants]
+            colors = self.cells[xs, ys]
+
+            # np.unique reports the first, i.e. lowest numbered, ant on each square.
+            _, first = np.unique(xs * height + ys, return_index=True)
+            self.cells[xs[first], ys[first]] = writes[rule_ids[first], states[first], colors[first]]
+
+            directions = (self.directions[ants] + turns[rule_ids, states, colors]) & 3
+            self.directions[ants] = directions
+            self.states[ants] = next_states[rule_ids, states, colors]
+            self.xs[ants] = xs + _DX[directions]
+            self.ys[ants] = ys + _DY[directions]
+            self.active[ants] = self._on_grid()[ants]
+            self.ticks += 1
@@ -1,17 +1,109 @@
+import threading
+import time
+from typing import Optional
+
 import pygame
 
 from pyretro.langtons_ant.grid import Grid
+from pyretro.langtons_ant.viewport import Viewport
 
 
 class Controller:
-    def __init__(self, grid: Grid, surface: pygame.Surface):
+    """Runs the simulation and redraws the window at up to ``fps`` frames a second.
+
+    Each frame steps the grid ``steps_per_frame`` times. With ``adaptive`` set, that
+    number grows or shrinks so stepping fills ``sim_share`` of the frame budget. With
+    ``threaded`` set, a worker thread steps the grid instead and the frame loop only
+    draws, so a slow draw never stalls the simulation and vice versa. Given a
+    ``viewport``, frames are drawn through it and mouse events pan and zoom it.
+    ``stepper`` may replace ``grid.step``, e.g. with a ``FastForward`` or a
+    ``SharedMirror`` following a simulation in another process.
+    """
+
+    MAX_STEPS_PER_FRAME = 1 << 24
+
+    def __init__(
+        self,
+        grid: Grid,
+        surface: pygame.Surface,
+        fps: int = 60,
+        steps_per_frame: int = 1,
+        adaptive: bool = True,
+        sim_share: float = 0.5,
+        threaded: bool = False,
+        viewport: Optional[Viewport] = None,
+        stepper=None,
+    ):
         self._grid = grid
         self._surface = surface
+        self.fps = fps
+        self.steps_per_frame = steps_per_frame
+        self.adaptive = adaptive
+        self.sim_share = sim_share
+        self.threaded = threaded
+        self.viewport = viewport
+        self._stepper = stepper if stepper is not None else grid
+
+        self._clock = pygame.time.Clock()
+        self._lock = threading.Lock()
+        self._running = False
+        self._finished = False  # The ant walked off the grid.
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def stop(self) -> None:
+        self._running = False
+
+    def _handle_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop()
+            elif self.viewport is not None:
+                self.viewport.handle_event(event)
+
+    def _simulate(self, budget: float) -> None:
+        if self._finished:
+            return
+        n = self.steps_per_frame
+        start = time.perf_counter()
+        with self._lock:
+            self._stepper.step(n)
+            self._finished = not self._grid.on_grid
+        elapsed = time.perf_counter() - start
+        if self.adaptive:
+            scale = budget / elapsed if elapsed > 0 else 2
+            self.steps_per_frame = max(1, min(self.MAX_STEPS_PER_FRAME, int(n * min(2, max(0.5, scale)))))
+
+    def _work(self) -> None:
+        while self._running and not self._finished:
+            self._simulate(self.sim_share / self.fps)
+            time.sleep(0)  # Let the frame loop take the lock.
+
+    def _draw(self) -> None:
+        with self._lock:
+            target = self.viewport if self.viewport is not None else self._grid
+            rects = target.draw_onto(self._surface)
+        pygame.display.update(rects)
 
-    def run(self):
-        self._grid.draw_onto(self._surface)
-        pygame.display.flip()
-        while True:
-            self._grid.move_ant()
-            self._grid.draw_onto(self._surface)
-            pygame.display.flip()
+    def run(self, max_frames: Optional[int] = None):
+        self._running = True
+        self._grid.invalidate()
+        self._draw()
+        worker = threading.Thread(target=self._work, daemon=True) if self.threaded else None
+        if worker is not None:
+            worker.start()
+        frames = 0
+        try:
+            while self._running and (max_frames is None or frames < max_frames):
+                self._handle_events()
+                if worker is None:
+                    self._simulate(self.sim_share / self.fps)
+                self._draw()
+                self._clock.tick(self.fps)
+                frames += 1
+        finally:
+            self._running = False
+            if worker is not None:
+                worker.join()
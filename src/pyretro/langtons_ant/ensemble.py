@@ -0,0 +1,81 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from pyretro.langtons_ant.enums import DIRECTION_DELTAS
+from pyretro.langtons_ant.rules import LANGTON, Rule, stack_rules
+
+_DX = np.array([dx for dx, _ in DIRECTION_DELTAS], dtype=np.int64)
+_DY = np.array([dy for _, dy in DIRECTION_DELTAS], dtype=np.int64)
+
+
+class Ensemble:
+    """``B`` independent ants, each on its own grid, stepped together.
+
+    The grids are one ``(B, width, height)`` array indexed ``[member, x, y]`` like the
+    other cell stores. Members whose ant walks off its grid stop.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        xs: Sequence[int],
+        ys: Sequence[int],
+        directions: Sequence[int],
+        rules: Sequence[Rule] = (LANGTON,),
+        rule_ids: Optional[Sequence[int]] = None,
+    ) -> None:
+        self.shape = shape
+        self.xs = np.array(xs, dtype=np.int64)
+        self.ys = np.array(ys, dtype=np.int64)
+        self.directions = np.array(directions, dtype=np.int64) & 3
+        self.states = np.zeros(len(self.xs), dtype=np.intp)
+        self.rule_ids = np.zeros(len(self.xs), dtype=np.intp) if rule_ids is None else np.array(rule_ids, dtype=np.intp)
+        if not len(self.xs) == len(self.ys) == len(self.directions) == len(self.rule_ids):
+            raise ValueError("Every member needs an x, y, direction and rule")
+        self.cells = np.zeros((len(self.xs), *shape), dtype=np.uint8)
+        self.steps = np.zeros(len(self.xs), dtype=np.int64)
+        self.rules = tuple(rules)
+        self._tables = stack_rules(self.rules)
+        width, height = shape
+        self.active = (self.xs >= 0) & (self.xs < width) & (self.ys >= 0) & (self.ys < height)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def step(self, n: int = 1) -> None:
+        writes, turns, next_states = self._tables
+        width, height = self.shape
+        flat = self.cells.reshape(-1)
+        members = np.flatnonzero(self.active)
+        xs, ys = self.xs[members], self.ys[members]
+        directions, states = self.directions[members], self.states[members]
+        rule_ids, steps = self.rule_ids[members], self.steps[members]
+        for _ in range(n):
+            if not len(members):
+                break
+            i = (members * width + xs) * height + ys
+            colors = flat[i]
+            flat[i] = writes[rule_ids, states, colors]
+            directions = (directions + turns[rule_ids, states, colors]) & 3
+            states = next_states[rule_ids, states, colors]
+            xs = xs + _DX[directions]
+            ys = ys + _DY[directions]
+            steps += 1
+
+            left = (xs < 0) | (xs >= width) | (ys < 0) | (ys >= height)
+            if left.any():
+                self._store(members, xs, ys, directions, states, steps)
+                self.active[members[left]] = False
+                keep = ~left
+                members, xs, ys = members[keep], xs[keep], ys[keep]
+                directions, states, rule_ids, steps = directions[keep], states[keep], rule_ids[keep], steps[keep]
+        self._store(members, xs, ys, directions, states, steps)
+
+    def _store(self, members, xs, ys, directions, states, steps) -> None:
+        self.xs[members], self.ys[members] = xs, ys
+        self.directions[members], self.states[members], self.steps[members] = directions, states, steps
+
+    def black_counts(self) -> np.ndarray:
+        """Return the number of non-white squares on each member's grid."""
+        return np.count_nonzero(self.cells.reshape(len(self), -1), axis=1)
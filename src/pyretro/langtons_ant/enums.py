@@ -11,3 +11,6 @@ class Direction(Enum):
     RIGHT = 1
     DOWN = 2
     LEFT = 3
+
+
+DIRECTION_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))  # (dx, dy) indexed by Direction value.
@@ -0,0 +1,110 @@
+import collections
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+import numpy as np
+
+from pyretro.langtons_ant.grid import Grid
+from pyretro.langtons_ant.raster import rasterize
+
+
+def _init_worker() -> None:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+
+def encode_frame(cells: np.ndarray, height: Optional[int], square_n: int, path: Optional[str]) -> Optional[bytes]:
+    """Rasterize one frame; save it as an image at ``path``, or return raw RGB bytes if there is none.
+
+    ``height`` is given when ``cells`` is bit-packed along y.
+    """
+    if height is not None:
+        cells = np.unpackbits(cells, axis=1, count=height, bitorder="little")
+    pixels = rasterize(cells, square_n=square_n)
+    if path is None:
+        return np.ascontiguousarray(pixels.transpose(1, 0, 2)).tobytes()  # Row major, as ffmpeg's rawvideo expects.
+    import pygame.image
+    import pygame.surfarray
+
+    pygame.image.save(pygame.surfarray.make_surface(pixels), path)
+    return None
+
+
+class FrameExporter:
+    """Encodes snapshots of a grid in a process pool while the simulation carries on.
+
+    ``output`` is a directory to write numbered PNGs into, or a binary stream that
+    receives raw RGB24 frames in order, e.g. the stdin of ``ffmpeg -f rawvideo``. At
+    most ``max_pending`` frames are in flight; ``submit`` blocks on the oldest one
+    beyond that, so memory stays bounded when encoding falls behind.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, os.PathLike, BinaryIO],
+        square_n: int = 1,
+        workers: Optional[int] = None,
+        max_pending: int = 8,
+        pattern: str = "frame_%06d.png",
+    ) -> None:
+        self._stream: Optional[BinaryIO] = None
+        self._directory: Optional[Path] = None
+        if isinstance(output, (str, os.PathLike)):
+            self._directory = Path(output)
+            self._directory.mkdir(parents=True, exist_ok=True)
+        else:
+            self._stream = output
+        self.square_n = square_n
+        self.max_pending = max_pending
+        self.pattern = pattern
+        self.frames = 0
+        self._pending: collections.deque[Future] = collections.deque()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def submit(self, grid: Grid) -> None:
+        """Queue a frame of the grid's current squares."""
+        while len(self._pending) >= self.max_pending:
+            self._finish_oldest()
+        cells = grid.cells.read(0, 0, *grid.grid_spec.grid_size)
+        height = None
+        if grid.rule.colors == 2:
+            height = cells.shape[1]
+            cells = np.packbits(cells, axis=1, bitorder="little")  # Eight times less to send to the worker.
+        path = None if self._directory is None else str(self._directory / (self.pattern % self.frames))
+        self._pending.append(self._executor.submit(encode_frame, cells, height, self.square_n, path))
+        self.frames += 1
+
+    def _finish_oldest(self) -> None:
+        data = self._pending.popleft().result()
+        if self._stream is not None:
+            self._stream.write(data)
+
+    def close(self) -> None:
+        while self._pending:
+            self._finish_oldest()
+        self._executor.shutdown()
+        if self._stream is not None:
+            self._stream.flush()
+
+    def __enter__(self) -> "FrameExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def export(grid: Grid, exporter: FrameExporter, every: int, frames: int, stepper=None) -> int:
+    """Submit a frame, then step ``every`` steps, ``frames`` times; return the frames submitted.
+
+    Stops early if the ant walks off the grid. ``stepper`` may be e.g. a ``FastForward``.
+    """
+    stepper = stepper if stepper is not None else grid
+    for frame in range(frames):
+        exporter.submit(grid)
+        if frame + 1 < frames:
+            stepper.step(every)
+            if not grid.on_grid:
+                exporter.submit(grid)
+                return frame + 2
+    return frames
@@ -1,8 +1,15 @@
-import numpy as np
+from typing import Iterator, Optional
+
 import pygame.draw
+import pygame.surfarray
 
 from pyretro.langtons_ant.ant import Ant, Coordinates
-from pyretro.langtons_ant.enums import SquareColor
+from pyretro.langtons_ant.cells import Cells, DenseCells
+from pyretro.langtons_ant.enums import Direction, SquareColor
+from pyretro.langtons_ant.raster import COLOR_NAMES, rasterize
+from pyretro.langtons_ant.rules import LANGTON, Rule
+
+SQUARE_COLORS = (SquareColor.WHITE, SquareColor.BLACK)  # Indexed by cell value.
 
 
 class GridSpec:
@@ -20,51 +27,220 @@ class GridSpec:
 
 
 class Grid:
-    def __init__(self, ant: Ant, grid_spec: GridSpec) -> None:
+    MAX_DIRTY_CELLS = 4096  # Beyond this many changed squares a full redraw is cheaper.
+    CHANGE_MARGIN = 32  # Squares around the ant that a step batch starts tracking changes in.
+
+    def __init__(self, ant: Ant, grid_spec: GridSpec, cells: Optional[Cells] = None, rule: Rule = LANGTON) -> None:
         self._ant = ant
         self._grid_spec = grid_spec
+        self._rule = rule
 
-        self._arr = np.full(grid_spec.grid_size, SquareColor.WHITE)
+        self._cells = cells if cells is not None else DenseCells(grid_spec.grid_size)
+        self._steps = 0
+        self._dirty: set[tuple[int, int]] = set()
+        self._redraw_all = True
+        self._changed: Optional[tuple[int, int, int, int]] = None  # (x0, y0, x1, y1) since the last pop_changed.
+        self._changed_all = True
 
-    def move_ant(self):
-        coordinates = self._ant.coordinates
+    @property
+    def cells(self) -> Cells:
+        return self._cells
 
-        if self._arr[tuple(coordinates)] is SquareColor.WHITE:
-            self._ant.rotate_right()
-            self._arr[tuple(coordinates)] = SquareColor.BLACK
-        elif self._arr[tuple(coordinates)] is SquareColor.BLACK:
-            self._ant.rotate_left()
-            self._arr[tuple(coordinates)] = SquareColor.WHITE
-        else:
-            raise TypeError("Square is of type %s", type(self._arr[coordinates[coordinates]]))
+    @property
+    def grid_spec(self) -> GridSpec:
+        return self._grid_spec
 
-        self._ant.move()
+    @property
+    def steps(self) -> int:
+        return self._steps
 
-    def iter_squares(self):
-        yield from (square for row in self._arr for square in row)
+    @property
+    def ant(self) -> Ant:
+        return self._ant
 
-    def get_color(self, coordinates: tuple[int, int]):
-        x, y = coordinates
-        square = self._arr[x, y]
+    @property
+    def rule(self) -> Rule:
+        return self._rule
 
-        if square is SquareColor.WHITE:
-            return "white"
-        elif square is SquareColor.BLACK:
-            return "black"
+    @property
+    def on_grid(self) -> bool:
+        """Whether the ant is still on the grid; once it walks off, stepping does nothing."""
+        shape = self._cells.shape
+        x, y = self._ant.coordinates
+        return shape is None or (0 <= x < shape[0] and 0 <= y < shape[1])
+
+    def get_state(self) -> dict:
+        """Return the ant position, direction, turmite state and step count as plain integers."""
+        x, y = self._ant.coordinates
+        return {"x": x, "y": y, "direction": self._ant.direction.value, "state": self._ant.state, "steps": self._steps}
+
+    def set_state(self, state: dict) -> None:
+        coordinates = self._ant.coordinates
+        coordinates.x, coordinates.y = state["x"], state["y"]
+        self._ant.direction = Direction(state["direction"])
+        self._ant.state = state.get("state", 0)
+        self._steps = state["steps"]
+
+    def move_ant(self):
+        coordinates = tuple(self._ant.coordinates)
+        rule = self._rule
+
+        k = self._ant.state * rule.colors + self._cells[coordinates]
+        self._cells[coordinates] = rule.writes[k]
+        self._ant.direction = Direction((self._ant.direction.value + rule.turns[k]) & 3)
+        self._ant.state = rule.next_states[k]
+
+        self._ant.move()
+        self._steps += 1
+        self._mark_dirty([coordinates])
+        self._add_changed(coordinates[0], coordinates[1], coordinates[0] + 1, coordinates[1] + 1)
+
+    def step(self, n: int = 1, visited: Optional[list] = None, reads: Optional[list] = None) -> int:
+        """Advance the ant ``n`` steps without going through ``Ant`` on every step.
+
+        Stops early if the ant walks off the grid and returns the number of steps taken,
+        0 if it was already off; check ``on_grid`` to tell whether it is.
+        The coordinates of every square updated are appended to ``visited`` if given,
+        and the rule table index used on every step to ``reads``.
+        """
+        if not self.on_grid:
+            return 0
+        if visited is None and (reads is not None or not (self._redraw_all or n > self.MAX_DIRTY_CELLS)):
+            visited = []
+        taken = self._run(n, visited, reads)
+        if visited is None:
+            self._redraw()
         else:
-            raise TypeError("incorrect type %s", type(square))
+            self._mark_dirty(visited)
+        return taken
+
+    def _run(self, n: int, visited: Optional[list], reads: Optional[list]) -> int:
+        """Step the ant inside a window around it, widening the window each time the ant leaves it.
+
+        Stepping stops at the window edge for free, so tracking where the ant went costs a
+        few restarts per batch rather than work on every step. The window is added to the
+        changed region once the batch is done.
+        """
+        ant, cells = self._ant, self._cells
+        coordinates = ant.coordinates
+        margin = self.CHANGE_MARGIN
+        x, y = coordinates.x, coordinates.y
+        window = self._clip(x - margin, y - margin, x + margin + 1, y + margin + 1)
+        taken = 0
+        while True:
+            result = cells.run(x, y, ant.direction.value, ant.state, n - taken, self._rule, visited, reads, window)
+            x, y = coordinates.x, coordinates.y = result.x, result.y
+            ant.direction = Direction(result.direction)
+            ant.state = result.state
+            taken += result.steps
+            if taken == n or not self.on_grid:
+                break
+            margin *= 2
+            x0, y0, x1, y1 = window
+            x0, y0, x1, y1 = min(x0, x - margin), min(y0, y - margin), max(x1, x + margin + 1), max(y1, y + margin + 1)
+            window = self._clip(x0, y0, x1, y1)
+        self._steps += taken
+        if taken:
+            self._add_changed(*window)
+        return taken
+
+    def _clip(self, x0: int, y0: int, x1: int, y1: int) -> tuple[int, int, int, int]:
+        if self._cells.shape is None:
+            return x0, y0, x1, y1
+        width, height = self._cells.shape
+        return max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+
+    def mark_changed(self, x: int, y: int, width: int, height: int) -> None:
+        """Note that a region was written straight to the cells, e.g. by a bulk writer."""
+        self._add_changed(x, y, x + width, y + height)
+        self._redraw()
+
+    def _add_changed(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        if self._changed is not None:
+            cx0, cy0, cx1, cy1 = self._changed
+            x0, y0, x1, y1 = min(x0, cx0), min(y0, cy0), max(x1, cx1), max(y1, cy1)
+        self._changed = (x0, y0, x1, y1)
+
+    def pop_changed(self) -> Optional[tuple[int, int, int, int]]:
+        """Return ``(x, y, width, height)`` of a region holding every square changed since the last call.
+
+        Returns None if nothing changed, and the bounds of the whole grid after ``invalidate``.
+        Meant for the one view that follows the grid, such as a ``Viewport``.
+        """
+        if self._changed_all:
+            changed: Optional[tuple[int, int, int, int]] = self._cells.bounds()
+        elif self._changed is None:
+            changed = None
+        else:
+            x0, y0, x1, y1 = self._changed
+            changed = (x0, y0, x1 - x0, y1 - y0)
+        self._changed, self._changed_all = None, False
+        return changed
+
+    def invalidate(self) -> None:
+        """Treat every square as changed, e.g. after a resize or an external write to unknown squares."""
+        self._redraw()
+        self._changed_all = True
+
+    def _redraw(self) -> None:
+        self._redraw_all = True
+        self._dirty.clear()
+
+    def _mark_dirty(self, coordinates) -> None:
+        if self._redraw_all:
+            return
+        self._dirty.update(coordinates)
+        if len(self._dirty) > self.MAX_DIRTY_CELLS:
+            self._redraw()
+
+    def iter_squares(self) -> Iterator[SquareColor]:
+        self._check_two_colors()
+        return (SQUARE_COLORS[value] for value in self._cells.read(0, 0, *self._grid_spec.grid_size).flat)
+
+    def get_square(self, coordinates: tuple[int, int]) -> SquareColor:
+        self._check_two_colors()
+        return SQUARE_COLORS[self._cells[coordinates]]
+
+    def _check_two_colors(self) -> None:
+        if self._rule.colors > 2:
+            raise ValueError(
+                "Squares are only white or black under two colour rules; %r has %s colours, use get_color or cells"
+                % (self._rule.name, self._rule.colors)
+            )
+
+    def get_color(self, coordinates: tuple[int, int]):
+        return COLOR_NAMES[self._cells[coordinates] % len(COLOR_NAMES)]
 
     def get_pixel_coordinates(self, grid_coordinates):
         x_mul, y_mul = self._grid_spec.square_size
         return Coordinates(grid_coordinates.x * x_mul, grid_coordinates.y * y_mul)
 
-    def draw_onto(self, surface):
-        n1, n2 = self._grid_spec.grid_size
-        for i in range(n1):
-            for j in range(n2):
-                color = self.get_color((i, j))
-                pixel_coordinates = self.get_pixel_coordinates(Coordinates(i, j))
-                rect = pygame.rect.Rect(pixel_coordinates.x, pixel_coordinates.y, self._grid_spec.square_n, self._grid_spec.square_n)
-                pygame.draw.rect(surface, color, rect)
-
-        # self._ant.draw_onto(surface)
\ No newline at end of file
+    def _draw_square(self, surface, coordinates: tuple[int, int]) -> pygame.Rect:
+        x_mul, y_mul = self._grid_spec.square_size
+        x, y = coordinates
+        rect = pygame.Rect(x * x_mul, y * y_mul, x_mul, y_mul)
+        pygame.draw.rect(surface, self.get_color(coordinates), rect)
+        return rect
+
+    def pop_dirty(self) -> Optional[set[tuple[int, int]]]:
+        """Return the squares changed since the last call, or None if everything must be redrawn."""
+        dirty = None if self._redraw_all else self._dirty
+        self._redraw_all = False
+        self._dirty = set()
+        return dirty
+
+    def draw_onto(self, surface) -> list[pygame.Rect]:
+        """Repaint the squares changed since the last draw and return the rects touched."""
+        dirty = self.pop_dirty()
+        if dirty is None:
+            pixels = rasterize(self._cells.read(0, 0, *self._grid_spec.grid_size), square_n=self._grid_spec.square_n)
+            rects = [surface.blit(pygame.surfarray.make_surface(pixels), (0, 0))]
+        else:
+            n1, n2 = self._grid_spec.grid_size
+            rects = [
+                self._draw_square(surface, coordinates)
+                for coordinates in dirty
+                if 0 <= coordinates[0] < n1 and 0 <= coordinates[1] < n2
+            ]
+        # self._ant.draw_onto(surface)
+        return rects
@@ -0,0 +1,177 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from pyretro.langtons_ant.cells import Stripe
+from pyretro.langtons_ant.grid import Grid
+
+
+class Highway(NamedTuple):
+    """A periodic regime: every ``period`` steps the ant repeats its moves shifted by ``(dx, dy)``.
+
+    ``xs``, ``ys`` and ``values`` are the squares written during one period and their
+    values at its end, relative to where the ant stands at the end of that period.
+    """
+
+    period: int
+    dx: int
+    dy: int
+    xs: np.ndarray
+    ys: np.ndarray
+    values: np.ndarray
+    window: tuple[int, int, int, int]  # Verified neighbourhood, relative to the ant.
+    confirmed_at: int
+
+
+def find_period(positions: np.ndarray, max_period: int, confirmations: int) -> Optional[int]:
+    """Return the shortest period with which the trailing moves of ``positions`` repeat.
+
+    The moves must repeat for ``confirmations + 1`` whole periods and add up to a
+    non-zero displacement.
+    """
+    moves = np.diff(positions, axis=0)
+    codes = ((moves[:, 0] + 1) * 3 + moves[:, 1] + 1).astype(np.uint8).tobytes()
+    width = min(64, len(codes) // (confirmations + 1))
+    if width == 0:
+        return None
+    suffix = codes[-width:]
+    start = codes.rfind(suffix, 0, len(codes) - 1)
+    if start < 0:
+        return None
+    period = len(codes) - width - start
+    if period > max_period or (confirmations + 1) * period > len(codes):
+        return None
+    if codes[-confirmations * period:] != codes[-(confirmations + 1) * period:-period]:
+        return None
+    if not (positions[-1] - positions[-1 - period]).any():
+        return None
+    return period
+
+
+class FastForward:
+    """Steps a grid like ``Grid.step``, jumping whole periods once the ant is on a highway.
+
+    Every ``probe_interval`` steps the ant's recent moves are checked for a period. A
+    candidate highway is accepted when, one period later, the squares around the ant
+    are unchanged up to the displacement. Each jump paints the repeating stripe in
+    one go, after checking that everything it covers outside that neighbourhood is
+    still white. On an unbounded grid a jump costs the same however many periods it
+    spans.
+    """
+
+    def __init__(self, grid: Grid, max_period: int = 1024, confirmations: int = 2, probe_interval: int = 50_000) -> None:
+        self._grid = grid
+        self.max_period = max_period
+        self.confirmations = confirmations
+        self.probe_interval = probe_interval
+        self.highway: Optional[Highway] = None
+        self.first_confirmed_at: Optional[int] = None  # Kept after the ant leaves the highway.
+        self._boundary = (0, 0, 0)  # (steps, x, y) at the end of a highway period.
+        self._next_probe = grid.steps
+        self._stopped = False
+
+    @property
+    def _probe_length(self) -> int:
+        return (self.confirmations + 1) * self.max_period + 64
+
+    def step(self, n: int) -> int:
+        """Advance ``n`` steps and return how many were taken, fewer if the ant left the grid."""
+        grid = self._grid
+        start = grid.steps
+        self._stopped = not grid.on_grid
+        while not self._stopped and grid.steps - start < n:
+            remaining = n - (grid.steps - start)
+            if self.highway is not None:
+                self._ride(self.highway, remaining)
+            elif grid.steps >= self._next_probe and remaining >= self._probe_length:
+                self._probe()
+            elif grid.steps >= self._next_probe:
+                self._step(remaining)
+            else:
+                self._step(min(remaining, self._next_probe - grid.steps))
+        return grid.steps - start
+
+    def _step(self, n: int, visited: Optional[list] = None) -> None:
+        self._grid.step(n, visited)
+        self._stopped = not self._grid.on_grid
+
+    def _probe(self) -> None:
+        grid = self._grid
+        visited: list[tuple[int, int]] = []
+        self._step(self._probe_length, visited)
+        self._next_probe = grid.steps + self.probe_interval
+        if self._stopped:
+            return
+        positions = np.array(visited + [tuple(grid.ant.coordinates)], dtype=np.int64)
+        period = find_period(positions, self.max_period, self.confirmations)
+        if period is not None:
+            self._verify(period, positions[-period - 1:])
+
+    def _verify(self, period: int, positions: np.ndarray) -> None:
+        grid = self._grid
+        before = grid.get_state()
+        relative = positions - positions[0]
+        dx, dy = relative[-1].tolist()
+        margin = max(abs(dx), abs(dy)) + 1
+        (rx0, ry0), (rx1, ry1) = relative.min(axis=0).tolist(), relative.max(axis=0).tolist()
+        window = (rx0 - margin, ry0 - margin, rx1 - rx0 + 2 * margin + 1, ry1 - ry0 + 2 * margin + 1)
+        x, y = before["x"], before["y"]
+        region_before = grid.cells.read(x + window[0], y + window[1], window[2], window[3])
+
+        visited: list[tuple[int, int]] = []
+        self._step(period, visited)
+        if self._stopped:
+            return
+        after = grid.get_state()
+        x1, y1 = after["x"], after["y"]
+        region_after = grid.cells.read(x1 + window[0], y1 + window[1], window[2], window[3])
+        if (
+            (x1 - x, y1 - y) != (dx, dy)
+            or (after["direction"], after["state"]) != (before["direction"], before["state"])
+            or not np.array_equal(region_before, region_after)
+        ):
+            return
+
+        footprint = np.unique(np.array(visited, dtype=np.int64), axis=0)
+        values = grid.cells.gather(footprint[:, 0], footprint[:, 1])
+        self.highway = Highway(
+            period, dx, dy, footprint[:, 0] - x1, footprint[:, 1] - y1, values, window, grid.steps
+        )
+        self._boundary = (grid.steps, x1, y1)
+        if self.first_confirmed_at is None:
+            self.first_confirmed_at = grid.steps
+
+    def _ride(self, highway: Highway, remaining: int) -> None:
+        grid = self._grid
+        steps, bx, by = self._boundary
+        offset = (grid.steps - steps) % highway.period
+        if offset:
+            self._step(min(remaining, highway.period - offset))
+            return
+
+        state = grid.get_state()
+        periods = (grid.steps - steps) // highway.period
+        x, y = state["x"], state["y"]
+        if (x, y) != (bx + periods * highway.dx, by + periods * highway.dy):
+            self.highway = None
+            return
+
+        if remaining < highway.period:
+            self._step(remaining)
+            return
+        stripe = Stripe(highway.xs + x, highway.ys + y, highway.values, highway.dx, highway.dy, remaining // highway.period + 1)
+        periods = grid.cells.stripe_capacity(stripe) - 1  # Keep the ant's next period on the grid.
+        if periods < 1:
+            self.highway = None
+            self._step(remaining)
+            return
+        stripe = stripe._replace(periods=periods)
+        wx, wy, width, height = highway.window
+        if not grid.cells.stripe_is_blank(stripe, (x + wx, y + wy, width, height)):
+            self.highway = None
+            return
+
+        grid.cells.write_stripe(stripe)
+        grid.mark_changed(*stripe.bounds())
+        state.update(x=x + periods * highway.dx, y=y + periods * highway.dy, steps=state["steps"] + periods * highway.period)
+        grid.set_state(state)
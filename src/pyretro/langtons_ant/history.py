@@ -0,0 +1,169 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from pyretro.langtons_ant.cells import PackedCells
+from pyretro.langtons_ant.enums import DIRECTION_DELTAS
+from pyretro.langtons_ant.grid import Grid
+
+_MOVE_DIRECTIONS = np.zeros(9, dtype=np.uint8)  # Indexed by (dx + 1) * 3 + dy + 1.
+for _direction, (_dx, _dy) in enumerate(DIRECTION_DELTAS):
+    _MOVE_DIRECTIONS[(_dx + 1) * 3 + _dy + 1] = _direction
+_DELTAS = np.array(DIRECTION_DELTAS, dtype=np.int64)
+
+
+class Keyframe(NamedTuple):
+    state: dict
+    bounds: tuple[int, int, int, int]
+    cells: np.ndarray  # Bit-packed along y for two colour rules.
+
+
+class TurnSegment(NamedTuple):
+    start: int
+    length: int
+    bits: np.ndarray
+
+
+class History:
+    """Records a grid's run as a packed turn stream plus a keyframe every ``keyframe_interval`` steps.
+
+    Given where the ant started, its turns determine its whole path, so the stream
+    costs one bit per step when the rule only ever makes two kinds of turn and two
+    bits otherwise. The first keyframe copies the grid; later ones only copy the box
+    the ant has written to so far. ``seek`` restores the nearest keyframe at or
+    before a step and replays from there, so it costs at most ``keyframe_interval``
+    steps. The grid must only be stepped through its history.
+    """
+
+    def __init__(self, grid: Grid, keyframe_interval: int = 1 << 20) -> None:
+        self._grid = grid
+        self.keyframe_interval = keyframe_interval
+        self.start = grid.steps
+        self.end = grid.steps  # Everything before this step is recorded.
+        self.finished = False  # Whether the ant walked off the grid at ``end``.
+        self.keyframes: dict[int, Keyframe] = {}
+        self.segments: list[TurnSegment] = []
+
+        turns = sorted(set(grid.rule.turns))
+        self._turn_codes = np.zeros(4, dtype=np.uint8)
+        self._turn_codes[turns] = np.arange(len(turns))
+        self._code_turns = np.array(turns, dtype=np.uint8)
+        self.bits_per_turn = 1 if len(turns) <= 2 else 2
+        self._packed = grid.rule.colors == 2
+        self._touched: Optional[tuple[int, int, int, int]] = None  # (x0, y0, x1, y1) of squares written.
+        self._keyframe()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(segment.bits.nbytes for segment in self.segments) + sum(
+            keyframe.cells.nbytes for keyframe in self.keyframes.values()
+        )
+
+    def _keyframe(self) -> None:
+        grid = self._grid
+        if not self.keyframes:
+            bounds = grid.cells.bounds()
+        elif self._touched is None:
+            bounds = (0, 0, 0, 0)
+        else:
+            x0, y0, x1, y1 = self._touched
+            bounds = (x0, y0, x1 - x0, y1 - y0)
+        if isinstance(grid.cells, PackedCells) and not self.keyframes:
+            cells = grid.cells.bits.copy()  # Already in the packed keyframe layout.
+        else:
+            cells = grid.cells.read(*bounds)
+            if self._packed:
+                cells = np.packbits(cells, axis=1, bitorder="little")
+        self.keyframes[grid.steps] = Keyframe(grid.get_state(), bounds, cells)
+
+    def step(self, n: int) -> int:
+        """Advance ``n`` steps, recording any not recorded before, and return the steps taken."""
+        grid = self._grid
+        target = grid.steps + n
+        start = grid.steps
+        while grid.steps < target and grid.on_grid:
+            boundary = (grid.steps - self.start) // self.keyframe_interval * self.keyframe_interval + self.start
+            chunk = min(target, boundary + self.keyframe_interval) - grid.steps
+            if grid.steps < self.end:
+                chunk = min(chunk, self.end - grid.steps)
+                grid.step(chunk)
+            else:
+                self._record(chunk)
+        return grid.steps - start
+
+    def _record(self, n: int) -> int:
+        grid = self._grid
+        before = grid.get_state()
+        visited: list[tuple[int, int]] = []
+        taken = grid.step(n, visited)
+        positions = np.array(visited + [tuple(grid.ant.coordinates)], dtype=np.int64)
+        (x0, y0), (x1, y1) = positions[:-1].min(axis=0).tolist(), (positions[:-1].max(axis=0) + 1).tolist()
+        if self._touched is not None:
+            x0, y0 = min(x0, self._touched[0]), min(y0, self._touched[1])
+            x1, y1 = max(x1, self._touched[2]), max(y1, self._touched[3])
+        self._touched = (x0, y0, x1, y1)
+        moves = np.diff(positions, axis=0)
+        directions = _MOVE_DIRECTIONS[(moves[:, 0] + 1) * 3 + moves[:, 1] + 1]
+        turns = (directions - np.concatenate([[before["direction"]], directions[:-1]])) & 3
+        codes = self._turn_codes[turns]
+        if self.bits_per_turn == 2:
+            codes = np.stack([codes & 1, codes >> 1], axis=1).reshape(-1)
+        self.segments.append(TurnSegment(grid.steps - taken, taken, np.packbits(codes, bitorder="little")))
+        self.end = grid.steps
+        self.finished = not grid.on_grid
+        if (grid.steps - self.start) % self.keyframe_interval == 0:
+            self._keyframe()
+        return taken
+
+    def turns(self, start: int, stop: int) -> np.ndarray:
+        """Return the clockwise quarter turn made on each recorded step in ``[start, stop)``."""
+        if not self.start <= start <= stop <= self.end:
+            raise IndexError("Steps %s..%s are outside the recorded %s..%s" % (start, stop, self.start, self.end))
+        parts = []
+        for segment in self.segments:
+            lo, hi = max(start, segment.start), min(stop, segment.start + segment.length)
+            if lo < hi:
+                bits = np.unpackbits(segment.bits, count=segment.length * self.bits_per_turn, bitorder="little")
+                codes = bits if self.bits_per_turn == 1 else bits[0::2] | (bits[1::2] << 1)
+                parts.append(codes[lo - segment.start:hi - segment.start])
+        return self._code_turns[np.concatenate(parts)] if parts else np.zeros(0, dtype=np.uint8)
+
+    def path(self, start: int, stop: int) -> np.ndarray:
+        """Return the ant's ``(x, y)`` before each step in ``[start, stop]``, rebuilt from the turn stream alone."""
+        keyframe_step = max(step for step in self.keyframes if step <= start)
+        state = self.keyframes[keyframe_step].state
+        directions = (state["direction"] + np.cumsum(self.turns(keyframe_step, stop), dtype=np.int64)) & 3
+        positions = np.vstack([(state["x"], state["y"]), (state["x"], state["y"]) + np.cumsum(_DELTAS[directions], axis=0)])
+        return positions[start - keyframe_step:]
+
+    def seek(self, step: int) -> None:
+        """Put the grid in the state it was in after ``step`` steps."""
+        if step < self.start:
+            raise IndexError("History starts at step %s" % self.start)
+        grid = self._grid
+        if step < grid.steps or grid.steps < max(s for s in self.keyframes if s <= step):
+            keyframe_step = max(s for s in self.keyframes if s <= step)
+            self._restore(self.keyframes[keyframe_step])
+        self.step(step - grid.steps)
+
+    def _restore(self, keyframe: Keyframe) -> None:
+        grid = self._grid
+        if self._touched is not None:
+            x0, y0, x1, y1 = self._touched
+            region = np.zeros((x1 - x0, y1 - y0), dtype=np.uint8)
+            self._paint(self.keyframes[self.start], x0, y0, region)
+            self._paint(keyframe, x0, y0, region)
+            grid.cells.write(x0, y0, region)
+            grid.mark_changed(x0, y0, x1 - x0, y1 - y0)
+        grid.set_state(keyframe.state)
+
+    def _paint(self, keyframe: Keyframe, x: int, y: int, region: np.ndarray) -> None:
+        kx, ky, width, height = keyframe.bounds
+        x0, y0 = max(x, kx), max(y, ky)
+        x1, y1 = min(x + region.shape[0], kx + width), min(y + region.shape[1], ky + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        cells = keyframe.cells[x0 - kx:x1 - kx]
+        if self._packed:
+            cells = np.unpackbits(cells, axis=1, count=height, bitorder="little")
+        region[x0 - x:x1 - x, y0 - y:y1 - y] = cells[:, y0 - ky:y1 - ky]
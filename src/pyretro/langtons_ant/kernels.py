@@ -0,0 +1,85 @@
+from typing import NamedTuple
+
+from pyretro.langtons_ant.enums import DIRECTION_DELTAS
+
+_DY = tuple(dy for _, dy in DIRECTION_DELTAS)
+
+
+class StepResult(NamedTuple):
+    x: int
+    y: int
+    direction: int
+    state: int
+    steps: int
+
+
+def _window_bounds(window, width, height, stride) -> tuple[int, int, int, int]:
+    """Return the ``y`` and flat index ranges the ant may step in, as ``(y0, y1, i0, i1)``."""
+    if window is None:
+        return 0, height, 0, width * stride
+    x0, y0, x1, y1 = window
+    return y0, y1, x0 * stride, x1 * stride
+
+
+def run_bytes(cells, width, height, x, y, direction, state, n, rule, trace=None, reads=None, window=None) -> StepResult:
+    """Step an ant over a flat, column major buffer with one byte per square.
+
+    Stops early when the ant walks off the grid, or out of the ``(x0, y0, x1, y1)``
+    ``window`` inside it if given; the returned coordinates are then out of bounds.
+    If ``trace`` is given, the flat index of every square the ant updates is appended
+    to it, and if ``reads`` is also given, the rule table index
+    (``state * colors + color``) used on every step.
+    """
+    writes, turns, next_offsets = rule.writes, rule.turns, rule.next_offsets
+    offset = state * rule.colors
+    dy = _DY
+    di = (-1, height, 1, -height)
+    i = x * height + y
+    y0, y1, i0, i1 = _window_bounds(window, width, height, height)
+    steps = 0
+    for steps in range(1, n + 1):
+        k = offset + cells[i]
+        cells[i] = writes[k]
+        if trace is not None:
+            trace.append(i)
+            if reads is not None:
+                reads.append(k)
+        direction = (direction + turns[k]) & 3
+        offset = next_offsets[k]
+        y += dy[direction]
+        i += di[direction]
+        if not (y0 <= y < y1 and i0 <= i < i1):
+            break
+    return StepResult((i - y) // height, y, direction, offset // rule.colors, steps)
+
+
+def run_bits(bits, width, height, x, y, direction, state, n, rule, trace=None, reads=None, window=None) -> StepResult:
+    """Step an ant over a flat buffer with one bit per square, for two colour rules.
+
+    Columns are padded to whole bytes, matching the layout of ``PackedCells``.
+    """
+    writes, turns, next_offsets = rule.writes, rule.turns, rule.next_offsets
+    offset = state * rule.colors
+    stride = -(-height // 8) * 8
+    dy = _DY
+    di = (-1, stride, 1, -stride)
+    i = x * stride + y
+    y0, y1, i0, i1 = _window_bounds(window, width, height, stride)
+    steps = 0
+    for steps in range(1, n + 1):
+        byte = i >> 3
+        bit = i & 7
+        value = bits[byte]
+        k = offset + ((value >> bit) & 1)
+        bits[byte] = (value & ~(1 << bit)) | (writes[k] << bit)
+        if trace is not None:
+            trace.append(i)
+            if reads is not None:
+                reads.append(k)
+        direction = (direction + turns[k]) & 3
+        offset = next_offsets[k]
+        y += dy[direction]
+        i += di[direction]
+        if not (y0 <= y < y1 and i0 <= i < i1):
+            break
+    return StepResult((i - y) // stride, y, direction, offset // rule.colors, steps)
@@ -0,0 +1,87 @@
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+from pyretro.langtons_ant.grid import Grid
+from pyretro.langtons_ant.kernels import run_bytes
+
+
+class WindowExit(NamedTuple):
+    contents: bytes
+    x: int  # Relative to the window, so outside it when the ant has left.
+    y: int
+    direction: int
+    state: int
+    steps: int
+    exited: bool
+
+
+class MacroStepper:
+    """Steps a grid one ``window`` x ``window`` block at a time, memoising each block.
+
+    The ant's path through a block depends only on its state, direction and position
+    in the block and on the block's contents. Blocks are aligned to multiples of
+    ``window`` and their outcomes are kept in an LRU cache of ``cache_size`` entries.
+    Use ``cache_info`` to tune the window: larger windows skip more steps per hit but
+    repeat less often.
+    """
+
+    def __init__(self, grid: Grid, window: int = 16, cache_size: int = 1 << 16, max_window_steps: int = 4096) -> None:
+        self._grid = grid
+        self.window = window
+        self.max_window_steps = max_window_steps
+        self._run_window = functools.lru_cache(maxsize=cache_size)(self._simulate_window)
+
+    def cache_info(self):
+        return self._run_window.cache_info()
+
+    def cache_clear(self) -> None:
+        self._run_window.cache_clear()
+
+    def _simulate_window(self, state: int, direction: int, x: int, y: int, contents: bytes) -> WindowExit:
+        cells = bytearray(contents)
+        size = self.window
+        result = run_bytes(cells, size, size, x, y, direction, state, self.max_window_steps, self._grid.rule)
+        exited = not (0 <= result.x < size and 0 <= result.y < size)
+        return WindowExit(bytes(cells), result.x, result.y, result.direction, result.state, result.steps, exited)
+
+    def _inside(self, x0: int, y0: int) -> bool:
+        shape = self._grid.cells.shape
+        if shape is None:
+            return True
+        width, height = shape
+        return x0 >= 0 and y0 >= 0 and x0 + self.window <= width and y0 + self.window <= height
+
+    def step(self, n: int) -> int:
+        """Advance ``n`` steps and return how many were taken, fewer if the ant left the grid."""
+        grid = self._grid
+        cells, size = grid.cells, self.window
+        state = grid.get_state()
+        x, y, direction, ant_state, steps = state["x"], state["y"], state["direction"], state["state"], state["steps"]
+        end = steps + n
+        while steps < end:
+            x0, y0 = x - x % size, y - y % size
+            if self._inside(x0, y0):
+                contents = cells.read(x0, y0, size, size).tobytes()
+                result = self._run_window(ant_state, direction, x - x0, y - y0, contents)
+                if result.exited and steps + result.steps <= end:
+                    cells.write(x0, y0, np.frombuffer(result.contents, dtype=np.uint8).reshape(size, size))
+                    grid.mark_changed(x0, y0, size, size)
+                    x, y, direction, ant_state = x0 + result.x, y0 + result.y, result.direction, result.state
+                    steps += result.steps
+                    continue
+            # Near the edge, at the end of the budget or stuck in a block: step exactly.
+            grid.set_state({"x": x, "y": y, "direction": direction, "state": ant_state, "steps": steps})
+            if cells.shape is not None and not (0 <= x < cells.shape[0] and 0 <= y < cells.shape[1]):
+                break  # Walked off the grid.
+            chunk = min(end - steps, size * size)
+            taken = grid.step(chunk)
+            if taken < chunk:
+                return taken + steps - state["steps"]
+            state_after = grid.get_state()
+            x, y, direction, ant_state, steps = (
+                state_after["x"], state_after["y"], state_after["direction"], state_after["state"], state_after["steps"]
+            )
+        grid.set_state({"x": x, "y": y, "direction": direction, "state": ant_state, "steps": steps})
+        return steps - state["steps"]
@@ -0,0 +1,67 @@
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from pyretro.langtons_ant.cells import Cells, DenseCells, PackedCells
+from pyretro.langtons_ant.checkpoint import durable_replace
+from pyretro.langtons_ant.grid import Grid
+
+
+class MemmapStore:
+    """Grid cells kept in a memory mapped ``.npy`` file, with a JSON header for the ant.
+
+    Only the pages the ant touches are loaded, so grids much larger than RAM can be
+    simulated. The operating system may write pages back at any time, so the file is
+    only consistent with the header after ``save`` or a clean exit. ``save`` flushes
+    and fsyncs the cells before the header that claims their step count replaces the
+    old one, so a crash leaves either the old header or a matching new one.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = Path(path)
+        self.header_path = self.path.with_suffix(".json")
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.header_path.exists()
+
+    def create(self, shape: tuple[int, int], packed: bool = False) -> Cells:
+        width, height = shape
+        file_shape = (width, -(-height // 8)) if packed else (width, height)
+        arr = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.uint8, shape=file_shape)
+        self._write_header({"shape": [width, height], "packed": packed, "state": None})
+        return PackedCells(shape, arr) if packed else DenseCells(shape, arr)
+
+    def open(self) -> Cells:
+        header = self.read_header()
+        shape = tuple(header["shape"])
+        arr = np.load(self.path, mmap_mode="r+")
+        return PackedCells(shape, arr) if header["packed"] else DenseCells(shape, arr)
+
+    def read_header(self) -> dict:
+        with open(self.header_path) as f:
+            return json.load(f)
+
+    def save(self, grid: Grid) -> None:
+        grid.cells.flush()
+        with open(self.path, "rb+") as f:
+            os.fsync(f.fileno())
+        header = self.read_header()
+        header["state"] = grid.get_state()
+        self._write_header(header)
+
+    def resume(self, grid: Grid) -> Grid:
+        state = self.read_header()["state"]
+        if state is not None:
+            grid.set_state(state)
+        return grid
+
+    def _write_header(self, header: dict) -> None:
+        tmp_path = self.header_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(header, f)
+            f.flush()
+            os.fsync(f.fileno())
+        durable_replace(tmp_path, self.header_path)
@@ -0,0 +1,26 @@
+import numpy as np
+
+_COLORS = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "orange": (255, 165, 0),
+    "purple": (160, 32, 240),
+    "gray": (190, 190, 190),
+    "brown": (165, 42, 42),
+}
+COLOR_NAMES = tuple(_COLORS)  # Indexed by cell value, repeating for rules with more colours.
+PALETTE = np.resize(np.array(list(_COLORS.values()), dtype=np.uint8), (256, 3))  # RGB indexed by cell value.
+
+
+def rasterize(cells: np.ndarray, palette: np.ndarray = PALETTE, square_n: int = 1) -> np.ndarray:
+    """Map an ``(x, y)`` array of cell values to an ``(x, y, 3)`` RGB image scaled by ``square_n``."""
+    pixels = palette[cells]
+    if square_n != 1:
+        pixels = np.repeat(np.repeat(pixels, square_n, axis=0), square_n, axis=1)
+    return pixels
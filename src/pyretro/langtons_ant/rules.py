@@ -0,0 +1,114 @@
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+TURNS = {"N": 0, "R": 1, "U": 2, "L": 3}  # Clockwise quarter turns.
+TURN_NAMES = {turn: name for name, turn in TURNS.items()}
+MAX_COLORS = 256  # Cells are stored as uint8.
+
+
+class Rule:
+    """Turmite transition table compiled to flat lookup tuples.
+
+    Every table is indexed by ``state * colors + color`` and gives the colour to
+    write, the clockwise quarter turns to make and the next state.
+    """
+
+    def __init__(self, writes: Sequence[int], turns: Sequence[int], next_states: Sequence[int], colors: int, name: str = "") -> None:
+        if not 2 <= colors <= MAX_COLORS:
+            raise ValueError("A rule needs between 2 and %s colours, got %s" % (MAX_COLORS, colors))
+        if not len(writes) == len(turns) == len(next_states) or len(writes) % colors:
+            raise ValueError("Transition tables must have one entry per state and colour")
+        states = len(writes) // colors
+        if any(not 0 <= write < colors for write in writes):
+            raise ValueError("Rule writes a colour outside 0..%s" % (colors - 1))
+        if any(not 0 <= state < states for state in next_states):
+            raise ValueError("Rule moves to a state outside 0..%s" % (states - 1))
+        self.colors = colors
+        self.states = states
+        self.writes = tuple(writes)
+        self.turns = tuple(turn & 3 for turn in turns)
+        self.next_states = tuple(next_states)
+        self.next_offsets = tuple(state * colors for state in next_states)  # Premultiplied for the kernels.
+        self.name = name
+
+    @classmethod
+    def from_string(cls, rule: str) -> "Rule":
+        """Build a single state rule such as ``"RL"`` or ``"LLRR"``: colour ``c`` turns by ``rule[c]`` and becomes ``c + 1``."""
+        rule = rule.upper()
+        if any(turn not in TURNS for turn in rule):
+            raise ValueError("Rule strings may only contain %s, got %r" % ("".join(TURNS), rule))
+        colors = len(rule)
+        writes = [(color + 1) % colors for color in range(colors)]
+        return cls(writes, [TURNS[turn] for turn in rule], [0] * colors, colors, rule)
+
+    @classmethod
+    def from_table(cls, table: Sequence[Sequence[Sequence]], name: str = "") -> "Rule":
+        """Build a turmite from ``table[state][color] = (write, turn, next_state)``."""
+        colors = len(table[0])
+        if any(len(row) != colors for row in table):
+            raise ValueError("Every state needs an entry for each of the %s colours" % colors)
+        entries = [entry for row in table for entry in row]
+        turns = [TURNS[turn.upper()] if isinstance(turn, str) else turn for _, turn, _ in entries]
+        return cls([write for write, _, _ in entries], turns, [state for _, _, state in entries], colors, name)
+
+    def to_table(self) -> list:
+        return [
+            [
+                [self.writes[k], TURN_NAMES[self.turns[k]], self.next_states[k]]
+                for k in range(state * self.colors, (state + 1) * self.colors)
+            ]
+            for state in range(self.states)
+        ]
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(writes, turns, next_states)`` as numpy arrays for vectorised stepping."""
+        return (
+            np.array(self.writes, dtype=np.uint8),
+            np.array(self.turns, dtype=np.uint8),
+            np.array(self.next_states, dtype=np.intp),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return (self.colors, self.writes, self.turns, self.next_states) == (
+            other.colors, other.writes, other.turns, other.next_states
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.colors, self.writes, self.turns, self.next_states))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name or self.to_table()!r})"
+
+
+LANGTON = Rule.from_string("RL")
+
+
+class RuleTables(NamedTuple):
+    """Several rules padded to a common shape, each table indexed ``[rule, state, color]``."""
+
+    writes: np.ndarray
+    turns: np.ndarray
+    next_states: np.ndarray
+
+
+def stack_rules(rules: Sequence[Rule]) -> RuleTables:
+    """Stack rules for vectorised stepping.
+
+    Colours a rule does not know about (written by another rule) are treated as
+    ``color % rule.colors``.
+    """
+    colors = max(rule.colors for rule in rules)
+    states = max(rule.states for rule in rules)
+    writes = np.zeros((len(rules), states, colors), dtype=np.uint8)
+    turns = np.zeros_like(writes)
+    next_states = np.zeros((len(rules), states, colors), dtype=np.intp)
+    for r, rule in enumerate(rules):
+        rule_writes, rule_turns, rule_next_states = (table.reshape(rule.states, rule.colors) for table in rule.arrays())
+        wrapped = np.arange(colors) % rule.colors
+        writes[r, :rule.states] = rule_writes[:, wrapped]
+        turns[r, :rule.states] = rule_turns[:, wrapped]
+        next_states[r, :rule.states] = rule_next_states[:, wrapped]
+    return RuleTables(writes, turns, next_states)
@@ -0,0 +1,183 @@
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from pyretro.langtons_ant.cells import Cells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid
+
+HEADER_FIELDS = ("sequence", "x", "y", "direction", "state", "steps", "width", "height", "packed", "running")
+CHANGE_RING = 32  # Publishes whose changed regions are kept, for readers that fall behind.
+HEADER_BYTES = 1152  # Room for the fields and the change ring, keeping the cells aligned.
+_FIELD = {name: i for i, name in enumerate(HEADER_FIELDS)}
+_RING = len(HEADER_FIELDS)  # Header index of the first (x, y, width, height) in the ring.
+
+
+class SharedGrid:
+    """Grid cells and ant state in a ``multiprocessing.shared_memory`` block.
+
+    The simulating process steps a ``Grid`` built on ``cells`` and calls ``publish``
+    now and then; other processes ``attach`` by name and see the same cells without
+    copying. The ant state in the header is guarded by a sequence counter that is odd
+    while a write is in progress, so readers never see half an update. The cells
+    themselves are read while they change, which can tear a frame but never blocks
+    the simulation. Each publish also records the region changed since the one
+    before, in a ring of the last ``CHANGE_RING``.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._header = np.ndarray((_RING + 4 * CHANGE_RING,), dtype=np.int64, buffer=shm.buf)
+        width, height = int(self._header[_FIELD["width"]]), int(self._header[_FIELD["height"]])
+        self.shape = (width, height)
+        self.packed = bool(self._header[_FIELD["packed"]])
+        cells_shape = (width, -(-height // 8)) if self.packed else (width, height)
+        arr = np.ndarray(cells_shape, dtype=np.uint8, buffer=shm.buf, offset=HEADER_BYTES)
+        self.cells: Cells = PackedCells(self.shape, arr) if self.packed else DenseCells(self.shape, arr)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(cls, shape: tuple[int, int], packed: bool = False, name: Optional[str] = None) -> "SharedGrid":
+        width, height = shape
+        size = HEADER_BYTES + (width * -(-height // 8) if packed else width * height)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_RING + 4 * CHANGE_RING,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_FIELD["width"]], header[_FIELD["height"]], header[_FIELD["packed"]] = width, height, packed
+        header[_FIELD["running"]] = 1
+        np.ndarray((size - HEADER_BYTES,), dtype=np.uint8, buffer=shm.buf, offset=HEADER_BYTES)[:] = 0
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedGrid":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def sequence(self) -> int:
+        return int(self._header[_FIELD["sequence"]])
+
+    @property
+    def running(self) -> bool:
+        return bool(self._header[_FIELD["running"]])
+
+    def publish(self, grid: Grid, running: bool = True) -> None:
+        """Copy the grid's ant state into the header, with the region ``grid.pop_changed`` reports."""
+        state = grid.get_state()
+        changed = grid.pop_changed() or (0, 0, 0, 0)
+        header = self._header
+        header[_FIELD["sequence"]] += 1
+        for name in ("x", "y", "direction", "state", "steps"):
+            header[_FIELD[name]] = state[name]
+        header[_FIELD["running"]] = running
+        slot = _RING + 4 * ((int(header[_FIELD["sequence"]]) // 2) % CHANGE_RING)
+        header[slot:slot + 4] = changed
+        header[_FIELD["sequence"]] += 1
+
+    def read_state(self) -> dict:
+        """Return the last published ant state, waiting out a write in progress."""
+        header = self._header
+        while True:
+            sequence = int(header[_FIELD["sequence"]])
+            if sequence % 2 == 0:
+                state = {name: int(header[_FIELD[name]]) for name in ("x", "y", "direction", "state", "steps")}
+                if int(header[_FIELD["sequence"]]) == sequence:
+                    return state
+            time.sleep(0)
+
+    def read_update(self, since: int) -> tuple[int, dict, tuple[int, int, int, int]]:
+        """Return the sequence, the ant state and the region changed by publishes after sequence ``since``.
+
+        The region is ``(x, y, width, height)``, and the whole grid if the ring no longer
+        reaches back that far.
+        """
+        header = self._header
+        while True:
+            sequence = int(header[_FIELD["sequence"]])
+            if sequence % 2 == 0:
+                state = {name: int(header[_FIELD[name]]) for name in ("x", "y", "direction", "state", "steps")}
+                changed = self._changes_since(since, sequence)
+                if int(header[_FIELD["sequence"]]) == sequence:
+                    return sequence, state, changed
+            time.sleep(0)
+
+    def _changes_since(self, since: int, sequence: int) -> tuple[int, int, int, int]:
+        if since < 0 or (sequence - since) // 2 > CHANGE_RING:
+            return (0, 0, *self.shape)
+        boxes = []
+        for publish in range(since // 2, sequence // 2):
+            slot = _RING + 4 * (publish % CHANGE_RING)
+            x, y, width, height = (int(value) for value in self._header[slot:slot + 4])
+            if width and height:
+                boxes.append((x, y, x + width, y + height))
+        if not boxes:
+            return 0, 0, 0, 0
+        x0, y0 = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        x1, y1 = max(box[2] for box in boxes), max(box[3] for box in boxes)
+        return x0, y0, x1 - x0, y1 - y0
+
+    def close(self) -> None:
+        del self.cells, self._header  # Release the views before the buffer.
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedMirror:
+    """Follows a grid stepped in another process, for use as a ``Controller`` stepper.
+
+    ``step`` ignores its argument: it copies the published ant state onto the local
+    grid, which is built on the shared cells, and marks the region published as
+    changed since the last call.
+    """
+
+    def __init__(self, grid: Grid, shared: SharedGrid) -> None:
+        self._grid = grid
+        self._shared = shared
+        self._sequence = -1
+
+    def step(self, n: int) -> int:
+        if self._shared.sequence != self._sequence:
+            self._sequence, state, changed = self._shared.read_update(self._sequence)
+            self._grid.set_state(state)
+            if changed[2] and changed[3]:
+                self._grid.mark_changed(*changed)
+        elif not self._shared.running:
+            return 0
+        return n
+
+
+def simulate(shared: SharedGrid, grid: Grid, chunk: int = 1 << 16, steps: Optional[int] = None) -> int:
+    """Step ``grid``, which must be built on ``shared.cells``, publishing after every ``chunk`` steps.
+
+    Runs until ``steps`` have been taken, forever if it is None, or until the ant walks off the grid.
+    """
+    start = grid.steps
+    while steps is None or grid.steps - start < steps:
+        n = chunk if steps is None else min(chunk, steps - (grid.steps - start))
+        grid.step(n)
+        shared.publish(grid, running=grid.on_grid)
+        if not grid.on_grid:
+            break
+    return grid.steps - start
+
+
+def view(name: str, square_n: int = 1, fps: int = 30) -> None:
+    """Open a window following the shared grid ``name`` until it is closed."""
+    import pygame.display
+
+    from pyretro.langtons_ant.ant import Ant, Coordinates
+    from pyretro.langtons_ant.controller import Controller
+    from pyretro.langtons_ant.grid import GridSpec
+
+    shared = SharedGrid.attach(name)
+    try:
+        grid = Grid(Ant(square_n, Coordinates(0, 0)), GridSpec(square_n, shared.shape[0]), shared.cells)
+        surface = pygame.display.set_mode((shared.shape[0] * square_n, shared.shape[1] * square_n))
+        Controller(grid, surface, fps=fps, stepper=SharedMirror(grid, shared)).run()
+    finally:
+        shared.close()
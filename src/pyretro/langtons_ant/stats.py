@@ -0,0 +1,128 @@
+import collections
+from typing import Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from pyretro.langtons_ant.grid import Grid
+
+
+class Metrics(NamedTuple):
+    steps: int
+    black: int  # Squares that are not white.
+    histogram: tuple[Optional[int], ...]  # Squares of each colour; white is None on unbounded grids.
+    bbox: Optional[tuple[int, int, int, int]]  # (x, y, width, height) of the squares visited.
+    distinct: int  # Squares visited at least once.
+    max_visits: int
+    x: int
+    y: int
+    dx: int  # Displacement from where tracking started.
+    dy: int
+
+
+class Stats:
+    """Keeps running metrics for a grid as its squares change, without rescanning it.
+
+    Step the grid through ``step`` or ``records``. Each step costs a constant amount
+    of work on top of stepping: the rule table index used tells which colour was read
+    and written, so the histogram is updated from it. Counting the colours already on
+    the grid takes one scan when tracking starts, unless ``histogram`` is given.
+    """
+
+    def __init__(self, grid: Grid, histogram: Optional[np.ndarray] = None, chunk: int = 1 << 16) -> None:
+        self._grid = grid
+        self.chunk = chunk
+        colors = grid.rule.colors
+        if histogram is None:
+            histogram = np.bincount(grid.cells.to_array().ravel(), minlength=colors)
+        self.histogram = np.zeros(max(colors, len(histogram)), dtype=np.int64)
+        self.histogram[:len(histogram)] = histogram
+        shape = grid.cells.shape
+        # Visit counts per square: an array on bounded grids, a counter keyed by (x, y) otherwise.
+        self.visits: Union[np.ndarray, collections.Counter] = (
+            np.zeros(shape, dtype=np.uint32) if shape is not None else collections.Counter()
+        )
+        self._distinct = 0
+        self._bbox: Optional[tuple[int, int, int, int]] = None  # (x0, y0, x1, y1), exclusive ends.
+        self._max_visits = 0
+        self._writes = np.array(grid.rule.writes, dtype=np.int64)
+        self._origin = tuple(grid.ant.coordinates)
+        self.finished = False  # Whether the ant walked off the grid.
+
+    def step(self, n: int) -> int:
+        """Advance ``n`` steps, updating the metrics, and return the steps taken."""
+        taken = 0
+        while taken < n and not self.finished:
+            chunk = min(n - taken, self.chunk)
+            visited: list[tuple[int, int]] = []
+            reads: list[int] = []
+            taken += self._grid.step(chunk, visited, reads)
+            self._update(visited, reads)
+            self.finished = not self._grid.on_grid
+        return taken
+
+    def _update(self, visited: list, reads: list) -> None:
+        if not visited:
+            return
+        colors = self._grid.rule.colors
+        reads_arr = np.array(reads, dtype=np.int64)
+        size = len(self.histogram)
+        self.histogram += np.bincount(self._writes[reads_arr], minlength=size)[:size]
+        self.histogram -= np.bincount(reads_arr % colors, minlength=size)[:size]
+
+        points = np.array(visited, dtype=np.int64)
+        (x0, y0), (x1, y1) = points.min(axis=0).tolist(), (points.max(axis=0) + 1).tolist()
+        if self._bbox is not None:
+            x0, y0 = min(x0, self._bbox[0]), min(y0, self._bbox[1])
+            x1, y1 = max(x1, self._bbox[2]), max(y1, self._bbox[3])
+        self._bbox = (x0, y0, x1, y1)
+
+        if isinstance(self.visits, np.ndarray):
+            flat = self.visits.reshape(-1)
+            squares, counts = np.unique(points[:, 0] * self.visits.shape[1] + points[:, 1], return_counts=True)
+            self._distinct += int(np.count_nonzero(flat[squares] == 0))
+            flat[squares] += counts.astype(np.uint32)
+            self._max_visits = max(self._max_visits, int(flat[squares].max()))
+            return
+        points, counts = np.unique(points, axis=0, return_counts=True)
+        visits = self.visits
+        for point, count in zip(map(tuple, points.tolist()), counts.tolist()):
+            visits[point] += count
+            self._max_visits = max(self._max_visits, visits[point])
+        self._distinct = len(visits)
+
+    def metrics(self) -> Metrics:
+        x, y = self._grid.ant.coordinates
+        bbox = None
+        if self._bbox is not None:
+            x0, y0, x1, y1 = self._bbox
+            bbox = (x0, y0, x1 - x0, y1 - y0)
+        return Metrics(
+            self._grid.steps,
+            int(self.histogram[1:].sum()),
+            self._histogram(),
+            bbox,
+            self._distinct,
+            self._max_visits,
+            x,
+            y,
+            x - self._origin[0],
+            y - self._origin[1],
+        )
+
+    def _histogram(self) -> tuple[Optional[int], ...]:
+        counts: list[Optional[int]] = list(self.histogram.tolist())
+        if self._grid.cells.shape is None:
+            counts[0] = None  # An unbounded grid has no white total; only changes to it are tracked.
+        return tuple(counts)
+
+    def records(self, every: int, until: Optional[int] = None) -> Iterator[Metrics]:
+        """Step the grid and yield its metrics every ``every`` steps.
+
+        Stops after ``until`` steps or when the ant walks off the grid; stop iterating
+        to stop the run early.
+        """
+        start = self._grid.steps
+        while not self.finished and (until is None or self._grid.steps - start < until):
+            n = every if until is None else min(every, until - (self._grid.steps - start))
+            self.step(n)
+            yield self.metrics()
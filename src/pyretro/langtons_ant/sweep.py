@@ -0,0 +1,113 @@
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.highway import FastForward
+from pyretro.langtons_ant.rules import Rule
+
+FIELDS = ("rule", "size", "x", "y", "budget", "steps", "highway_confirmed_at", "black", "bbox", "seconds", "error")
+PROBE_INTERVAL = 1000  # Fine enough to time the highway's onset, cheap next to the probes themselves.
+
+
+class RunConfig(NamedTuple):
+    rule: str
+    size: int
+    x: int
+    y: int
+    budget: int
+
+
+def configurations(
+    rules: Iterable[str], sizes: Iterable[int], budgets: Iterable[int], starts: Optional[Sequence[tuple[int, int]]] = None
+) -> list[RunConfig]:
+    """Return every combination of the parameters, starting each ant in the middle unless ``starts`` is given.
+
+    Raises ValueError if a start is off the grid for any of the sizes.
+    """
+    runs = []
+    for rule, size, budget in itertools.product(rules, sizes, budgets):
+        for x, y in starts or [(size // 2, size // 2)]:
+            _check_start(x, y, size)
+            runs.append(RunConfig(rule, size, x, y, budget))
+    return runs
+
+
+def _check_start(x: int, y: int, size: int) -> None:
+    if not (0 <= x < size and 0 <= y < size):
+        raise ValueError("Start %s is off the %s x %s grid" % ((x, y), size, size))
+
+
+def run_config(config: RunConfig) -> dict:
+    """Run one configuration headless and summarise it.
+
+    ``highway_confirmed_at`` is the step at which the highway was confirmed, not the
+    one it began at: that is up to a probe interval plus a probe earlier. It is None
+    if no highway was found. Raises ValueError if the start is off the grid.
+    """
+    start = time.perf_counter()
+    _check_start(config.x, config.y, config.size)
+    rule = Rule.from_string(config.rule)
+    grid_spec = GridSpec(1, config.size)
+    packed = PackedCells(grid_spec.grid_size) if rule.colors == 2 else None
+    grid = Grid(Ant(1, Coordinates(config.x, config.y)), grid_spec, packed, rule)
+    fast_forward = FastForward(grid, probe_interval=PROBE_INTERVAL)
+    steps = fast_forward.step(config.budget)
+
+    cells = grid.cells.to_array()
+    xs, ys = np.flatnonzero(cells.any(axis=1)), np.flatnonzero(cells.any(axis=0))
+    bbox = [int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1)] if len(xs) else None
+    return {
+        **config._asdict(),
+        "steps": steps,
+        "highway_confirmed_at": fast_forward.first_confirmed_at,
+        "black": int(np.count_nonzero(cells)),
+        "bbox": bbox,
+        "seconds": time.perf_counter() - start,
+        "error": None,
+    }
+
+
+def _error_row(config: RunConfig, error: BaseException) -> dict:
+    row = dict.fromkeys(FIELDS)
+    row.update(config._asdict(), error="%s: %s" % (type(error).__name__, error))
+    return row
+
+
+def run_sweep(configs: Sequence[RunConfig], workers: Optional[int] = None) -> Iterator[dict]:
+    """Run configurations across a process pool, yielding each result as soon as it finishes.
+
+    A run that raises yields a row with the exception in ``error`` instead of ending the sweep.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_config, config): config for config in configs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as error:
+                yield _error_row(futures[future], error)
+
+
+def write_results(results: Iterable[dict], path: str) -> int:
+    """Stream results to ``path`` as JSON lines, or as CSV if it ends in ``.csv``. Return the row count."""
+    count = 0
+    with open(path, "w", newline="") as f:
+        if os.path.splitext(path)[1] == ".csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            write = lambda result: writer.writerow({**result, "bbox": json.dumps(result["bbox"])})
+        else:
+            write = lambda result: f.write(json.dumps(result) + "\n")
+        for result in results:
+            write(result)
+            f.flush()
+            count += 1
+    return count
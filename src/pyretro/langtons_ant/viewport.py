@@ -0,0 +1,160 @@
+import math
+from typing import Optional
+
+import numpy as np
+import pygame
+import pygame.surfarray
+
+from pyretro.langtons_ant.cells import Cells
+from pyretro.langtons_ant.grid import Grid
+from pyretro.langtons_ant.raster import PALETTE
+
+
+class DensityPyramid:
+    """Counts of non-white squares in ``2**l`` x ``2**l`` blocks, for every level ``l`` from 1 up.
+
+    Level ``l`` has one entry per block; the top level covers the whole grid in one.
+    ``update`` refreshes only the blocks over a given region.
+    """
+
+    def __init__(self, cells: Cells) -> None:
+        if cells.shape is None:
+            raise ValueError("A density pyramid needs a bounded grid")
+        self._cells = cells
+        width, height = cells.shape
+        self.depth = max(1, math.ceil(math.log2(max(width, height))))
+        self.levels: list[np.ndarray] = []
+        self.rebuild()
+
+    def level(self, l: int) -> np.ndarray:
+        return self.levels[l - 1]
+
+    def rebuild(self) -> None:
+        counts = (self._cells.to_array() != 0).astype(np.uint32)
+        self.levels = []
+        for _ in range(self.depth):
+            counts = self._reduce(counts)
+            self.levels.append(counts)
+
+    @staticmethod
+    def _reduce(counts: np.ndarray) -> np.ndarray:
+        width, height = counts.shape
+        padded = np.zeros((width + width % 2, height + height % 2), dtype=np.uint32)
+        padded[:width, :height] = counts
+        return padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).sum(axis=(1, 3), dtype=np.uint32)
+
+    def update(self, x: int, y: int, width: int, height: int) -> None:
+        """Recount the blocks over the ``width`` x ``height`` squares with their corner at ``(x, y)``."""
+        grid_width, grid_height = self._cells.shape  # type: ignore[misc]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, grid_width), min(y + height, grid_height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        children = None
+        for level in self.levels:
+            # Widen to whole blocks; children past the edge count as empty, as in ``rebuild``.
+            x0, y0, x1, y1 = x0 & ~1, y0 & ~1, x1 + (x1 & 1), y1 + (y1 & 1)
+            if children is None:
+                counts = (self._cells.read(x0, y0, x1 - x0, y1 - y0) != 0).astype(np.uint32)
+            else:
+                counts = np.zeros((x1 - x0, y1 - y0), dtype=np.uint32)
+                inside = children[x0:x1, y0:y1]
+                counts[:inside.shape[0], :inside.shape[1]] = inside
+            x0, y0, x1, y1 = x0 >> 1, y0 >> 1, x1 >> 1, y1 >> 1
+            level[x0:x1, y0:y1] = self._reduce(counts)
+            children = level
+
+
+class Viewport:
+    """A pannable, zoomable window onto a grid.
+
+    ``zoom`` is pixels per square. At a zoom of one or more only the visible squares
+    are read. Further out each pixel shows the density of the block under it, taken
+    from a ``DensityPyramid`` on bounded grids, so drawing costs the same however big
+    the world. Every frame the pyramid is brought up to date over the region the grid
+    reports changed (``Grid.pop_changed``), which is only the whole grid after
+    ``invalidate``.
+
+    Unbounded grids have no pyramid: zoomed out, each pixel shows the single square
+    at its centre, so fine patterns alias. This is a known limitation.
+    """
+
+    MIN_ZOOM = 1 / 4096
+    MAX_ZOOM = 64
+
+    def __init__(
+        self, grid: Grid, size: tuple[int, int], center: Optional[tuple[float, float]] = None, zoom: float = 1.0
+    ) -> None:
+        self._grid = grid
+        self.size = size
+        shape = grid.cells.shape
+        if center is None:
+            center = (shape[0] / 2, shape[1] / 2) if shape is not None else tuple(grid.ant.coordinates)
+        self.center = (float(center[0]), float(center[1]))
+        self.zoom = zoom
+        grid.pop_changed()  # The pyramid starts from the current cells.
+        self._pyramid = DensityPyramid(grid.cells) if shape is not None else None
+
+    def fit(self) -> None:
+        """Centre the viewport on the painted part of the grid and zoom to show all of it."""
+        x, y, width, height = self._grid.cells.bounds()
+        self.center = (x + width / 2, y + height / 2)
+        self.zoom = min(self.size[0] / max(width, 1), self.size[1] / max(height, 1))
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move the view by ``(dx, dy)`` pixels."""
+        self.center = (self.center[0] + dx / self.zoom, self.center[1] + dy / self.zoom)
+
+    def zoom_at(self, factor: float, pixel: Optional[tuple[int, int]] = None) -> None:
+        """Zoom by ``factor``, keeping the square under ``pixel`` (the window centre by default) still."""
+        px, py = pixel if pixel is not None else (self.size[0] / 2, self.size[1] / 2)
+        wx, wy = self.to_world(px, py)
+        self.zoom = min(self.MAX_ZOOM, max(self.MIN_ZOOM, self.zoom * factor))
+        self.center = (wx - (px - self.size[0] / 2) / self.zoom, wy - (py - self.size[1] / 2) / self.zoom)
+
+    def to_world(self, px: float, py: float) -> tuple[float, float]:
+        return (
+            self.center[0] + (px - self.size[0] / 2) / self.zoom,
+            self.center[1] + (py - self.size[1] / 2) / self.zoom,
+        )
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoom_at(2 ** (event.y / 4), pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            self.pan(-event.rel[0], -event.rel[1])
+
+    def _sample_positions(self) -> tuple[np.ndarray, np.ndarray]:
+        width, height = self.size
+        x0, y0 = self.to_world(0, 0)
+        return x0 + (np.arange(width) + 0.5) / self.zoom, y0 + (np.arange(height) + 0.5) / self.zoom
+
+    def render(self) -> np.ndarray:
+        """Return the visible part of the grid as a ``(width, height, 3)`` RGB image."""
+        self._grid.pop_dirty()  # The whole view is redrawn anyway.
+        changed = self._grid.pop_changed()
+        if self._pyramid is not None and changed is not None:
+            self._pyramid.update(*changed)
+
+        wx, wy = self._sample_positions()
+        ix, iy = np.floor(wx).astype(np.int64), np.floor(wy).astype(np.int64)
+        l = int(math.log2(1 / self.zoom)) if self.zoom < 1 else 0
+        if l == 0:
+            region = self._grid.cells.read(int(ix[0]), int(iy[0]), int(ix[-1] - ix[0]) + 1, int(iy[-1] - iy[0]) + 1)
+            return PALETTE[region[(ix - ix[0])[:, None], (iy - iy[0])[None, :]]]
+
+        if self._pyramid is not None:
+            l = min(l, self._pyramid.depth)
+            level = self._pyramid.level(l)
+            bx, by = ix >> l, iy >> l
+            inside_x, inside_y = (bx >= 0) & (bx < level.shape[0]), (by >= 0) & (by < level.shape[1])
+            density = level[np.clip(bx, 0, level.shape[0] - 1)[:, None], np.clip(by, 0, level.shape[1] - 1)[None, :]]
+            density = density * (inside_x[:, None] & inside_y[None, :]) / float(1 << (2 * l))
+        else:
+            xs, ys = np.broadcast_arrays(ix[:, None], iy[None, :])
+            density = self._grid.cells.gather(xs.ravel(), ys.ravel()).reshape(xs.shape) != 0
+        shade = (255 * (1 - np.minimum(density, 1))).astype(np.uint8)
+        return np.repeat(shade[:, :, None], 3, axis=2)
+
+    def draw_onto(self, surface: pygame.Surface) -> list[pygame.Rect]:
+        return [surface.blit(pygame.surfarray.make_surface(self.render()), (0, 0))]
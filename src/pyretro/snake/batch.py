@@ -0,0 +1,134 @@
+from typing import Optional
+
+import numpy as np
+
+from pyretro.snake.enums import Direction
+from pyretro.snake.structs import GameSettings
+
+DIRECTIONS = (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT)  # Action codes index this.
+_DX = np.array([0, 1, 0, -1])
+_DY = np.array([-1, 0, 1, 0])
+KEEP = -1  # Action code for carrying on in the same direction.
+
+
+class SnakeBatch:
+    """``n`` independent games of Snake held as arrays and advanced together.
+
+    Squares are numbered ``y * width + x``, like the cells of ``GameState``. Each game keeps an occupancy row, its
+    body as a ring buffer of squares with the head at ``heads``, its length,
+    direction, food square and whether it is still alive. The free squares of each
+    game are also packed at the front of a row, as in ``FreeCells``, so food is drawn
+    from them in one pass however full the board is. ``step`` follows
+    ``GameState.update_sprites``: food is placed when there is none, the snake grows
+    when its head is on the food or while shorter than ``auto_grow_until``, moves
+    wrap around the edges and running into its own body ends the game.
+    """
+
+    def __init__(self, n: int, game_settings: GameSettings, seed: Optional[int] = None) -> None:
+        self.width, self.height = game_settings.grid_size
+        self.cells = self.width * self.height
+        self.auto_grow_until = game_settings.auto_grow_until
+        self._rng = np.random.default_rng(seed)
+        self._games = np.arange(n)
+
+        self.occupied = np.zeros((n, self.cells), dtype=bool)
+        self.body = np.zeros((n, self.cells + 1), dtype=np.int64)  # Ring buffers of squares.
+        self.heads = np.zeros(n, dtype=np.int64)  # Index of each head in its ring buffer.
+        self.lengths = np.ones(n, dtype=np.int64)
+        self.directions = np.zeros(n, dtype=np.int64)  # Indexes DIRECTIONS.
+        self.food = np.zeros(n, dtype=np.int64)
+        self.has_food = np.zeros(n, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        self._free_squares = np.zeros((n, self.cells), dtype=np.int64)  # Free squares first, the rest after.
+        self._slots = np.zeros((n, self.cells), dtype=np.int64)  # Where each square is in _free_squares.
+        self._free = np.zeros(n, dtype=np.int64)  # How many squares are free.
+        self.reset(self._games)
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    @property
+    def head_squares(self) -> np.ndarray:
+        return self.body[self._games, self.heads]
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.lengths
+
+    def _place_food(self, games: np.ndarray) -> None:
+        games = games[self._free[games] > 0]  # A full board has nowhere to put food.
+        slots = self._rng.integers(0, self._free[games])
+        self.food[games] = self._free_squares[games, slots]
+        self.has_food[games] = True
+
+    def _swap(self, games: np.ndarray, slots: np.ndarray, others: np.ndarray) -> None:
+        squares = self._free_squares[games, slots]
+        other_squares = self._free_squares[games, others]
+        self._free_squares[games, slots] = other_squares
+        self._free_squares[games, others] = squares
+        self._slots[games, squares] = others
+        self._slots[games, other_squares] = slots
+
+    def _take(self, games: np.ndarray, squares: np.ndarray) -> None:
+        """Move free ``squares``, at most one per game, to the end of the free squares."""
+        self._free[games] -= 1
+        self._swap(games, self._slots[games, squares], self._free[games])
+
+    def _give_back(self, games: np.ndarray, squares: np.ndarray) -> None:
+        """Move taken ``squares``, at most one per game, back among the free squares."""
+        self._swap(games, self._slots[games, squares], self._free[games])
+        self._free[games] += 1
+
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Advance every live game one move, turning to ``actions`` (codes into ``DIRECTIONS`` or ``KEEP``).
+
+        Returns the alive mask.
+        """
+        games = self._games[self.alive]
+        if actions is not None:
+            actions = np.asarray(actions)[games]
+            turn = actions != KEEP
+            self.directions[games[turn]] = actions[turn]
+
+        self._place_food(games[~self.has_food[games]])
+        heads = self.body[games, self.heads[games]]
+        found = self.has_food[games] & (self.food[games] == heads)
+        self.has_food[games[found]] = False
+
+        directions = self.directions[games]
+        x = (heads % self.width + _DX[directions]) % self.width
+        y = (heads // self.width + _DY[directions]) % self.height
+        new_heads = y * self.width + x
+
+        grow = found | (self.lengths[games] < self.auto_grow_until)
+        movers = games[~grow]
+        capacity = self.body.shape[1]
+        tails = self.body[movers, (self.heads[movers] - self.lengths[movers] + 1) % capacity]
+        self.occupied[movers, tails] = False
+        self._give_back(movers, tails)
+        self.lengths[games[grow]] += 1
+
+        collided = self.occupied[games, new_heads]
+        self.alive[games[collided]] = False
+        self._take(games[~collided], new_heads[~collided])
+        self.heads[games] = (self.heads[games] + 1) % capacity
+        self.body[games, self.heads[games]] = new_heads
+        self.occupied[games, new_heads] = True
+        return self.alive
+
+    def reset(self, games: np.ndarray) -> None:
+        """Start the given games afresh."""
+        start = (self.height // 2) * self.width + self.width // 2
+        self.occupied[games] = False
+        self.occupied[games, start] = True
+        self._free_squares[games] = np.arange(self.cells)
+        self._slots[games] = np.arange(self.cells)
+        self._free[games] = self.cells
+        self._take(games, np.full(len(games), start))
+        self.body[games, 0] = start
+        self.heads[games] = 0
+        self.lengths[games] = 1
+        self.directions[games] = 0
+        self.food[games] = self._rng.integers(0, self.cells, len(games))  # Like a new game's first food, may land on the snake.
+        self.has_food[games] = True
+        self.alive[games] = True
@@ -0,0 +1,49 @@
+import random
+from array import array
+from typing import Optional
+
+
+class FreeCells:
+    """The cells of a grid not covered by the snake, numbered ``y * width + x``.
+
+    The free cells are packed at the front of an array and each cell remembers its
+    slot, so taking a cell swaps the last free one into its place: adding, removing
+    and drawing a random free cell all take constant time.
+    """
+
+    def __init__(self, n: int) -> None:
+        self._cells = array("l", range(n))
+        self._slots = array("l", range(n))
+        self._free = n
+
+    def __len__(self) -> int:
+        return self._free
+
+    def __contains__(self, cell: int) -> bool:
+        return self._slots[cell] < self._free
+
+    def remove(self, cell: int) -> None:
+        slot = self._slots[cell]
+        if slot >= self._free:
+            return
+        self._free -= 1
+        self._swap(slot, self._free)
+
+    def add(self, cell: int) -> None:
+        slot = self._slots[cell]
+        if slot < self._free:
+            return
+        self._swap(slot, self._free)
+        self._free += 1
+
+    def _swap(self, slot: int, other: int) -> None:
+        cells, slots = self._cells, self._slots
+        cell, other_cell = cells[slot], cells[other]
+        cells[slot], cells[other] = other_cell, cell
+        slots[cell], slots[other_cell] = other, slot
+
+    def choice(self, rng: random.Random) -> Optional[int]:
+        """Return a random free cell, or None if there are none left."""
+        if not self._free:
+            return None
+        return self._cells[rng.randrange(self._free)]
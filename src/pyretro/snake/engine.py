@@ -1,30 +1,74 @@
 import logging
+import random
+from typing import TYPE_CHECKING, Optional
 
-import pygame.event
+from pyretro.snake.enums import Direction
+from pyretro.snake.state import GameState, MenuState, State
+from pyretro.snake.structs import GameSettings, StepResult
 
-from pyretro.snake.state import MenuState
-from pyretro.snake.structs import GameSettings
+if TYPE_CHECKING:
+    import pygame
 
 LOGGER = logging.getLogger(__name__)
 
 
 class SnakeEngine:
-    def __init__(self, surface: pygame.Surface, game_settings: GameSettings) -> None:
-        pygame.init()
-
+    def __init__(
+        self,
+        surface: Optional["pygame.Surface"],
+        game_settings: GameSettings,
+        headless: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.game_settings = game_settings
+        self.headless = headless
+        self.rng = random.Random(seed)
         self.surface = surface
-        self.state = MenuState(self, game_settings)
         self.active = False
+        if headless:
+            self.state: State = GameState(self, game_settings)
+        else:
+            import pygame
+
+            pygame.init()
+            self.state = MenuState(self, game_settings)
+
+    @classmethod
+    def create_headless(cls, game_settings: GameSettings, seed: Optional[int] = None) -> "SnakeEngine":
+        """Return an engine that starts in a game and is advanced with ``step``; pygame need not be installed."""
+        return cls(None, game_settings, headless=True, seed=seed)
+
+    def reset(self) -> None:
+        """Start a new game."""
+        self.state = GameState(self, self.game_settings)
+
+    def step(self, action: Optional[Direction] = None) -> StepResult:
+        """Turn the snake to ``action``, if given, and advance the game by one move."""
+        state = self.state
+        if not isinstance(state, GameState):
+            raise TypeError(f"Can only step a game, not {state.name()}")
+        if not state.collided:
+            if action is not None:
+                state.change_snake_direction(action)
+            state.update_sprites()
+        return StepResult(state.current_score, state.collided)
 
     def process_events(self) -> None:
+        import pygame.event
+
         for event in pygame.event.get():
             LOGGER.debug("Handling event: %s", event)
             self.state.handle_event(event)
 
     def run(self) -> None:
+        import pygame.display
+
         self.active = True
 
         while self.active:
             self.process_events()
-            self.state.render_sprites(surface=self.surface)
-            pygame.display.flip()
+            rects = self.state.render_sprites(surface=self.surface)
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
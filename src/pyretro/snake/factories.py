@@ -1,17 +1,24 @@
 import random
+from typing import TYPE_CHECKING, Optional
 
-from .sprites import Snake, SnakeFood, SnakeRect, TitleSprite
+from .cells import FreeCells
+from .sprites import Snake, SnakeFood
 from .structs import BlockColors, Point, Size
 
+if TYPE_CHECKING:
+    from .render import TitleSprite
+
 
 class SnakeCoordinateFactory:
-    def __init__(self, unit_size: Size, grid_n: Size) -> None:
+    """Cells of the game grid, numbered ``y * width + x``, and the pixel sizes to render them."""
+
+    def __init__(self, unit_size: Size, grid_n: Size, rng: Optional[random.Random] = None) -> None:
         self.unit_size = unit_size
         self.grid_size = grid_n
-
-    @property
-    def screen_size(self) -> Size:
-        return self.unit_size * self.grid_size
+        self.screen_size = unit_size * grid_n
+        self._width = grid_n.width
+        self._cells = grid_n.width * grid_n.height
+        self._rng = rng if rng is not None else random.Random()
 
     @property
     def center_pos(self) -> Point:
@@ -19,58 +26,57 @@ class SnakeCoordinateFactory:
         y = self.unit_size.height * (self.grid_size.height // 2)
         return Point(x, y)
 
-    def new_snake_food_location(self) -> Point:
-        rand_x = random.randint(0, self.grid_size.width - 1)
-        rand_y = random.randint(0, self.grid_size.height - 1)
-        x = rand_x * self.unit_size.width
-        y = rand_y * self.unit_size.height
-        return Point(x, y)
+    @property
+    def center_cell(self) -> int:
+        return (self.grid_size.height // 2) * self._width + self.grid_size.width // 2
+
+    def new_snake_food_cell(self) -> int:
+        rand_x = self._rng.randint(0, self.grid_size.width - 1)
+        rand_y = self._rng.randint(0, self.grid_size.height - 1)
+        return rand_y * self._width + rand_x
+
+    def free_snake_food_cell(self, free_cells: FreeCells) -> Optional[int]:
+        """Return a random free cell, or None if the board is full."""
+        return free_cells.choice(self._rng)
 
     def get_center(self) -> int:
         return self.screen_size // 2
 
-    def get_move_left_coordinates(self, snake_rect: SnakeRect) -> Point:
-        x = (snake_rect.x - snake_rect.width) % self.screen_size.width
-        return Point(x, snake_rect.y)
+    def get_move_left_cell(self, cell: int) -> int:
+        return cell - 1 if cell % self._width else cell + self._width - 1
 
-    def get_move_right_coordinates(self, snake_rect: SnakeRect) -> Point:
-        x = (snake_rect.x + snake_rect.width) % self.screen_size.width
-        return Point(x, snake_rect.y)
+    def get_move_right_cell(self, cell: int) -> int:
+        return cell + 1 if (cell + 1) % self._width else cell + 1 - self._width
 
-    def get_move_up_coordinates(self, snake_rect: SnakeRect) -> Point:
-        y = (snake_rect.y - snake_rect.height) % self.screen_size.height
-        return Point(snake_rect.x, y)
+    def get_move_up_cell(self, cell: int) -> int:
+        return (cell - self._width) % self._cells
 
-    def get_move_down_coordinates(self, snake_rect: SnakeRect) -> Point:
-        y = (snake_rect.y + snake_rect.height) % self.screen_size.height
-        return Point(snake_rect.x, y)
+    def get_move_down_cell(self, cell: int) -> int:
+        return (cell + self._width) % self._cells
 
 
 class SnakeSpriteFactory:
     def __init__(self, coordinate_factory: SnakeCoordinateFactory) -> None:
         self._coordinate_factory = coordinate_factory
 
-    def _create_snake_rect(self, top_left_point: Point) -> SnakeRect:
-        unit_size = self._coordinate_factory.unit_size
-        return SnakeRect.from_structs(top_left_point, unit_size)
-
     def create_snake(self, colors: BlockColors) -> Snake:
-        top_left_point = self._coordinate_factory.center_pos
-        snake_head = self._create_snake_rect(top_left_point)
-        snake = Snake(snake_head, self._coordinate_factory.screen_size, colors)
-        return snake
+        factory = self._coordinate_factory
+        return Snake(factory.center_cell, factory.grid_size, factory.unit_size, colors)
 
-    def create_snake_food(self, top_left: Point, colors: BlockColors) -> SnakeFood:
-        snake_rect = self._create_snake_rect(top_left)
-        snake_food = SnakeFood(snake_rect, colors)
-        return snake_food
+    def create_snake_food(self, cell: int, colors: BlockColors) -> SnakeFood:
+        factory = self._coordinate_factory
+        return SnakeFood(cell, factory.grid_size.width, factory.unit_size, colors)
+
+    def create_menu_title(self) -> "TitleSprite":
+        from .render import TitleSprite
 
-    def create_menu_title(self) -> TitleSprite:
         pos = self._coordinate_factory.center_pos
         title = TitleSprite("Snake", pos, "purple")
         return title
 
-    def create_game_over_title(self, score: int) -> TitleSprite:
+    def create_game_over_title(self, score: int) -> "TitleSprite":
+        from .render import TitleSprite
+
         pos = self._coordinate_factory.center_pos
         title = TitleSprite(f"Game Over! Score: {score}", pos)
         return title
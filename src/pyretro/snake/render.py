@@ -0,0 +1,44 @@
+from typing import Type, TypeVar
+
+import pygame
+
+from pyretro.snake.sprites import Sprite
+from pyretro.snake.structs import BlockColors, Point, Size
+
+Self = TypeVar("Self", bound="SnakeRect")
+
+
+class SnakeRect(pygame.Rect):
+    """Represents a rect for the Snake Game."""
+
+    def to_tuple(self) -> tuple[int, int, int, int]:
+        return self.x, self.y, self.width, self.height
+
+    @classmethod
+    def from_structs(cls: Type[Self], point: Point, size: Size) -> Self:
+        return cls(point.x, point.y, size.width, size.height)
+
+
+def cell_rect(cell: int, columns: int, unit_size: Size) -> SnakeRect:
+    """Return the pixel rect of a cell numbered ``y * columns + x``."""
+    y, x = divmod(cell, columns)
+    return SnakeRect(x * unit_size.width, y * unit_size.height, unit_size.width, unit_size.height)
+
+
+def draw_block(surface: pygame.Surface, rect: pygame.Rect, colors: BlockColors) -> None:
+    pygame.draw.rect(surface, colors.fill, rect)
+    pygame.draw.rect(surface, colors.border, rect, width=1)
+
+
+class TitleSprite(Sprite):
+    def __init__(self, text, center, color="black", size=24):
+        font = pygame.font.SysFont("arialunicode", size, True, False)
+        self._text = font.render(text, True, color)
+        self._rect = self._text.get_rect(center=center.to_tuple())
+
+    @property
+    def rects(self):
+        return [self._rect]
+
+    def draw_onto(self, surface):
+        surface.blit(self._text, self._rect)
@@ -1,30 +1,29 @@
 import abc
 import logging
-from copy import copy
-from typing import Type, TypeVar
+from collections import Counter, deque
+from typing import TYPE_CHECKING
 
-import pygame
-
-from pyretro.snake.structs import Point, Size
+from pyretro.snake.cells import FreeCells
+from pyretro.snake.structs import Size
 from pyretro.snake.structs import BlockColors
 
-Self = TypeVar("Self", bound="SnakeRect")
+if TYPE_CHECKING:
+    import pygame
 
-LOGGER = logging.getLogger(__name__)
+    from pyretro.snake.render import SnakeRect
 
+LOGGER = logging.getLogger(__name__)
 
-class SnakeRect(pygame.Rect):
-    """Represents a rect for the Snake Game."""
 
-    def to_tuple(self) -> tuple[int, int, int, int]:
-        return self.x, self.y, self.width, self.height
+class Sprite(abc.ABC):
+    """Something drawn on the game surface.
 
-    @classmethod
-    def from_structs(cls: Type[Self], point: Point, size: Size) -> Self:
-        return cls(point.x, point.y, size.width, size.height)
+    The game model works in cells and never needs pygame; it is only imported, from
+    ``pyretro.snake.render``, by the methods that draw or return pixel rects.
+    """
 
+    __slots__ = ()
 
-class Sprite(abc.ABC):
     def __eq__(self, other) -> bool:
         if not isinstance(other, type(self)):
             return NotImplemented
@@ -39,89 +38,128 @@ class Sprite(abc.ABC):
     def draw_onto(self, surface):
         ...
 
+    def draw_cell(self, surface: "pygame.Surface", cell: int) -> None:
+        """Draw whatever of the sprite lies on grid ``cell``; sprites off the grid draw nothing."""
 
-class TitleSprite(Sprite):
-    def __init__(self, text, center, color="black", size=24):
-        font = pygame.font.SysFont("arialunicode", size, True, False)
-        self._text = font.render(text, True, color)
-        self._rect = self._text.get_rect(center=center.to_tuple())
 
-    @property
-    def rects(self):
-        return [self._rect]
-
-    def draw_onto(self, surface):
-        surface.blit(self._text, self._rect)
+class SnakeFood(Sprite):
+    """Food on one cell; ``rects`` gives its pixels for rendering."""
 
+    __slots__ = ("cell", "colors", "_columns", "_unit_size")
 
-class SnakeFood(Sprite):
-    def __init__(self, snake_rect: SnakeRect, colors: BlockColors) -> None:
-        self._rect = snake_rect
+    def __init__(self, cell: int, columns: int, unit_size: Size, colors: BlockColors) -> None:
+        self.cell = cell
         self.colors = colors
+        self._columns = columns
+        self._unit_size = unit_size
 
     @property
-    def rects(self) -> list[SnakeRect]:
-        return [self._rect]
+    def rects(self) -> list["SnakeRect"]:
+        from pyretro.snake.render import cell_rect
+
+        return [cell_rect(self.cell, self._columns, self._unit_size)]
 
     def __str__(self):
-        return f"{type(self).__name__}({self._rect})"
+        return f"{type(self).__name__}({self.cell})"
+
+    def draw_onto(self, surface: "pygame.Surface"):
+        from pyretro.snake.render import cell_rect, draw_block
 
-    def draw_onto(self, surface: pygame.Surface):
-        pygame.draw.rect(surface, self.colors.fill, self._rect)
-        pygame.draw.rect(surface, self.colors.border, self._rect, width=1)
+        draw_block(surface, cell_rect(self.cell, self._columns, self._unit_size), self.colors)
+
+    def draw_cell(self, surface: "pygame.Surface", cell: int) -> None:
+        """Draw whatever of the food lies on ``cell``."""
+        if cell == self.cell:
+            self.draw_onto(surface)
 
 
 class Snake(Sprite):
-    def __init__(self, head: SnakeRect, screen_size: Size, colors: BlockColors) -> None:
-        self._rects = [head]
-        self._screen_size = screen_size
+    """A snake on a grid of cells numbered ``y * columns + x``.
+
+    The body is a deque of cells, head first, plus a count of segments per cell, so
+    moving, growing and checking for collisions take constant time however long the
+    snake is. ``free_cells`` tracks the cells it leaves uncovered. The game works in
+    cells only; ``rects`` and ``head`` convert to pixels for rendering.
+    """
+
+    __slots__ = ("_columns", "_unit_size", "_colors", "_cells", "_occupancy", "free_cells")
+
+    def __init__(self, head: int, grid_size: Size, unit_size: Size, colors: BlockColors) -> None:
+        self._columns = grid_size.width
+        self._unit_size = unit_size
         self._colors = colors
+        self._cells: deque[int] = deque([head])
+        self._occupancy: Counter[int] = Counter(self._cells)
+        self.free_cells = FreeCells(grid_size.width * grid_size.height)
+        self.free_cells.remove(head)
 
     def __len__(self) -> int:
-        return len(self._rects)
+        return len(self._cells)
+
+    @property
+    def cells(self) -> deque[int]:
+        return self._cells
 
     @property
-    def rects(self) -> list[SnakeRect]:
-        return self._rects
+    def head_cell(self) -> int:
+        return self._cells[0]
 
     @property
-    def head(self) -> SnakeRect:
-        return self._rects[0]
+    def rects(self) -> list["SnakeRect"]:
+        from pyretro.snake.render import cell_rect
+
+        return [cell_rect(cell, self._columns, self._unit_size) for cell in self._cells]
 
     @property
-    def tail(self) -> list[SnakeRect]:
-        return self._rects[1:]
+    def head(self) -> "SnakeRect":
+        from pyretro.snake.render import cell_rect
 
-    def move(self, new_head_coordinates: Point) -> None:
-        LOGGER.debug("Moving Snake to %s:", new_head_coordinates)
-        new = self._rects.pop()
-        new.update(new_head_coordinates.to_tuple(), self.head.size)
-        self._rects.insert(0, new)
+        return cell_rect(self._cells[0], self._columns, self._unit_size)
 
-    def grow(self, new_head_coordinates: Point) -> None:
-        LOGGER.debug("Growing Snake to coordinates: %s", new_head_coordinates)
-        new = copy(self.head)
-        new.update(new_head_coordinates.to_tuple(), self.head.size)
-        self._rects.insert(0, new)
+    @property
+    def tail(self) -> list["SnakeRect"]:
+        return self.rects[1:]
+
+    def move(self, new_head: int) -> None:
+        LOGGER.debug("Moving Snake to %s:", new_head)
+        tail = self._cells.pop()
+        self._occupancy[tail] -= 1
+        if not self._occupancy[tail]:
+            del self._occupancy[tail]
+            self.free_cells.add(tail)
+        self._push_head(new_head)
+
+    def grow(self, new_head: int) -> None:
+        LOGGER.debug("Growing Snake to cell: %s", new_head)
+        self._push_head(new_head)
+
+    def _push_head(self, cell: int) -> None:
+        self._cells.appendleft(cell)
+        self._occupancy[cell] += 1
+        self.free_cells.remove(cell)
 
     def collides_with_self(self) -> bool:
-        head = self.head
-        return any(body_part.colliderect(head) for body_part in self.tail)
+        return self._occupancy[self._cells[0]] > 1
 
-    def found_food(self, snake_food: "SnakeFood") -> bool:
-        head = self.head
+    def found_food(self, snake_food: SnakeFood) -> bool:
         LOGGER.debug("Snake found snake food: %s", snake_food)
-        return any(head.colliderect(rect) for rect in snake_food.rects)
+        return snake_food.cell == self._cells[0]
 
     def collides_with_sprite(self, sprite: Sprite) -> bool:
-        for self_rect in self.rects:
-            for sprite_rect in sprite.rects:
-                if self_rect.colliderect(sprite_rect):
-                    return True
-        else:
-            return False
-
-    def draw_onto(self, surface: pygame.Surface) -> None:
+        if isinstance(sprite, SnakeFood):
+            return sprite.cell in self._occupancy
+        rects = self.rects
+        return any(sprite_rect.collidelist(rects) != -1 for sprite_rect in sprite.rects)
+
+    def draw_onto(self, surface: "pygame.Surface") -> None:
+        from pyretro.snake.render import draw_block
+
         for rect in self.rects:
-            pygame.draw.rect(surface, self._colors.fill, rect)
-            pygame.draw.rect(surface, self._colors.border, rect, width=1)
+            draw_block(surface, rect, self._colors)
+
+    def draw_cell(self, surface: "pygame.Surface", cell: int) -> None:
+        """Draw whatever of the snake lies on ``cell``."""
+        if cell in self._occupancy:
+            from pyretro.snake.render import cell_rect, draw_block
+
+            draw_block(surface, cell_rect(cell, self._columns, self._unit_size), self._colors)
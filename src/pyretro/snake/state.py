@@ -1,44 +1,46 @@
 import logging
+import random
 from abc import ABC, abstractmethod
 
-from typing import Protocol, TypeVar
-
-import pygame
-from pygame.event import Event
+from typing import TYPE_CHECKING, Optional, Protocol
 
 from .enums import Direction
-from .events import COLLIDE_EVENT, CYCLE_EVENT, InternalEvent, KeyEvent, WrappedEvent
-from .pubsub import (
-    DirectionChangeSetter,
-    EventHandler,
-    GameOverStateSetter,
-    GameStateSetter,
-    MenuStateSetter,
-    QuitSetter,
-    SpriteUpdater,
-    StateSubscriber,
-)
 from .sprites import Snake, SnakeFood, Sprite
-from .structs import GameSettings, Point, Size
+from .structs import GameSettings, Size
 from .factories import SnakeCoordinateFactory, SnakeSpriteFactory
 
-LOGGER = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    import pygame
+    from pygame.event import Event
 
-T = TypeVar("T")
+    from .pubsub import EventHandler
+
+LOGGER = logging.getLogger(__name__)
 
 
 class Engine(Protocol):
     state: "State"
     active: bool
+    headless: bool  # No display, timer or event queue; the game is stepped directly.
+    rng: random.Random
 
 
 class State(ABC):
+    """A screen of the game.
+
+    pygame, and the event modules built on it, are only imported by states that take
+    events, so a headless ``GameState`` runs without pygame installed.
+    """
+
     def __init__(self, owner_engine: Engine, game_settings: GameSettings) -> None:
-        pygame.event.set_blocked(None)
+        if not owner_engine.headless:
+            import pygame.event
+
+            pygame.event.set_blocked(None)
         self._owner_engine = owner_engine
         self._game_settings = game_settings
         unit_size, grid_size = game_settings.unit_size, game_settings.grid_size
-        self._coordinate_factory = SnakeCoordinateFactory(unit_size, grid_size)
+        self._coordinate_factory = SnakeCoordinateFactory(unit_size, grid_size, owner_engine.rng)
         self._sprite_factory = SnakeSpriteFactory(self._coordinate_factory)
 
     @classmethod
@@ -46,11 +48,12 @@ class State(ABC):
         return cls.__name__
 
     @abstractmethod
-    def handle_event(self, event: Event) -> None:
+    def handle_event(self, event: "Event") -> None:
         ...
 
     @abstractmethod
-    def render_sprites(self, surface) -> None:
+    def render_sprites(self, surface) -> Optional[list["pygame.Rect"]]:
+        """Draw the state; return the rects drawn, or None if the whole surface was."""
         ...
 
     def change_state(self, new_state: "State"):
@@ -70,6 +73,12 @@ class State(ABC):
 
 class MenuState(State):
     def __init__(self, owner_engine: Engine, game_settings: GameSettings) -> None:
+        import pygame
+        from pygame.event import Event
+
+        from .events import KeyEvent, WrappedEvent
+        from .pubsub import EventHandler, GameStateSetter, MenuStateSetter, QuitSetter, StateSubscriber
+
         super().__init__(owner_engine, game_settings)
         self._title = self._sprite_factory.create_menu_title()
         subscriber_bindings: dict[WrappedEvent : list[StateSubscriber]] = {
@@ -80,10 +89,10 @@ class MenuState(State):
         self._event_handler = EventHandler(subscriber_bindings)
         pygame.event.set_allowed(pygame.KEYDOWN)
 
-    def handle_event(self, event: Event) -> None:
+    def handle_event(self, event: "Event") -> None:
         self._event_handler.handle_event(event)
 
-    def render_sprites(self, surface: pygame.Surface) -> None:
+    def render_sprites(self, surface: "pygame.Surface") -> None:
         surface.fill(self._game_settings.menu_background_color)
         self._title.draw_onto(surface)
 
@@ -96,6 +105,35 @@ class GameState(State):
 
     def __init__(self, engine: Engine, game_settings: GameSettings) -> None:
         super().__init__(engine, game_settings)
+        self._event_handler: Optional["EventHandler"] = None if engine.headless else self._bind_events()
+        self._snake = self._sprite_factory.create_snake(self._game_settings.snake_colors)
+        cell = self._coordinate_factory.new_snake_food_cell()
+        self._snake_food = [
+            self._sprite_factory.create_snake_food(
+                cell, self._game_settings.snake_food_colors
+            )
+        ]
+        self._current_direction = Direction.UP
+        self._snake_moved = False
+        self.collided = False
+        self._dirty: Optional[set[int]] = None  # Cells changed since the last render, None to redraw everything.
+
+    def _bind_events(self) -> "EventHandler":
+        import pygame
+        from pygame.event import Event
+
+        from .events import COLLIDE_EVENT, CYCLE_EVENT, InternalEvent, KeyEvent, WrappedEvent
+        from .pubsub import (
+            DirectionChangeSetter,
+            EventHandler,
+            GameOverStateSetter,
+            GameStateSetter,
+            MenuStateSetter,
+            QuitSetter,
+            SpriteUpdater,
+            StateSubscriber,
+        )
+
         subscriber_bindings: dict[WrappedEvent : list[StateSubscriber]] = {
             KeyEvent(Event(pygame.KEYDOWN, key=pygame.K_UP)): [
                 DirectionChangeSetter(Direction.UP, self)
@@ -115,18 +153,9 @@ class GameState(State):
             InternalEvent(Event(CYCLE_EVENT)): [SpriteUpdater(self)],
             InternalEvent(Event(COLLIDE_EVENT)): [GameOverStateSetter(self)],
         }
-        self._event_handler = EventHandler(subscriber_bindings)
-        self._snake = self._sprite_factory.create_snake(self._game_settings.snake_colors)
-        location = self._coordinate_factory.new_snake_food_location()
-        self._snake_food = [
-            self._sprite_factory.create_snake_food(
-                location, self._game_settings.snake_food_colors
-            )
-        ]
-        self._current_direction = Direction.UP
-        self._snake_moved = False
         pygame.event.set_allowed([pygame.KEYDOWN, CYCLE_EVENT, COLLIDE_EVENT])
         pygame.time.set_timer(pygame.event.Event(CYCLE_EVENT), self._game_settings.speed)
+        return EventHandler(subscriber_bindings)
 
     @property
     def current_score(self):
@@ -139,8 +168,9 @@ class GameState(State):
         self._current_direction = direction
         self._snake_moved = True
 
-    def handle_event(self, event: Event) -> None:
-        self._event_handler.handle_event(event)
+    def handle_event(self, event: "Event") -> None:
+        if self._event_handler is not None:
+            self._event_handler.handle_event(event)
 
     @property
     def snake(self) -> Snake:
@@ -169,27 +199,27 @@ class GameState(State):
         self._snake_food = remaining_snake_food
         return popped_snake_food
 
-    def add_snake_food(self: T) -> T:
-        top_left_point = self._coordinate_factory.new_snake_food_location()
+    def add_snake_food(self) -> "GameState":
+        cell = self._coordinate_factory.free_snake_food_cell(self._snake.free_cells)
+        if cell is None:
+            LOGGER.debug("Board is full, no room for snake food")
+            return self
         colors = self._game_settings.snake_food_colors
-        snake_food = self._sprite_factory.create_snake_food(top_left_point, colors)
-        while self._snake.collides_with_sprite(snake_food):
-            top_left_point = self._coordinate_factory.new_snake_food_location()
-            snake_food = self._sprite_factory.create_snake_food(top_left_point, colors)
-
-        self.snake_food.append(snake_food)
+        self.snake_food.append(self._sprite_factory.create_snake_food(cell, colors))
+        if self._dirty is not None:
+            self._dirty.add(cell)
         return self
 
-    def get_movement_coordinates(self) -> Point:
-        head = self._snake.head
+    def get_movement_cell(self) -> int:
+        head = self._snake.head_cell
         if self._current_direction is Direction.UP:
-            return self._coordinate_factory.get_move_up_coordinates(head)
+            return self._coordinate_factory.get_move_up_cell(head)
         if self._current_direction is Direction.DOWN:
-            return self._coordinate_factory.get_move_down_coordinates(head)
+            return self._coordinate_factory.get_move_down_cell(head)
         if self._current_direction is Direction.RIGHT:
-            return self._coordinate_factory.get_move_right_coordinates(head)
+            return self._coordinate_factory.get_move_right_cell(head)
         if self._current_direction is Direction.LEFT:
-            return self._coordinate_factory.get_move_left_coordinates(head)
+            return self._coordinate_factory.get_move_left_cell(head)
         raise TypeError
 
     def update_sprites(self) -> None:
@@ -197,22 +227,49 @@ class GameState(State):
             self.add_snake_food()
 
         found_snake_food = self.pop_found_snake_food()
-        coordinates = self.get_movement_coordinates()
+        cell = self.get_movement_cell()
         auto_grow_until = self._game_settings.auto_grow_until
         if found_snake_food or len(self.snake) < auto_grow_until:
-            self.snake.grow(coordinates)
+            self.snake.grow(cell)
         else:
-            self.snake.move(coordinates)
+            if self._dirty is not None:
+                self._dirty.add(self.snake.cells[-1])
+            self.snake.move(cell)
+        if self._dirty is not None:
+            self._dirty.add(cell)
 
         if self.snake.collides_with_self():
             LOGGER.debug("Snake Collided with itself")
-            pygame.event.post(pygame.event.Event(COLLIDE_EVENT))
+            self.collided = True
+            if not self._owner_engine.headless:
+                import pygame.event
+
+                from .events import COLLIDE_EVENT
+
+                pygame.event.post(pygame.event.Event(COLLIDE_EVENT))
         self._snake_moved = False
 
-    def render_sprites(self, surface: pygame.Surface) -> None:
-        surface.fill(self._game_settings.game_background_color)
-        for sprite in self.sprites:
-            sprite.draw_onto(surface)
+    def render_sprites(self, surface: "pygame.Surface") -> Optional[list["pygame.Rect"]]:
+        """Repaint only the cells changed since the last call, after a first full draw."""
+        from .render import cell_rect
+
+        background = self._game_settings.game_background_color
+        dirty, self._dirty = self._dirty, set()
+        if dirty is None:
+            surface.fill(background)
+            for sprite in self.sprites:
+                sprite.draw_onto(surface)
+            return None
+
+        columns, unit_size = self._game_settings.grid_size.width, self._game_settings.unit_size
+        rects: list["pygame.Rect"] = []
+        for cell in dirty:
+            rect = cell_rect(cell, columns, unit_size)
+            surface.fill(background, rect)
+            for sprite in self.sprites:
+                sprite.draw_cell(surface, cell)
+            rects.append(rect)
+        return rects
 
     def to_game_over_state(self):
         game_over_state = GameOverState(
@@ -229,6 +286,12 @@ class GameOverState(State):
         game_settings: GameSettings,
         score: int,
     ) -> None:
+        import pygame
+        from pygame.event import Event
+
+        from .events import CYCLE_EVENT, KeyEvent, WrappedEvent
+        from .pubsub import EventHandler, GameStateSetter, MenuStateSetter, QuitSetter, StateSubscriber
+
         super().__init__(owner_engine, game_settings)
         self._game_over_title = self._sprite_factory.create_game_over_title(score)
         pygame.event.set_allowed([pygame.KEYDOWN, CYCLE_EVENT])
@@ -240,8 +303,8 @@ class GameOverState(State):
         }
         self._event_handler = EventHandler(subscriber_bindings)
 
-    def handle_event(self, event: Event) -> None:
+    def handle_event(self, event: "Event") -> None:
         self._event_handler.handle_event(event)
 
-    def render_sprites(self, surface: pygame.Surface) -> None:
+    def render_sprites(self, surface: "pygame.Surface") -> None:
         self._game_over_title.draw_onto(surface)
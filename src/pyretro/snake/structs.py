@@ -59,3 +59,9 @@ class GameSettings:
     menu_background_color: str
     game_over_background_color: str
     auto_grow_until: int = 10
+
+
+@dataclass(frozen=True)
+class StepResult:
+    score: int
+    game_over: bool
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.cells import BLACK, ChunkedCells, DenseCells, PackedCells, WHITE
+from pyretro.langtons_ant.rules import LANGTON
+
+
+@pytest.mark.unit()
+class TestPackedCells:
+    def test_set_and_get(self):
+        cells = PackedCells((3, 10))
+        cells[2, 9] = BLACK
+
+        assert cells[2, 9] == BLACK
+        assert cells[2, 8] == WHITE
+
+    @pytest.mark.parametrize("coordinates", [(-1, 0), (0, -1), (3, 0)])
+    def test_off_grid_coordinates(self, coordinates):
+        cells = PackedCells((3, 10))
+        with pytest.raises(IndexError):
+            cells[coordinates] = BLACK
+
+    def test_read_region(self):
+        arr = np.random.default_rng(1).integers(0, 2, size=(6, 21), dtype=np.uint8)
+        cells = PackedCells.from_array(arr)
+
+        np.testing.assert_array_equal(cells.read(1, 3, 4, 15), arr[1:5, 3:18])
+
+    def test_write_region(self):
+        rng = np.random.default_rng(2)
+        arr = rng.integers(0, 2, size=(6, 21), dtype=np.uint8)
+        region = rng.integers(0, 2, size=(3, 11), dtype=np.uint8)
+        cells = PackedCells.from_array(arr)
+
+        cells.write(2, 5, region)
+        arr[2:5, 5:16] = region
+        np.testing.assert_array_equal(cells.to_array(), arr)
+
+    def test_rejects_multiple_colours(self):
+        cells = PackedCells((3, 10))
+        with pytest.raises(ValueError):
+            cells[0, 0] = 2
+
+    def test_round_trip(self):
+        arr = np.random.default_rng(0).integers(0, 2, size=(5, 13), dtype=np.uint8)
+        cells = PackedCells.from_array(arr)
+
+        np.testing.assert_array_equal(cells.to_array(), arr)
+        assert cells.nbytes == 5 * 2
+
+    def test_matches_dense(self):
+        dense, packed = DenseCells((4, 4)), PackedCells((4, 4))
+        for coordinates in [(0, 0), (3, 1), (2, 2)]:
+            dense[coordinates] = BLACK
+            packed[coordinates] = BLACK
+
+        np.testing.assert_array_equal(dense.to_array(), packed.to_array())
+
+
+@pytest.mark.unit()
+class TestDenseCells:
+    def test_negative_coordinates_do_not_wrap(self):
+        cells = DenseCells((3, 3))
+        with pytest.raises(IndexError):
+            cells[-1, 0] = BLACK
+
+    def test_read_past_edge_is_white(self):
+        cells = DenseCells((3, 3))
+        cells[2, 2] = BLACK
+
+        region = cells.read(1, 1, 4, 4)
+
+        assert region.shape == (4, 4)
+        assert region.sum() == 1
+        assert region[1, 1] == BLACK
+
+
+@pytest.mark.unit()
+class TestChunkedCells:
+    def test_unwritten_squares_are_white(self):
+        cells = ChunkedCells(tile_size=4)
+
+        assert cells[-100, 1000] == WHITE
+        assert cells.tile_count == 0
+
+    def test_negative_coordinates(self):
+        cells = ChunkedCells(tile_size=4)
+        cells[-1, -5] = BLACK
+
+        assert cells[-1, -5] == BLACK
+        assert cells.tile_count == 1
+        assert cells.bounds() == (-4, -8, 4, 4)
+
+    def test_read_across_tiles(self):
+        cells = ChunkedCells(tile_size=4)
+        cells[-1, -1] = BLACK
+        cells[4, 0] = BLACK
+
+        region = cells.read(-2, -2, 8, 4)
+
+        assert region[1, 1] == BLACK
+        assert region[6, 2] == BLACK
+        assert region.sum() == 2
+
+    def test_run_matches_dense(self):
+        dense, chunked = DenseCells((200, 200)), ChunkedCells(tile_size=8)
+        expected = dense.run(100, 100, 0, 0, 5000, LANGTON)
+        result = chunked.run(100, 100, 0, 0, 5000, LANGTON)
+
+        assert result == expected
+        np.testing.assert_array_equal(chunked.read(0, 0, 200, 200), dense.to_array())
+
+    def test_run_stops_at_window_edge(self):
+        dense, packed, chunked = DenseCells((200, 200)), PackedCells((200, 200)), ChunkedCells(tile_size=8)
+        window = (90, 95, 110, 120)
+        expected = dense.run(100, 100, 0, 0, 5000, LANGTON, window=window)
+
+        assert expected.steps < 5000
+        assert not (90 <= expected.x < 110 and 95 <= expected.y < 120)
+        assert packed.run(100, 100, 0, 0, 5000, LANGTON, window=window) == expected
+        assert chunked.run(100, 100, 0, 0, 5000, LANGTON, window=window) == expected
+        np.testing.assert_array_equal(chunked.read(0, 0, 200, 200), dense.to_array())
+
+    def test_run_off_the_origin(self):
+        chunked = ChunkedCells(tile_size=8)
+        visited = []
+
+        result = chunked.run(0, 0, 0, 0, 20_000, LANGTON, visited)
+
+        assert result.steps == 20_000
+        assert len(visited) == 20_000
+        assert min(x for x, _ in visited) < 0
+        assert chunked.nbytes == chunked.tile_count * 64
@@ -0,0 +1,122 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.checkpoint import Checkpointer, load_snapshot, save_snapshot
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.highway import FastForward
+from pyretro.langtons_ant.rules import Rule
+
+
+def make_grid(cells, rule="RL"):
+    return Grid(Ant(1, Coordinates(30, 30)), GridSpec(1, 60), cells, Rule.from_string(rule))
+
+
+@pytest.mark.unit()
+class TestSnapshot:
+    @pytest.mark.parametrize(
+        "cells, rule",
+        [
+            (DenseCells((60, 60)), "RL"),
+            (DenseCells((60, 60)), "LLRR"),
+            (PackedCells((60, 60)), "RL"),
+            (ChunkedCells(16), "RL"),
+            (ChunkedCells(16), "LRRRRRLLR"),
+        ],
+    )
+    def test_round_trip(self, tmp_path, cells, rule):
+        grid = make_grid(cells, rule)
+        grid.step(2000)
+        save_snapshot(grid, tmp_path / "run.npz")
+
+        restored = load_snapshot(tmp_path / "run.npz")
+
+        assert type(restored.cells) is type(cells)
+        assert restored.rule == grid.rule
+        assert restored.get_state() == grid.get_state()
+        np.testing.assert_array_equal(restored.cells.read(*grid.cells.bounds()), grid.cells.to_array())
+        restored.step(1000)
+        grid.step(1000)
+        assert restored.get_state() == grid.get_state()
+
+    def test_chunked_after_fast_forward(self, tmp_path):
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), ChunkedCells(32))
+        FastForward(grid).step(10 ** 12)
+        save_snapshot(grid, tmp_path / "run.npz")
+
+        restored = load_snapshot(tmp_path / "run.npz")
+
+        assert restored.cells.tile_size == 32
+        assert restored.get_state() == grid.get_state()
+        assert len(restored.cells.stripes) == len(grid.cells.stripes) > 0
+        x, y = grid.ant.coordinates
+        stripe = grid.cells.stripes[0]
+        j = stripe.periods // 2
+        mid = (int(stripe.xs.min()) + j * stripe.dx - 50, int(stripe.ys.min()) + j * stripe.dy - 50)
+        for x0, y0 in ((x - 50, y - 50), mid, (-50, -50)):  # Around the ant, mid highway, the start.
+            assert grid.cells.read(x0, y0, 100, 100).any()
+            np.testing.assert_array_equal(restored.cells.read(x0, y0, 100, 100), grid.cells.read(x0, y0, 100, 100))
+        restored.step(5000)
+        grid.step(5000)
+        assert restored.get_state() == grid.get_state()
+
+    def test_overwrites_atomically(self, tmp_path):
+        grid = make_grid(PackedCells((60, 60)))
+        save_snapshot(grid, tmp_path / "run.npz")
+        grid.step(100)
+        save_snapshot(grid, tmp_path / "run.npz")
+
+        assert load_snapshot(tmp_path / "run.npz").steps == 100
+        assert [p.name for p in tmp_path.iterdir()] == ["run.npz"]
+
+    def test_syncs_file_before_rename_and_directory_after(self, tmp_path, monkeypatch):
+        calls = []
+        fsync, replace = os.fsync, os.replace
+
+        def record_fsync(fd):
+            calls.append("fsync directory" if stat.S_ISDIR(os.fstat(fd).st_mode) else "fsync file")
+            fsync(fd)
+
+        def record_replace(*paths):
+            calls.append("replace")
+            replace(*paths)
+
+        monkeypatch.setattr(os, "fsync", record_fsync)
+        monkeypatch.setattr(os, "replace", record_replace)
+        save_snapshot(make_grid(DenseCells((60, 60))), tmp_path / "run.npz")
+
+        assert calls == ["fsync file", "replace", "fsync directory"]
+
+
+@pytest.mark.unit()
+class TestCheckpointer:
+    def test_saves_every_n_steps(self, tmp_path):
+        grid = make_grid(DenseCells((60, 60)))
+        checkpointer = Checkpointer(grid, tmp_path / "run.npz", every_steps=300)
+
+        assert checkpointer.step(1000) == 1000
+        assert checkpointer.saves == 3
+        assert load_snapshot(tmp_path / "run.npz").steps == 900
+
+    def test_saves_by_wall_time(self, tmp_path):
+        grid = make_grid(DenseCells((60, 60)))
+        checkpointer = Checkpointer(grid, tmp_path / "run.npz", every_seconds=0, chunk=100)
+
+        checkpointer.step(250)
+        assert checkpointer.saves == 3
+
+    def test_ant_leaves_on_a_chunk_boundary(self, tmp_path):
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        exit_steps = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10)).step(10_000)
+        checkpointer = Checkpointer(grid, tmp_path / "run.npz", every_steps=10**6, chunk=exit_steps)
+
+        assert checkpointer.step(10 * exit_steps) == exit_steps
+        assert not grid.on_grid
+
+    def test_needs_an_interval(self, tmp_path):
+        with pytest.raises(ValueError):
+            Checkpointer(make_grid(None), tmp_path / "run.npz")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.colony import Colony
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import LANGTON, Rule
+
+
+@pytest.mark.unit()
+class TestColony:
+    def test_single_ant_matches_grid(self):
+        colony = Colony.from_ants((64, 64), [Ant(1, Coordinates(32, 32))])
+        grid = Grid(Ant(1, Coordinates(32, 32)), GridSpec(1, 64))
+
+        colony.step(3000)
+        grid.step(3000)
+
+        state = grid.get_state()
+        assert (colony.xs[0], colony.ys[0], colony.directions[0]) == (state["x"], state["y"], state["direction"])
+        np.testing.assert_array_equal(colony.cells, grid.cells.to_array())
+
+    def test_ants_on_separate_squares_all_write(self):
+        colony = Colony((10, 10), [2, 7], [2, 7], [0, 0])
+        colony.step()
+
+        assert colony.cells[2, 2] == colony.cells[7, 7] == 1
+        assert colony.xs.tolist() == [3, 8]
+
+    def test_lowest_numbered_ant_wins_a_shared_square(self):
+        colony = Colony((10, 10), [5, 5], [5, 5], [0, 2], rules=(LANGTON, Rule.from_string("RRL")), rule_ids=[1, 0])
+        colony.cells[5, 5] = 1
+        colony.step()
+
+        assert colony.cells[5, 5] == 2  # RRL writes 2 over colour 1; RL would write 0.
+        assert colony.xs.tolist() == [6, 6]  # Both turned right from the pre-tick colour.
+
+    def test_ants_stop_when_they_leave_the_grid(self):
+        colony = Colony((4, 4), [3, 1], [0, 1], [0, 0])
+        colony.step()
+
+        assert colony.active.tolist() == [False, True]
+        colony.step(100)
+        assert colony.xs[0] == 4
+
+    def test_mismatched_arrays(self):
+        with pytest.raises(ValueError):
+            Colony((4, 4), [0, 1], [0], [0, 0])
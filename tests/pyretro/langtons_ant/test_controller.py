@@ -0,0 +1,63 @@
+import os
+
+import pygame
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.controller import Controller
+from pyretro.langtons_ant.grid import Grid, GridSpec
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.mark.unit()
+class TestController:
+    @pytest.fixture()
+    def surface(self):
+        pygame.display.init()
+        yield pygame.display.set_mode((100, 100))
+        pygame.display.quit()
+
+    @pytest.fixture()
+    def grid(self):
+        return Grid(Ant(1, Coordinates(50, 50)), GridSpec(1, 100))
+
+    def test_steps_per_frame(self, grid, surface):
+        Controller(grid, surface, fps=1000, steps_per_frame=7, adaptive=False).run(max_frames=3)
+
+        assert grid.steps == 21
+
+    def test_adapts_steps_per_frame(self, grid, surface):
+        controller = Controller(grid, surface, fps=50)
+        controller.run(max_frames=5)
+
+        assert controller.steps_per_frame > 1
+        assert grid.steps > 5
+
+    def test_quit_event_stops(self, grid, surface):
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        controller = Controller(grid, surface, fps=1000)
+        controller.run()
+
+        assert not controller.running
+
+    def test_threaded(self, grid, surface):
+        controller = Controller(grid, surface, fps=100, threaded=True)
+        controller.run(max_frames=5)
+
+        assert grid.steps > 0
+        assert not controller.running
+
+    def test_stops_stepping_when_ant_leaves(self, surface):
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        Controller(grid, surface, fps=1000, steps_per_frame=10_000, adaptive=False).run(max_frames=3)
+
+        assert grid.steps < 10_000
+
+    def test_ant_leaves_on_the_last_step_of_a_frame(self, surface):
+        exit_steps = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10)).step(10_000)
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        Controller(grid, surface, fps=1000, steps_per_frame=exit_steps, adaptive=False).run(max_frames=3)
+
+        assert grid.steps == exit_steps
+        assert not grid.on_grid
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.enums import Direction
+from pyretro.langtons_ant.ensemble import Ensemble
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import LANGTON, Rule
+
+
+@pytest.mark.unit()
+class TestEnsemble:
+    def test_members_match_separate_grids(self):
+        rules = (LANGTON, Rule.from_string("LLRR"), Rule.from_string("RRLLLRLLLRRR"))
+        starts = [(20, 20, 0, 0), (10, 30, 1, 1), (32, 32, 2, 2), (5, 5, 3, 0)]
+        ensemble = Ensemble((48, 48), *zip(*[start[:3] for start in starts]), rules=rules, rule_ids=[s[3] for s in starts])
+        ensemble.step(2000)
+
+        for member, (x, y, direction, rule_id) in enumerate(starts):
+            grid = Grid(Ant(1, Coordinates(x, y), Direction(direction)), GridSpec(1, 48), rule=rules[rule_id])
+            steps = grid.step(2000)
+            state = grid.get_state()
+            assert ensemble.steps[member] == steps
+            assert (ensemble.xs[member], ensemble.ys[member], ensemble.directions[member]) == (
+                state["x"], state["y"], state["direction"]
+            )
+            np.testing.assert_array_equal(ensemble.cells[member], grid.cells.to_array())
+
+    def test_members_stop_independently(self):
+        ensemble = Ensemble((4, 4), [3, 1], [0, 1], [0, 0])
+        ensemble.step(1)
+
+        assert ensemble.active.tolist() == [False, True]
+        assert ensemble.steps.tolist() == [1, 1]
+        ensemble.step(3)
+        assert ensemble.steps[0] == 1
+        assert ensemble.xs[0] == 4
+
+    def test_black_counts(self):
+        ensemble = Ensemble((8, 8), [4, 4], [4, 4], [0, 0])
+        ensemble.step(3)
+
+        assert ensemble.black_counts().tolist() == [3, 3]
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pygame.image
+import pygame.surfarray
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.export import FrameExporter, encode_frame, export
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.raster import rasterize
+from pyretro.langtons_ant.rules import Rule
+
+
+def make_grid(rule="RL", size=30):
+    return Grid(Ant(1, Coordinates(size // 2, size // 2)), GridSpec(1, size), rule=Rule.from_string(rule))
+
+
+@pytest.mark.unit()
+class TestFrameExporter:
+    def test_raw_frames_in_order(self):
+        stream = io.BytesIO()
+        grid, reference = make_grid(), make_grid()
+        with FrameExporter(stream, square_n=2, workers=2, max_pending=2) as exporter:
+            assert export(grid, exporter, every=50, frames=5) == 5
+
+        frame_size = 60 * 60 * 3
+        assert len(stream.getvalue()) == 5 * frame_size
+        for frame in range(5):
+            expected = rasterize(reference.cells.to_array(), square_n=2).transpose(1, 0, 2)
+            data = np.frombuffer(stream.getvalue()[frame * frame_size:(frame + 1) * frame_size], dtype=np.uint8)
+            np.testing.assert_array_equal(data.reshape(60, 60, 3), expected)
+            reference.step(50)
+
+    def test_png_frames(self, tmp_path):
+        grid = make_grid("LLRR")
+        grid.step(500)
+        with FrameExporter(tmp_path, workers=1) as exporter:
+            exporter.submit(grid)
+
+        image = pygame.surfarray.array3d(pygame.image.load(str(tmp_path / "frame_000000.png")))
+        np.testing.assert_array_equal(image, rasterize(grid.cells.to_array()))
+
+    def test_stops_when_ant_leaves(self):
+        stream = io.BytesIO()
+        with FrameExporter(stream, workers=1) as exporter:
+            count = export(make_grid(size=10), exporter, every=100, frames=50)
+
+        assert count < 50
+        assert len(stream.getvalue()) == count * 10 * 10 * 3
+
+    def test_encode_packed_frame(self):
+        cells = np.random.default_rng(4).integers(0, 2, size=(5, 11), dtype=np.uint8)
+        packed = np.packbits(cells, axis=1, bitorder="little")
+
+        assert encode_frame(packed, 11, 1, None) == encode_frame(cells, None, 1, None)
@@ -0,0 +1,173 @@
+import numpy as np
+import pygame
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.enums import Direction, SquareColor
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import Rule
+
+
+@pytest.fixture(params=[DenseCells, PackedCells])
+def grid(request):
+    grid_spec = GridSpec(10, 20)
+    ant = Ant(10, Coordinates(10, 10))
+    return Grid(ant, grid_spec, request.param(grid_spec.grid_size))
+
+
+@pytest.mark.unit()
+class TestGrid:
+    def test_move_ant_on_white(self, grid):
+        grid.move_ant()
+
+        assert grid.get_square((10, 10)) is SquareColor.BLACK
+        assert grid.get_color((10, 10)) == "black"
+        assert grid._ant.direction == Direction.RIGHT
+        assert grid._ant.coordinates == Coordinates(11, 10)
+
+    def test_move_ant_on_black(self, grid):
+        grid.cells[10, 10] = 1
+        grid.move_ant()
+
+        assert grid.get_square((10, 10)) is SquareColor.WHITE
+        assert grid._ant.direction == Direction.LEFT
+        assert grid._ant.coordinates == Coordinates(9, 10)
+
+    def test_iter_squares(self, grid):
+        grid.move_ant()
+        squares = list(grid.iter_squares())
+
+        assert len(squares) == 400
+        assert squares.count(SquareColor.BLACK) == 1
+
+    def test_step_matches_move_ant(self, grid):
+        grid_spec = GridSpec(10, 20)
+        reference = Grid(Ant(10, Coordinates(10, 10)), grid_spec)
+        for _ in range(150):
+            reference.move_ant()
+
+        assert grid.step(150) == 150
+        assert grid.steps == 150
+        assert grid._ant.coordinates == reference._ant.coordinates
+        assert grid._ant.direction == reference._ant.direction
+        assert list(grid.iter_squares()) == list(reference.iter_squares())
+
+    def test_step_stops_at_edge(self, grid):
+        steps = grid.step(10_000)
+
+        assert steps < 10_000
+        assert grid.steps == steps
+        x, y = grid._ant.coordinates
+        assert not (0 <= x < 20 and 0 <= y < 20)
+
+    def test_step_from_outside_grid(self, grid):
+        grid._ant.coordinates.x = -1
+
+        assert not grid.on_grid
+        assert grid.step() == 0
+        assert grid.steps == 0
+
+    def test_exit_on_last_step_of_a_batch(self, grid):
+        exit_steps = grid.step(10_000)
+        reference = Grid(Ant(1, Coordinates(10, 10)), GridSpec(1, 20))
+
+        assert reference.step(exit_steps) == exit_steps
+        assert not reference.on_grid
+        assert reference.step(100) == 0
+
+    def test_changed_region_covers_step_batches(self, grid):
+        grid.pop_changed()
+        before = grid.cells.to_array().copy()
+        grid.move_ant()
+        grid.step(150)
+
+        x, y, width, height = grid.pop_changed()
+        changed = np.argwhere(grid.cells.to_array() != before)
+        assert len(changed)
+        assert (changed >= (x, y)).all() and (changed < (x + width, y + height)).all()
+        assert grid.pop_changed() is None
+
+    def test_large_batch_changes_only_the_region_walked(self):
+        grid = Grid(Ant(1, Coordinates(500, 500)), GridSpec(1, 1000), PackedCells((1000, 1000)))
+        grid.pop_changed()
+        grid.step(4 * Grid.MAX_DIRTY_CELLS)
+
+        x, y, width, height = grid.pop_changed()
+        assert width * height < 1000 * 1000 // 10
+        painted = np.argwhere(grid.cells.to_array())
+        assert (painted >= (x, y)).all() and (painted < (x + width, y + height)).all()
+
+    def test_set_state_changes_no_squares(self, grid):
+        grid.step(10)
+        grid.pop_changed()
+        grid.set_state(dict(grid.get_state(), x=3, y=4))
+
+        assert grid.pop_changed() is None
+        assert grid._ant.coordinates == Coordinates(3, 4)
+
+    def test_invalidate_changes_everything(self, grid):
+        grid.pop_changed()
+        grid.invalidate()
+
+        assert grid.pop_changed() == (0, 0, 20, 20)
+
+    def test_squares_need_a_two_colour_rule(self):
+        grid = Grid(Ant(10, Coordinates(10, 10)), GridSpec(10, 20), rule=Rule.from_string("LLRR"))
+        grid.step(300)
+
+        assert max(grid.cells.to_array().flat) >= 2
+        with pytest.raises(ValueError, match="LLRR"):
+            grid.get_square((10, 10))
+        with pytest.raises(ValueError, match="LLRR"):
+            grid.iter_squares()
+
+
+@pytest.mark.unit()
+class TestGridDrawing:
+    @pytest.fixture
+    def surface(self):
+        return pygame.Surface((200, 200))
+
+    def test_first_draw_repaints_everything(self, grid, surface):
+        rects = grid.draw_onto(surface)
+
+        assert rects == [pygame.Rect(0, 0, 200, 200)]
+        assert surface.get_at((195, 195)) == pygame.Color("white")
+
+    def test_draw_only_repaints_changed_squares(self, grid, surface):
+        grid.draw_onto(surface)
+        grid.move_ant()
+        grid.step(2)
+
+        rects = grid.draw_onto(surface)
+
+        assert sorted(rects) == sorted([pygame.Rect(100, 100, 10, 10), pygame.Rect(110, 100, 10, 10), pygame.Rect(110, 110, 10, 10)])
+        assert surface.get_at((105, 105)) == pygame.Color("black")
+        assert grid.draw_onto(surface) == []
+
+    def test_large_step_repaints_everything(self, grid, surface):
+        grid.draw_onto(surface)
+        grid.step(Grid.MAX_DIRTY_CELLS + 1)
+
+        assert grid.draw_onto(surface) == [pygame.Rect(0, 0, 200, 200)]
+
+    def test_full_draw_matches_squares(self, grid, surface):
+        grid.step(200)
+        grid.invalidate()
+        grid.draw_onto(surface)
+
+        for x in range(20):
+            for y in range(20):
+                assert surface.get_at((x * 10 + 5, y * 10 + 5)) == pygame.Color(grid.get_color((x, y)))
+
+
+@pytest.mark.unit()
+class TestUnboundedGrid:
+    def test_ant_walks_past_the_window(self):
+        grid = Grid(Ant(10, Coordinates(10, 10)), GridSpec(10, 20), ChunkedCells(tile_size=16))
+
+        assert grid.step(20_000) == 20_000
+        x, y = grid._ant.coordinates
+        assert not (0 <= x < 20 and 0 <= y < 20)
+        assert len(list(grid.iter_squares())) == 400
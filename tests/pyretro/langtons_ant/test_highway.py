@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.highway import FastForward, find_period
+from pyretro.langtons_ant.rules import Rule
+
+
+def make_grid(cells, rule="RL"):
+    return Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), cells, Rule.from_string(rule))
+
+
+@pytest.mark.unit()
+class TestFindPeriod:
+    def test_finds_shortest_period(self):
+        moves = np.array([(1, 0), (0, 1), (1, 0)] * 10)
+        positions = np.vstack([(0, 0), np.cumsum(moves, axis=0)])
+
+        assert find_period(positions, max_period=10, confirmations=2) == 3
+
+    def test_ignores_loops_without_displacement(self):
+        moves = np.array([(1, 0), (0, 1), (-1, 0), (0, -1)] * 10)
+        positions = np.vstack([(0, 0), np.cumsum(moves, axis=0)])
+
+        assert find_period(positions, max_period=10, confirmations=2) is None
+
+
+@pytest.mark.unit()
+class TestFastForward:
+    @pytest.mark.parametrize("rule", ["RL", "LLRRRLRL"])
+    def test_matches_plain_stepping_unbounded(self, rule):
+        grid, reference = make_grid(ChunkedCells(16), rule), make_grid(ChunkedCells(16), rule)
+        fast_forward = FastForward(grid, max_period=256, probe_interval=5000)
+
+        assert fast_forward.step(150_000) == 150_000
+        reference.step(150_000)
+
+        assert fast_forward.highway is not None
+        assert grid.get_state() == reference.get_state()
+        np.testing.assert_array_equal(grid.cells.read(*reference.cells.bounds()), reference.cells.to_array())
+
+    @pytest.mark.parametrize("cells_type", [DenseCells, PackedCells])
+    def test_matches_plain_stepping_bounded(self, cells_type):
+        grid = Grid(Ant(1, Coordinates(300, 300)), GridSpec(1, 600), cells_type((600, 600)))
+        reference = Grid(Ant(1, Coordinates(300, 300)), GridSpec(1, 600))
+
+        steps = FastForward(grid, max_period=256, probe_interval=5000).step(50_000)
+
+        assert steps == reference.step(50_000) < 50_000
+        assert grid.get_state() == reference.get_state()
+        np.testing.assert_array_equal(grid.cells.to_array(), reference.cells.to_array())
+
+    def test_jumps_in_constant_time(self):
+        grid = make_grid(ChunkedCells())
+        fast_forward = FastForward(grid)
+
+        assert fast_forward.step(10 ** 12) == 10 ** 12
+        highway = fast_forward.highway
+        assert (highway.period, abs(highway.dx), abs(highway.dy)) == (104, 2, 2)
+        assert grid.cells.tile_count < 100
+        x, y = grid.ant.coordinates
+        assert grid.cells.read(x - 20, y - 20, 40, 40).any()
+
+    def test_remembers_highway_after_leaving_it(self):
+        grid = Grid(Ant(1, Coordinates(100, 100)), GridSpec(1, 200), PackedCells((200, 200)))
+        fast_forward = FastForward(grid, max_period=256, probe_interval=1000)
+
+        assert fast_forward.step(100_000) < 100_000
+        assert fast_forward.highway is None
+        assert 10_000 < fast_forward.first_confirmed_at < grid.steps
+
+    def test_ant_leaves_on_the_last_step(self):
+        exit_steps = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10)).step(10_000)
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        fast_forward = FastForward(grid)
+
+        assert fast_forward.step(exit_steps) == exit_steps
+        assert fast_forward.step(100) == 0
+        assert not grid.on_grid
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.history import History
+from pyretro.langtons_ant.rules import Rule
+
+
+def make_grid(cells, rule="RL"):
+    return Grid(Ant(1, Coordinates(40, 40)), GridSpec(1, 80), cells, Rule.from_string(rule))
+
+
+def reference_after(cells, rule, steps):
+    grid = make_grid(cells, rule)
+    grid.step(steps)
+    return grid
+
+
+@pytest.mark.unit()
+class TestHistory:
+    @pytest.mark.parametrize(
+        "cells_type, rule",
+        [(DenseCells, "RL"), (PackedCells, "RL"), (DenseCells, "LRRRRRLLR"), (ChunkedCells, "RL"), (DenseCells, "RNUL")],
+    )
+    def test_seek_matches_plain_stepping(self, cells_type, rule):
+        new_cells = (lambda: ChunkedCells(16)) if cells_type is ChunkedCells else (lambda: cells_type((80, 80)))
+        grid = make_grid(new_cells(), rule)
+        history = History(grid, keyframe_interval=1000)
+        history.step(5000)
+
+        for step in (3500, 100, 4999, 2000, 6000):
+            history.seek(step)
+            reference = reference_after(new_cells(), rule, step)
+            assert grid.get_state() == reference.get_state()
+            np.testing.assert_array_equal(grid.cells.read(*reference.cells.bounds()), reference.cells.to_array())
+
+    def test_turn_stream_is_one_bit_per_step(self):
+        history = History(make_grid(PackedCells((80, 80))), keyframe_interval=1 << 20)
+        history.step(8000)
+
+        assert history.bits_per_turn == 1
+        assert sum(segment.bits.nbytes for segment in history.segments) == 1000
+        assert set(history.turns(0, 8000).tolist()) == {1, 3}
+
+    def test_path_rebuilt_from_turns(self):
+        history = History(make_grid(DenseCells((80, 80))), keyframe_interval=1000)
+        history.step(2500)
+        visited = []
+        make_grid(DenseCells((80, 80))).step(2500, visited)
+
+        np.testing.assert_array_equal(history.path(1200, 2499), np.array(visited[1200:2500]))
+
+    def test_stops_at_the_edge(self):
+        grid = Grid(Ant(1, Coordinates(10, 10)), GridSpec(1, 20))
+        history = History(grid, keyframe_interval=100)
+
+        assert history.step(100_000) < 100_000
+        end = grid.steps
+        history.seek(50)
+        assert grid.steps == 50
+        history.seek(end + 100)
+        assert grid.steps == end
+
+    def test_seek_before_start(self):
+        history = History(make_grid(DenseCells((80, 80))))
+        with pytest.raises(IndexError):
+            history.seek(-1)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.macro import MacroStepper
+from pyretro.langtons_ant.rules import Rule
+
+
+@pytest.mark.unit()
+class TestMacroStepper:
+    @pytest.mark.parametrize("rule", ["RL", "LLRR"])
+    def test_matches_plain_stepping_unbounded(self, rule):
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), ChunkedCells(), Rule.from_string(rule))
+        reference = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), ChunkedCells(), Rule.from_string(rule))
+        stepper = MacroStepper(grid, window=8)
+
+        assert stepper.step(30_000) == 30_000
+        reference.step(30_000)
+
+        assert grid.get_state() == reference.get_state()
+        np.testing.assert_array_equal(grid.cells.read(*reference.cells.bounds()), reference.cells.to_array())
+
+    def test_matches_plain_stepping_bounded(self):
+        grid = Grid(Ant(1, Coordinates(50, 50)), GridSpec(1, 100), DenseCells((100, 100)))
+        reference = Grid(Ant(1, Coordinates(50, 50)), GridSpec(1, 100))
+
+        steps = MacroStepper(grid, window=8).step(50_000)
+
+        assert steps == reference.step(50_000) < 50_000
+        assert grid.get_state() == reference.get_state()
+        np.testing.assert_array_equal(grid.cells.to_array(), reference.cells.to_array())
+
+    def test_cache_counters(self):
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), ChunkedCells())
+        stepper = MacroStepper(grid, window=8, cache_size=128)
+        stepper.step(50_000)
+
+        info = stepper.cache_info()
+        assert info.hits > info.misses > 0
+        assert info.currsize <= 128
@@ -0,0 +1,65 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import DenseCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.memmap import MemmapStore
+
+
+@pytest.mark.unit()
+class TestMemmapStore:
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_save_and_resume(self, tmp_path, packed):
+        grid_spec = GridSpec(1, 50)
+        store = MemmapStore(tmp_path / "grid.npy")
+        grid = Grid(Ant(1, Coordinates(25, 25)), grid_spec, store.create(grid_spec.grid_size, packed))
+        grid.step(500)
+        store.save(grid)
+        del grid
+
+        resumed = store.resume(Grid(Ant(1, Coordinates(0, 0)), grid_spec, store.open()))
+        resumed.step(500)
+
+        reference = Grid(Ant(1, Coordinates(25, 25)), grid_spec, DenseCells(grid_spec.grid_size))
+        reference.step(1000)
+        assert resumed.get_state() == reference.get_state()
+        np.testing.assert_array_equal(resumed.cells.to_array(), reference.cells.to_array())
+
+    def test_save_syncs_cells_before_the_header(self, tmp_path, monkeypatch):
+        grid_spec = GridSpec(1, 50)
+        store = MemmapStore(tmp_path / "grid.npy")
+        grid = Grid(Ant(1, Coordinates(25, 25)), grid_spec, store.create(grid_spec.grid_size))
+        grid.step(500)
+        calls = []
+        flush, fsync, replace = grid.cells.flush, os.fsync, os.replace
+
+        def record_flush():
+            calls.append("flush")
+            flush()
+
+        def record_fsync(fd):
+            calls.append("fsync directory" if stat.S_ISDIR(os.fstat(fd).st_mode) else "fsync file")
+            fsync(fd)
+
+        def record_replace(*paths):
+            calls.append("replace")
+            replace(*paths)
+
+        monkeypatch.setattr(grid.cells, "flush", record_flush)
+        monkeypatch.setattr(os, "fsync", record_fsync)
+        monkeypatch.setattr(os, "replace", record_replace)
+        store.save(grid)
+
+        assert calls == ["flush", "fsync file", "fsync file", "replace", "fsync directory"]
+        assert store.read_header()["state"] == grid.get_state()
+
+    def test_packed_file_size(self, tmp_path):
+        store = MemmapStore(tmp_path / "grid.npy")
+        store.create((800, 800), packed=True)
+
+        assert store.exists()
+        assert np.load(store.path, mmap_mode="r").nbytes == 800 * 100
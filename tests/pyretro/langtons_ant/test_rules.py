@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import LANGTON, Rule
+
+# Chaotic two state, two colour turmite.
+TURMITE = Rule.from_table([[(1, "R", 0), (1, "R", 1)], [(0, "N", 0), (0, "N", 1)]])
+
+
+@pytest.mark.unit()
+class TestRule:
+    def test_from_string(self):
+        rule = Rule.from_string("LLRR")
+
+        assert rule.colors == 4
+        assert rule.states == 1
+        assert rule.writes == (1, 2, 3, 0)
+        assert rule.turns == (3, 3, 1, 1)
+
+    def test_langton_matches_table(self):
+        assert Rule.from_table([[(1, "R", 0), (0, "L", 0)]]) == LANGTON
+
+    def test_table_round_trip(self):
+        assert Rule.from_table(TURMITE.to_table()) == TURMITE
+
+    @pytest.mark.parametrize("rule", ["R", "RLX", ""])
+    def test_invalid_strings(self, rule):
+        with pytest.raises(ValueError):
+            Rule.from_string(rule)
+
+    def test_invalid_next_state(self):
+        with pytest.raises(ValueError):
+            Rule.from_table([[(1, "R", 1), (0, "L", 0)]])
+
+
+@pytest.mark.unit()
+class TestGridRules:
+    @pytest.mark.parametrize("rule", [Rule.from_string("LLRR"), Rule.from_string("RLR"), TURMITE])
+    @pytest.mark.parametrize("cells_type", [DenseCells, ChunkedCells])
+    def test_step_matches_move_ant(self, rule, cells_type):
+        grid_spec = GridSpec(1, 60)
+        cells = cells_type() if cells_type is ChunkedCells else cells_type(grid_spec.grid_size)
+        grid = Grid(Ant(1, Coordinates(30, 30)), grid_spec, cells, rule)
+        reference = Grid(Ant(1, Coordinates(30, 30)), grid_spec, rule=rule)
+        for _ in range(300):
+            reference.move_ant()
+
+        grid.step(300)
+
+        assert grid.get_state() == reference.get_state()
+        np.testing.assert_array_equal(grid.cells.read(0, 0, 60, 60), reference.cells.to_array())
+
+    def test_packed_cells_reject_multiple_colours(self):
+        grid_spec = GridSpec(1, 10)
+        grid = Grid(Ant(1, Coordinates(5, 5)), grid_spec, PackedCells(grid_spec.grid_size), Rule.from_string("LLRR"))
+        with pytest.raises(ValueError):
+            grid.step(10)
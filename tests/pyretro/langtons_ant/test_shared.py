@@ -0,0 +1,115 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.shared import CHANGE_RING, SharedGrid, SharedMirror, simulate
+
+
+def make_grid(cells, size=60):
+    return Grid(Ant(1, Coordinates(size // 2, size // 2)), GridSpec(1, size), cells)
+
+
+def run_in_child(name, steps):
+    shared = SharedGrid.attach(name)
+    simulate(shared, make_grid(shared.cells), chunk=100, steps=steps)
+    shared.close()
+
+
+@pytest.mark.unit()
+class TestSharedGrid:
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_attached_view_sees_cells_and_state(self, packed):
+        shared = SharedGrid.create((60, 60), packed)
+        try:
+            grid = make_grid(shared.cells)
+            simulate(shared, grid, chunk=300, steps=1000)
+
+            other = SharedGrid.attach(shared.name)
+            assert other.read_state() == grid.get_state()
+            np.testing.assert_array_equal(other.cells.to_array(), grid.cells.to_array())
+            assert other.sequence == 8
+            other.close()
+        finally:
+            shared.close()
+
+    def test_simulation_in_another_process(self):
+        shared = SharedGrid.create((60, 60))
+        try:
+            process = multiprocessing.get_context("spawn").Process(target=run_in_child, args=(shared.name, 2000))
+            process.start()
+            process.join(30)
+
+            reference = make_grid(None)
+            reference.step(2000)
+            assert shared.read_state() == reference.get_state()
+            np.testing.assert_array_equal(shared.cells.to_array(), reference.cells.to_array())
+        finally:
+            shared.close()
+
+    def test_ant_leaves_on_a_chunk_boundary(self):
+        exit_steps = make_grid(None, 10).step(10_000)
+        shared = SharedGrid.create((10, 10))
+        try:
+            grid = make_grid(shared.cells, 10)
+            assert simulate(shared, grid, chunk=exit_steps, steps=exit_steps) == exit_steps
+            assert not shared.running
+            assert simulate(shared, grid, chunk=exit_steps) == 0
+        finally:
+            shared.close()
+
+    def test_mirror_marks_only_published_changes(self):
+        shared = SharedGrid.create((200, 200))
+        try:
+            simulated, mirrored = make_grid(shared.cells, 200), make_grid(shared.cells, 200)
+            mirror = SharedMirror(mirrored, shared)
+            mirror.step(1)
+            simulated.pop_changed(), mirrored.pop_changed()
+            before = shared.cells.to_array().copy()
+
+            simulate(shared, simulated, chunk=100, steps=300)
+            mirror.step(1)
+
+            x, y, width, height = mirrored.pop_changed()
+            changed = np.argwhere(shared.cells.to_array() != before)
+            assert (changed >= (x, y)).all() and (changed < (x + width, y + height)).all()
+            assert width * height < 200 * 200 // 4
+            assert mirror.step(1) == 1
+            assert mirrored.pop_changed() is None
+        finally:
+            shared.close()
+
+    def test_mirror_that_falls_behind_marks_everything(self):
+        shared = SharedGrid.create((60, 60))
+        try:
+            simulated, mirrored = make_grid(shared.cells), make_grid(shared.cells)
+            mirror = SharedMirror(mirrored, shared)
+            mirror.step(1)
+            mirrored.pop_changed()
+
+            simulate(shared, simulated, chunk=1, steps=CHANGE_RING + 1)
+            mirror.step(1)
+
+            assert mirrored.pop_changed() == (0, 0, 60, 60)
+        finally:
+            shared.close()
+
+    def test_mirror_follows_published_state(self):
+        shared = SharedGrid.create((10, 10))
+        try:
+            simulated, mirrored = make_grid(shared.cells, 10), Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 10), shared.cells)
+            mirror = SharedMirror(mirrored, shared)
+            simulate(shared, simulated, chunk=10, steps=20)
+
+            assert mirror.step(5) == 5
+            assert mirrored.get_state() == simulated.get_state()
+
+            simulate(shared, simulated, chunk=1000)  # Walks off the 10 x 10 grid.
+            assert not shared.running
+            assert mirror.step(5) == 5
+            assert mirrored.steps == simulated.steps
+            assert mirror.step(5) == 0
+        finally:
+            shared.close()
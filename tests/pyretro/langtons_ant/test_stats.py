@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.rules import Rule
+from pyretro.langtons_ant.stats import Stats
+
+
+def make_grid(cells, rule="RL"):
+    return Grid(Ant(1, Coordinates(50, 50)), GridSpec(1, 100), cells, Rule.from_string(rule))
+
+
+@pytest.mark.unit()
+class TestStats:
+    @pytest.mark.parametrize(
+        "cells, rule",
+        [(DenseCells((100, 100)), "RL"), (PackedCells((100, 100)), "RL"), (DenseCells((100, 100)), "LLRRRLRL")],
+    )
+    def test_matches_full_scan(self, cells, rule):
+        grid = make_grid(cells, rule)
+        stats = Stats(grid, chunk=1000)
+        visited = []
+        reference = make_grid(DenseCells((100, 100)), rule)
+        reference.step(5000, visited)
+
+        stats.step(5000)
+        metrics = stats.metrics()
+
+        arr = reference.cells.to_array()
+        points = np.array(visited)
+        assert metrics.histogram == tuple(np.bincount(arr.ravel(), minlength=grid.rule.colors).tolist())
+        assert metrics.black == np.count_nonzero(arr)
+        assert metrics.distinct == len(set(visited))
+        assert metrics.max_visits == max(visited.count(point) for point in set(visited))
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0) + 1
+        assert metrics.bbox == (x0, y0, x1 - x0, y1 - y0)
+        state = reference.get_state()
+        assert (metrics.x, metrics.y, metrics.dx, metrics.dy) == (state["x"], state["y"], state["x"] - 50, state["y"] - 50)
+
+    def test_records_every_n_steps(self):
+        grid = make_grid(ChunkedCells(16))
+        records = list(Stats(grid, histogram=np.zeros(2)).records(every=1000, until=3500))
+
+        assert [record.steps for record in records] == [1000, 2000, 3000, 3500]
+        assert records[-1].black == np.count_nonzero(grid.cells.to_array())
+
+    def test_unbounded_grid_has_no_white_count(self):
+        grid = make_grid(ChunkedCells(16))
+        stats = Stats(grid)
+        stats.step(20_000)
+
+        histogram = stats.metrics().histogram
+        assert histogram[0] is None
+        assert histogram[1:] == (np.count_nonzero(grid.cells.to_array()),)
+
+    def test_stop_early(self):
+        grid = make_grid(DenseCells((100, 100)))
+        for record in Stats(grid).records(every=100):
+            if record.black >= 50:
+                break
+
+        assert grid.steps < 1000
+
+    def test_ends_when_ant_leaves(self):
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        records = list(Stats(grid).records(every=100))
+
+        assert records[-1].steps == grid.steps < 100 * len(records)
+
+    def test_ant_leaves_on_a_chunk_boundary(self):
+        exit_steps = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10)).step(10_000)
+        grid = Grid(Ant(1, Coordinates(5, 5)), GridSpec(1, 10))
+        stats = Stats(grid, chunk=exit_steps)
+
+        assert stats.step(exit_steps) == exit_steps
+        assert stats.finished
+        assert stats.step(100) == 0
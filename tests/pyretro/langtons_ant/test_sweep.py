@@ -0,0 +1,70 @@
+import csv
+import json
+
+import pytest
+
+from pyretro.langtons_ant.sweep import RunConfig, configurations, run_config, run_sweep, write_results
+
+
+@pytest.mark.unit()
+class TestSweep:
+    def test_configurations(self):
+        configs = configurations(["RL", "LLRR"], [100], [10, 20])
+
+        assert len(configs) == 4
+        assert configs[0] == RunConfig("RL", 100, 50, 50, 10)
+
+    def test_configurations_with_starts(self):
+        configs = configurations(["RL"], [100], [10], [(1, 2), (3, 4)])
+
+        assert [(config.x, config.y) for config in configs] == [(1, 2), (3, 4)]
+
+    def test_run_config_finds_highway(self):
+        result = run_config(RunConfig("RL", 400, 200, 200, 200_000))
+
+        assert 10_000 < result["highway_confirmed_at"] < result["steps"] < 200_000
+        assert result["black"] > 0
+        x, y, width, height = result["bbox"]
+        assert 0 <= x and x + width <= 400
+
+    def test_run_config_leaves_grid(self):
+        result = run_config(RunConfig("RL", 20, 10, 10, 100_000))
+
+        assert result["steps"] < 100_000
+        assert result["highway_confirmed_at"] is None
+
+    @pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+    def test_sweep_writes_every_run(self, tmp_path, suffix):
+        path = str(tmp_path / ("results" + suffix))
+        configs = configurations(["RL", "LR"], [30], [500])
+
+        assert write_results(run_sweep(configs, workers=2), path) == 2
+        with open(path) as f:
+            rows = list(csv.DictReader(f)) if suffix == ".csv" else [json.loads(line) for line in f]
+        assert sorted(row["rule"] for row in rows) == ["LR", "RL"]
+
+    def test_failed_run_becomes_an_error_row(self, tmp_path):
+        configs = configurations(["RL", "RX", "LR"], [30], [500])  # RX is not a rule.
+
+        rows = sorted(run_sweep(configs, workers=2), key=lambda row: row["rule"])
+
+        assert [row["rule"] for row in rows] == ["LR", "RL", "RX"]
+        assert rows[0]["error"] is None and rows[1]["error"] is None
+        assert rows[2]["error"].startswith("ValueError")
+        assert rows[2]["steps"] is None
+        assert write_results(rows, str(tmp_path / "results.csv")) == 3
+
+    def test_start_off_the_grid_is_rejected(self):
+        with pytest.raises(ValueError, match="off the 30 x 30 grid"):
+            configurations(["RL"], [100, 30], [500], [(40, 40)])
+        with pytest.raises(ValueError, match="off the"):
+            run_config(RunConfig("RL", 30, 40, 40, 500))
+
+    def test_start_off_the_grid_becomes_an_error_row(self):
+        configs = [RunConfig("RL", 30, 10, 10, 500), RunConfig("RL", 30, 40, 40, 500)]
+
+        rows = sorted(run_sweep(configs, workers=2), key=lambda row: row["x"])
+
+        assert rows[0]["error"] is None
+        assert rows[1]["error"].startswith("ValueError")
+        assert rows[1]["steps"] is None
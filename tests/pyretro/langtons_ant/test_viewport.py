@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from pyretro.langtons_ant.ant import Ant, Coordinates
+from pyretro.langtons_ant.cells import ChunkedCells, DenseCells, PackedCells
+from pyretro.langtons_ant.grid import Grid, GridSpec
+from pyretro.langtons_ant.highway import FastForward
+from pyretro.langtons_ant.macro import MacroStepper
+from pyretro.langtons_ant.raster import PALETTE, rasterize
+from pyretro.langtons_ant.viewport import DensityPyramid, Viewport
+
+
+def make_grid(cells, x=50, y=50):
+    return Grid(Ant(1, Coordinates(x, y)), GridSpec(1, 100), cells)
+
+
+def assert_pyramid_current(viewport):
+    expected = DensityPyramid(viewport._grid.cells)
+    for level, expected_level in zip(viewport._pyramid.levels, expected.levels):
+        np.testing.assert_array_equal(level, expected_level)
+
+
+@pytest.mark.unit()
+class TestDensityPyramid:
+    @pytest.mark.parametrize("cells_type", [DenseCells, PackedCells])
+    def test_update_matches_rebuild(self, cells_type):
+        grid = make_grid(cells_type((100, 90)))
+        pyramid = DensityPyramid(grid.cells)
+        grid.pop_changed()
+        grid.step(3000)
+
+        pyramid.update(*grid.pop_changed())
+        incremental = [level.copy() for level in pyramid.levels]
+        pyramid.rebuild()
+
+        for level, expected in zip(incremental, pyramid.levels):
+            np.testing.assert_array_equal(level, expected)
+
+    def test_top_level_counts_everything(self):
+        arr = np.random.default_rng(3).integers(0, 2, size=(37, 20), dtype=np.uint8)
+        pyramid = DensityPyramid(DenseCells(arr.shape, arr))
+
+        assert pyramid.level(pyramid.depth).shape == (1, 1)
+        assert pyramid.level(pyramid.depth)[0, 0] == arr.sum()
+        assert pyramid.level(1)[3, 4] == arr[6:8, 8:10].sum()
+
+
+@pytest.mark.unit()
+class TestViewport:
+    def test_unit_zoom_matches_rasterize(self):
+        grid = make_grid(DenseCells((100, 100)))
+        grid.step(5000)
+        viewport = Viewport(grid, (100, 100))
+
+        np.testing.assert_array_equal(viewport.render(), rasterize(grid.cells.to_array()))
+
+    def test_zoomed_in_shows_visible_squares(self):
+        arr = np.zeros((100, 100), dtype=np.uint8)
+        arr[10, 20] = 1
+        viewport = Viewport(make_grid(DenseCells((100, 100), arr)), (40, 40), center=(12, 22), zoom=4)
+
+        pixels = viewport.render()
+        assert pixels.shape == (40, 40, 3)
+        np.testing.assert_array_equal(pixels[12:16, 12:16], np.broadcast_to(PALETTE[1], (4, 4, 3)))
+        np.testing.assert_array_equal(pixels[16, 16], PALETTE[0])
+
+    def test_zoomed_out_shows_density(self):
+        arr = np.zeros((64, 64), dtype=np.uint8)
+        arr[:32] = 1
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 64), DenseCells((64, 64), arr))
+        viewport = Viewport(grid, (8, 8), zoom=1 / 8)
+
+        pixels = viewport.render()
+        assert pixels[:4].max() == 0
+        assert pixels[4:].min() == 255
+
+    def test_render_size_independent_of_world(self):
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 4096), PackedCells((4096, 4096)))
+        viewport = Viewport(grid, (32, 32))
+        viewport.fit()
+
+        assert viewport.render().shape == (32, 32, 3)
+
+    def test_large_step_batches_update_only_the_region_walked(self, monkeypatch):
+        grid = Grid(Ant(1, Coordinates(500, 500)), GridSpec(1, 1000), PackedCells((1000, 1000)))
+        viewport = Viewport(grid, (50, 50), zoom=0.5)
+        viewport.render()
+        update = viewport._pyramid.update
+        areas = []
+
+        def record(x, y, width, height):
+            areas.append(width * height)
+            update(x, y, width, height)
+
+        monkeypatch.setattr(viewport._pyramid, "update", record)
+
+        for _ in range(3):
+            grid.step(2 * Grid.MAX_DIRTY_CELLS)
+            viewport.render()
+
+        assert len(areas) == 3
+        assert max(areas) < 1000 * 1000 // 10
+        assert_pyramid_current(viewport)
+
+    def test_set_state_updates_nothing(self, monkeypatch):
+        grid = make_grid(DenseCells((100, 100)))
+        viewport = Viewport(grid, (50, 50), zoom=0.5)
+        viewport.render()
+        updates = []
+        monkeypatch.setattr(viewport._pyramid, "update", lambda *region: updates.append(region))
+
+        grid.set_state(dict(grid.get_state(), x=10, y=20))
+        viewport.render()
+
+        assert updates == []
+
+    def test_macro_steps_keep_the_pyramid_current(self):
+        grid = make_grid(DenseCells((100, 100)))
+        viewport = Viewport(grid, (50, 50), zoom=0.5)
+        viewport.render()
+
+        MacroStepper(grid, window=8).step(8000)
+        viewport.render()
+
+        assert_pyramid_current(viewport)
+
+    def test_highway_rides_keep_the_pyramid_current(self):
+        grid = Grid(Ant(1, Coordinates(300, 300)), GridSpec(1, 600), PackedCells((600, 600)))
+        viewport = Viewport(grid, (50, 50), zoom=0.25)
+        fast_forward = FastForward(grid, max_period=256, probe_interval=5000)
+
+        for _ in range(10):
+            fast_forward.step(5000)
+            viewport.render()
+
+        assert fast_forward.first_confirmed_at is not None
+        assert_pyramid_current(viewport)
+
+    def test_rebuilds_after_invalidate(self):
+        grid = make_grid(DenseCells((100, 100)))
+        viewport = Viewport(grid, (50, 50), zoom=0.5)
+        viewport.render()
+        grid.cells.write(0, 0, np.ones((10, 10), dtype=np.uint8))
+        grid.invalidate()
+        viewport.render()
+
+        assert viewport._pyramid.level(viewport._pyramid.depth)[0, 0] == 100
+
+    def test_unbounded_grid(self):
+        grid = Grid(Ant(1, Coordinates(0, 0)), GridSpec(1, 100), ChunkedCells(16))
+        grid.step(2000)
+        viewport = Viewport(grid, (50, 50))
+        viewport.fit()
+
+        assert viewport.render().min() == 0
+
+    def test_zoom_keeps_point_under_cursor(self):
+        viewport = Viewport(make_grid(DenseCells((100, 100))), (100, 100))
+        before = viewport.to_world(10, 30)
+        viewport.zoom_at(4, (10, 30))
+
+        assert viewport.to_world(10, 30) == pytest.approx(before)
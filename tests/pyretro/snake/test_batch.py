@@ -0,0 +1,106 @@
+import dataclasses
+import random
+
+import numpy as np
+import pytest
+
+from pyretro.snake.batch import DIRECTIONS, KEEP, SnakeBatch
+from pyretro.snake.const import DEFAULT_GAME_SETTINGS
+from pyretro.snake.engine import SnakeEngine
+from pyretro.snake.enums import Direction
+from pyretro.snake.structs import Size
+
+
+@pytest.mark.unit()
+class TestSnakeBatch:
+    def test_matches_game_state(self):
+        rng = random.Random(3)
+        for game in range(5):
+            engine = SnakeEngine.create_headless(DEFAULT_GAME_SETTINGS, seed=game)
+            batch = SnakeBatch(1, DEFAULT_GAME_SETTINGS, seed=game)
+            batch.food[0] = engine.state.snake_food[0].cell
+            for _ in range(2000):
+                action = rng.randrange(len(DIRECTIONS)) if rng.random() < 0.3 else KEEP
+                result = engine.step(DIRECTIONS[action] if action != KEEP else None)
+                batch.step(np.array([action]))
+
+                assert batch.alive[0] == (not result.game_over)
+                assert batch.lengths[0] == result.score
+                assert batch.head_squares[0] == engine.state.snake.head_cell
+                if result.game_over:
+                    break
+                if engine.state.snake_food:  # Food placed by the engine is random; copy it across.
+                    batch.food[0] = engine.state.snake_food[0].cell
+                    batch.has_food[0] = True
+
+            assert batch.occupied[0].sum() == len(set(engine.state.snake.cells))
+            assert batch.occupied[0, list(engine.state.snake.cells)].all()
+
+    def test_auto_grow_and_wrap(self):
+        batch = SnakeBatch(3, DEFAULT_GAME_SETTINGS, seed=0)
+        batch.has_food[:] = False
+        batch.food[:] = -1
+        batch._place_food = lambda games: None  # Keep food out of the way.
+        for _ in range(15):
+            batch.step()
+
+        assert batch.lengths.tolist() == [10, 10, 10]
+        assert (batch.head_squares == (10 - 15) % 20 * 20 + 10).all()
+        assert batch.occupied.sum(axis=1).tolist() == [10, 10, 10]
+
+    def test_self_collision_kills_only_that_game(self):
+        batch = SnakeBatch(2, DEFAULT_GAME_SETTINGS, seed=0)
+        up, right, down, left = range(4)
+        for action in [up] * 5 + [right, down]:
+            batch.step(np.array([action, up]))
+        batch.step(np.array([left, up]))
+
+        assert batch.alive.tolist() == [False, True]
+        lengths = batch.lengths.copy()
+        batch.step(np.array([up, up]))
+        assert batch.lengths[0] == lengths[0]
+
+    def test_full_board_places_no_food(self):
+        settings = dataclasses.replace(DEFAULT_GAME_SETTINGS, grid_size=Size(3, 1), auto_grow_until=3)
+        batch = SnakeBatch(1, settings, seed=0)
+        right = DIRECTIONS.index(Direction.RIGHT)
+        for _ in range(2):
+            batch.step(np.array([right]))
+        batch.has_food[0] = False
+        batch._place_food(np.array([0]))
+
+        assert batch.occupied[0].all()
+        assert not batch.has_food[0]
+
+    def test_nearly_full_board_places_food_on_the_free_square(self):
+        settings = dataclasses.replace(DEFAULT_GAME_SETTINGS, grid_size=Size(4, 1), auto_grow_until=3)
+        batch = SnakeBatch(2, settings, seed=0)
+        right = DIRECTIONS.index(Direction.RIGHT)
+        for _ in range(2):
+            batch.step(np.array([right, right]))
+        batch.has_food[:] = False
+        batch._place_food(np.arange(2))
+
+        assert batch.has_food.all()
+        assert batch.food.tolist() == [1, 1]
+
+    def test_free_squares_follow_the_snakes(self):
+        batch = SnakeBatch(8, DEFAULT_GAME_SETTINGS, seed=2)
+        rng = np.random.default_rng(2)
+        for _ in range(300):
+            batch.step(rng.integers(KEEP, len(DIRECTIONS), len(batch)))
+            batch.reset(np.flatnonzero(~batch.alive))
+
+        for game in range(len(batch)):
+            free = batch._free_squares[game, : batch._free[game]]
+            assert sorted(free.tolist()) == np.flatnonzero(~batch.occupied[game]).tolist()
+
+    def test_reset(self):
+        batch = SnakeBatch(2, DEFAULT_GAME_SETTINGS, seed=0)
+        for _ in range(12):
+            batch.step()
+        batch.reset(np.array([1]))
+
+        assert batch.lengths.tolist()[1] == 1
+        assert batch.occupied[1].sum() == 1
+        assert batch.lengths[0] > 1
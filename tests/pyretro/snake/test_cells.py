@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from pyretro.snake.cells import FreeCells
+
+
+@pytest.mark.unit()
+class TestFreeCells:
+    def test_remove_and_add(self):
+        free = FreeCells(5)
+        free.remove(2)
+        free.remove(0)
+        free.remove(2)
+
+        assert len(free) == 3
+        assert [cell in free for cell in range(5)] == [False, True, False, True, True]
+
+        free.add(2)
+        free.add(2)
+        assert len(free) == 4
+        assert 2 in free
+
+    def test_choice_only_draws_free_cells(self):
+        free = FreeCells(10)
+        for cell in range(0, 10, 2):
+            free.remove(cell)
+        rng = random.Random(0)
+
+        assert {free.choice(rng) for _ in range(200)} == {1, 3, 5, 7, 9}
+
+    def test_choice_on_full_board(self):
+        free = FreeCells(2)
+        free.remove(0)
+        free.remove(1)
+
+        assert free.choice(random.Random(0)) is None
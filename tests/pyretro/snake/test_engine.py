@@ -0,0 +1,104 @@
+import dataclasses
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pyretro.snake.const import DEFAULT_GAME_SETTINGS
+from pyretro.snake.engine import SnakeEngine
+from pyretro.snake.enums import Direction
+from pyretro.snake.state import GameState
+from pyretro.snake.structs import Point, Size
+
+
+@pytest.mark.unit()
+class TestHeadlessSnakeEngine:
+    @pytest.fixture()
+    def engine(self):
+        return SnakeEngine.create_headless(DEFAULT_GAME_SETTINGS, seed=1)
+
+    def test_starts_in_a_game(self, engine):
+        assert isinstance(engine.state, GameState)
+
+    def test_step_moves_one_square(self, engine):
+        head = engine.state.snake.head.topleft
+        engine.step(Direction.RIGHT)
+
+        assert engine.state.snake.head.topleft == (head[0] + 20, head[1])
+
+    def test_auto_grows(self, engine):
+        for _ in range(5):
+            result = engine.step()
+
+        assert result.score == 6
+        assert not result.game_over
+
+    def test_self_collision_ends_the_game(self, engine):
+        for action in [Direction.UP] * 5 + [Direction.RIGHT, Direction.DOWN, Direction.LEFT]:
+            result = engine.step(action)
+
+        assert result.game_over
+        body = list(engine.state.snake.cells)
+        after = engine.step(Direction.UP)
+
+        assert after == result  # Stepping after game over changes nothing.
+        assert list(engine.state.snake.cells) == body
+
+    def test_eats_food(self, engine):
+        head = engine.state.snake.head_cell
+        engine.state.snake_food[0].cell = (head - 11 * 20) % 400
+        for _ in range(11):
+            engine.step()
+        assert engine.state.current_score == 10
+
+        engine.step()
+        assert engine.state.current_score == 11
+
+    def test_same_seed_same_game(self):
+        scores = []
+        for _ in range(2):
+            engine = SnakeEngine.create_headless(DEFAULT_GAME_SETTINGS, seed=7)
+            turns = [Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.RIGHT]
+            scores.append([engine.step(turns[i // 7 % 4]).score for i in range(300)])
+
+        assert scores[0] == scores[1]
+
+    def test_reset(self, engine):
+        engine.step()
+        engine.reset()
+
+        assert engine.state.current_score == 1
+        assert engine.state.snake.head.topleft == Point(200, 200).to_tuple()
+
+    def test_food_lands_on_a_free_cell(self, engine):
+        engine.state.snake_food.clear()
+        for _ in range(50):
+            engine.state.add_snake_food()
+
+        assert not any(engine.state.snake.collides_with_sprite(food) for food in engine.state.snake_food)
+
+    def test_full_board_has_no_food(self):
+        settings = dataclasses.replace(DEFAULT_GAME_SETTINGS, grid_size=Size(3, 1), auto_grow_until=3)
+        engine = SnakeEngine.create_headless(settings, seed=0)
+        engine.step(Direction.RIGHT)
+        engine.step(Direction.RIGHT)
+        engine.state.snake_food.clear()
+        engine.state.add_snake_food()
+
+        assert len(engine.state.snake.free_cells) == 0
+        assert engine.state.snake_food == []
+
+    def test_runs_without_pygame(self):
+        script = (
+            "import sys; sys.modules['pygame'] = None\n"
+            "from pyretro.snake.const import DEFAULT_GAME_SETTINGS\n"
+            "from pyretro.snake.engine import SnakeEngine\n"
+            "engine = SnakeEngine.create_headless(DEFAULT_GAME_SETTINGS, seed=1)\n"
+            "print(engine.step().score)\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "2"
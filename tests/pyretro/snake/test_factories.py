@@ -0,0 +1,30 @@
+import pytest
+
+from pyretro.snake.factories import SnakeCoordinateFactory
+from pyretro.snake.structs import Size
+
+
+@pytest.mark.unit()
+class TestSnakeCoordinateFactory:
+    @pytest.fixture()
+    def factory(self):
+        return SnakeCoordinateFactory(Size(20, 20), Size(4, 3))
+
+    def test_center_cell(self, factory):
+        assert factory.center_cell == 1 * 4 + 2
+
+    @pytest.mark.parametrize(
+        ("move", "cell", "expected"),
+        [
+            ("left", 5, 4),
+            ("left", 4, 7),
+            ("right", 6, 7),
+            ("right", 7, 4),
+            ("up", 5, 1),
+            ("up", 1, 9),
+            ("down", 5, 9),
+            ("down", 9, 1),
+        ],
+    )
+    def test_moves_wrap(self, factory, move, cell, expected):
+        assert getattr(factory, f"get_move_{move}_cell")(cell) == expected
@@ -0,0 +1,86 @@
+import pygame
+import pytest
+
+from pyretro.snake.render import SnakeRect
+from pyretro.snake.sprites import Snake, SnakeFood, Sprite
+from pyretro.snake.structs import BlockColors, Size
+
+UNIT = Size(20, 20)
+
+
+def food(cell):
+    return SnakeFood(cell, 10, UNIT, BlockColors())
+
+
+@pytest.mark.unit()
+class TestSnake:
+    @pytest.fixture()
+    def snake(self):
+        return Snake(22, Size(10, 10), UNIT, BlockColors())
+
+    def test_move_keeps_length(self, snake):
+        snake.grow(23)
+        snake.move(24)
+
+        assert len(snake) == 2
+        assert list(snake.cells) == [24, 23]
+        assert [rect.topleft for rect in snake.rects] == [(80, 40), (60, 40)]
+        assert snake.head == SnakeRect(80, 40, 20, 20)
+
+    def test_collides_with_self(self, snake):
+        for cell in (23, 33, 32):
+            snake.grow(cell)
+        assert not snake.collides_with_self()
+
+        snake.move(22)
+        assert not snake.collides_with_self()  # The tail moved out of the way.
+
+        snake.grow(23)
+        assert snake.collides_with_self()
+
+    def test_collides_with_sprite(self, snake):
+        snake.grow(23)
+
+        assert snake.collides_with_sprite(food(22))
+        assert not snake.collides_with_sprite(food(24))
+
+    def test_found_food(self, snake):
+        assert snake.found_food(food(22))
+        snake.move(23)
+        assert not snake.found_food(food(22))
+
+    def test_draw_onto(self, snake):
+        surface = pygame.Surface((200, 200))
+        snake.draw_onto(surface)
+
+        assert surface.get_at((50, 50)) == pygame.Color("green")
+
+    def test_free_cells_follow_the_snake(self, snake):
+        snake.grow(23)
+        snake.move(24)
+
+        assert len(snake.free_cells) == 100 - 2
+        assert 22 in snake.free_cells  # The tail left it.
+        assert 23 not in snake.free_cells
+        assert 24 not in snake.free_cells
+
+
+@pytest.mark.unit()
+class TestSnakeFood:
+    def test_rects(self):
+        assert food(23).rects == [SnakeRect(60, 40, 20, 20)]
+
+
+@pytest.mark.unit()
+class TestSprite:
+    def test_draw_cell_does_nothing_by_default(self):
+        class Label(Sprite):
+            rects = [SnakeRect(0, 0, 20, 20)]
+
+            def draw_onto(self, surface):
+                surface.fill("red")
+
+        surface = pygame.Surface((20, 20))
+        Label().draw_cell(surface, 0)
+
+        assert surface.get_at((5, 5)) == pygame.Color("black")
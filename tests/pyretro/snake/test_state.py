@@ -0,0 +1,61 @@
+import os
+
+import pygame
+import pytest
+
+from pyretro.snake.const import DEFAULT_GAME_SETTINGS
+from pyretro.snake.engine import SnakeEngine
+from pyretro.snake.enums import Direction
+from pyretro.snake.state import GameState
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.mark.unit()
+class TestGameStateRendering:
+    @pytest.fixture()
+    def state(self):
+        pygame.display.init()
+        surface = pygame.display.set_mode((400, 400))
+        engine = SnakeEngine(surface, DEFAULT_GAME_SETTINGS, seed=0)
+        engine.state = GameState(engine, DEFAULT_GAME_SETTINGS)
+        yield engine.state
+        pygame.display.quit()
+
+    def test_first_render_is_full(self, state):
+        assert state.render_sprites(pygame.Surface((400, 400))) is None
+
+    def test_repaints_only_changed_cells(self, state):
+        surface = pygame.Surface((400, 400))
+        state.render_sprites(surface)
+        for _ in range(12):
+            state.update_sprites()
+            state.render_sprites(surface)
+        state.update_sprites()
+
+        rects = state.render_sprites(surface)
+        assert state.snake.head in rects
+        assert len(rects) <= 3  # Head, freed tail square and maybe new food.
+
+        expected = pygame.Surface((400, 400))
+        state._dirty = None
+        state.render_sprites(expected)
+        assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+    def test_matches_full_render_after_turns_and_eating(self, state):
+        state.snake_food[0].cell = (state.snake.head_cell - 12 * 20) % 400  # In the snake's way.
+        surface = pygame.Surface((400, 400))
+        state.render_sprites(surface)
+        turns = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT]
+        for i in range(200):
+            if state.collided:
+                break
+            state.change_snake_direction(turns[i // 15 % 4])
+            state.update_sprites()
+            state.render_sprites(surface)
+
+        assert state.current_score > 10
+        expected = pygame.Surface((400, 400))
+        state._dirty = None
+        state.render_sprites(expected)
+        assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")